@@ -1,11 +1,13 @@
 from dominoes import players
 from dominoes import search
+from dominoes import tournament
 from dominoes.board import Board
 from dominoes.domino import Domino
 from dominoes.exceptions import EmptyBoardException
 from dominoes.exceptions import EndsMismatchException
 from dominoes.exceptions import GameInProgressException
 from dominoes.exceptions import GameOverException
+from dominoes.exceptions import NoPossibleHandsException
 from dominoes.exceptions import NoSuchDominoException
 from dominoes.exceptions import NoSuchPlayerException
 from dominoes.exceptions import SeriesOverException
@@ -14,3 +16,9 @@ from dominoes.hand import Hand
 from dominoes.result import Result
 from dominoes.series import Series
 from dominoes.skinny_board import SkinnyBoard
+
+# builds its tables from Domino objects, so it must be imported last
+from dominoes import bit_game
+from dominoes.bit_game import BitGame
+from dominoes import tablebase
+from dominoes import batch
@@ -0,0 +1,211 @@
+import collections
+import dominoes
+
+# NumPy is an optional dependency, only needed to play games in batches
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BatchResult = collections.namedtuple('BatchResult', ['player', 'won', 'points'])
+BatchResult.__doc__ = \
+'''
+namedtuple to represent the results of a batch of dominoes games.
+Each field is an array with one element per game, holding the same
+value as the corresponding field of that game's Result.
+
+:var player: the last player to make a move in each game
+:var won: True for the games that ended due to an empty hand;
+          False for the games that ended due to being stuck
+:var points: the points of each game. See Result.
+'''
+
+# a move is represented by an index into arrays of 56 moves, ordered
+# in the same way as the valid moves of a BitGame: by domino, and
+# left end before right end. the domino of move m is DOMINOES[m // 2].
+_MOVES = 2 * len(dominoes.bit_game.DOMINOES)
+
+# value of the ends of an empty board. every domino can be
+# played on its left end, and none can be played on its right end.
+_EMPTY = 7
+
+if np is not None:
+    _VALUES = np.array([(d.first, d.second) for d in dominoes.bit_game.DOMINOES])
+    _POINTS = _VALUES.sum(axis=1)
+
+    # whether each domino contains each value, with an extra
+    # row for the ends of an empty board that matches all dominoes
+    _CONTAINS = np.array([[bool(m >> i & 1) for i in range(len(dominoes.bit_game.DOMINOES))]
+                          for m in dominoes.bit_game.VALUE_MASKS + ((1 << 28) - 1,)])
+
+    # each player is simulated by giving a score to every move, and
+    # playing the valid move with the highest score. ties are broken
+    # in favor of the move that comes first, so that the same move is
+    # chosen as when the player sorts the valid moves of a BitGame.
+    _MOVE_POINTS = np.repeat(_POINTS, 2)
+    _MOVE_DOUBLES = np.repeat(_VALUES[:, 0] == _VALUES[:, 1], 2)
+    _SCORES = {
+        dominoes.players.identity: lambda rng, n: np.zeros(_MOVES),
+        dominoes.players.random: lambda rng, n: rng.random((n, _MOVES)),
+        dominoes.players.reverse: lambda rng, n: np.arange(_MOVES),
+        dominoes.players.bota_gorda: lambda rng, n: _MOVE_POINTS,
+        dominoes.players.double: lambda rng, n: _MOVE_DOUBLES
+    }
+
+def _unpack(hands):
+    '''
+    :param hands: array of shape (n, 4), containing the bitmask of
+                  each player's hand in each game, as in BitGame.hands
+    :return: boolean array of shape (n, 4, 28), indicating whether
+             each player has each domino in each game
+    '''
+    return (np.asarray(hands, dtype=np.int64)[..., None] >> np.arange(28) & 1).astype(bool)
+
+def _advance(hands, left_end, right_end, turn, result, g):
+    '''
+    Ends the provided games if the player whose turn it is has an
+    empty hand or if no player has a valid move. Otherwise, advances
+    the turn of the provided games to the next player with a valid move.
+
+    :param hands: boolean array of the hands of all games
+    :param left_end: array of the left ends of all games
+    :param right_end: array of the right ends of all games
+    :param turn: array of the players whose turn it is in all games
+    :param BatchResult result: results of all games. Gets updated
+                               with the results of the games that end.
+    :param g: array of the indexes of the games that just had a move made
+    :return: array of the indexes of the provided games that did not end
+    '''
+    remaining = (hands[g] * _POINTS).sum(axis=2)
+
+    # games that ended due to a player running out of dominoes
+    won = ~hands[g, turn[g]].any(axis=1)
+    ended = g[won]
+    result.player[ended] = turn[ended]
+    result.won[ended] = True
+    result.points[ended] = (1 - 2 * (turn[ended] % 2)) * remaining[won].sum(axis=1)
+
+    g = g[~won]
+    remaining = remaining[~won]
+
+    # the next player with a valid move, if any
+    ends = _CONTAINS[left_end[g]] | _CONTAINS[right_end[g]]
+    stuck = np.ones(len(g), dtype=bool)
+    next_turn = turn[g]
+    for k in range(1, 5):
+        candidate = (turn[g] + k) % 4
+        found = stuck & (hands[g, candidate] & ends).any(axis=1)
+        next_turn[found] = candidate[found]
+        stuck &= ~found
+    turn[g] = next_turn
+
+    # games that ended due to being stuck. the turn went all
+    # the way around, back to the last player to make a move.
+    ended = g[stuck]
+    team_points = remaining[stuck][:, 0::2].sum(axis=1) - remaining[stuck][:, 1::2].sum(axis=1)
+    result.player[ended] = turn[ended]
+    result.won[ended] = False
+    result.points[ended] = -np.sign(team_points) * remaining[stuck].sum(axis=1)
+
+    return g[~stuck]
+
+def play(n=None, players=(dominoes.players.random,) * 4, starting_domino=None,
+         starting_player=0, hands=None, seed=None):
+    '''
+    Plays many games at once, with the same rules as Game. All games are
+    represented together, with arrays for the hands, the ends of the boards,
+    and the turns, and each move is made in all games that are in progress
+    with a few array operations. This is much faster than playing the games
+    one at a time, but only supports games using the double six set, and
+    players that sort moves by a fixed preference: identity, random, reverse,
+    bota_gorda, and double. The moves chosen by each player are the same as
+    when it is applied to a BitGame. Requires NumPy.
+
+    :param int n: amount of games to play. This value is
+                  ignored if hands are provided.
+    :param Sequence players: the player in each of the 4 seats,
+                             from dominoes.players. All players
+                             are random by default.
+    :param Domino starting_domino: the domino that should be played to start
+                                   each game. The player with this domino
+                                   in their hand will play first.
+    :param int starting_player: the player that should play first. This value
+                                is ignored if a starting domino is provided.
+    :param hands: array of shape (n, 4), containing the bitmask of each
+                  player's hand in each game, as in BitGame.hands. By
+                  default, the dominoes are dealt randomly.
+    :param seed: seed for the random numbers used to deal the dominoes and
+                 to choose random moves. By default, the seed is random.
+    :return: BatchResult of arrays with the results of the games
+    :raises ImportError: if NumPy is not installed
+    :raises ValueError: if a player cannot be played in a batch
+    :raises NoSuchDominoException: if starting_domino is invalid
+    :raises NoSuchPlayerException: if starting_player is invalid
+    '''
+    if np is None:
+        raise ImportError('Playing games in a batch requires NumPy!')
+
+    try:
+        scores = [_SCORES[p] for p in players]
+    except KeyError:
+        raise ValueError('Only the identity, random, reverse, bota_gorda,'
+                         ' and double players can be played in a batch!')
+
+    dominoes.game._validate_player(starting_player)
+
+    rng = np.random.default_rng(seed)
+
+    if hands is None:
+        # the position of each domino in a random permutation determines its hand
+        order = rng.random((n, 28)).argsort(axis=1)
+        hands = np.zeros((n, 4, 28), dtype=bool)
+        hands[np.arange(n)[:, None], order // 7, np.arange(28)] = True
+    else:
+        hands = _unpack(hands)
+        n = len(hands)
+
+    left_end = np.full(n, _EMPTY)
+    right_end = np.full(n, _EMPTY)
+    turn = np.full(n, starting_player)
+    result = BatchResult(np.zeros(n, dtype=int), np.zeros(n, dtype=bool),
+                         np.zeros(n, dtype=int))
+
+    # indexes of the games in progress
+    g = np.arange(n)
+
+    if starting_domino is not None:
+        i = dominoes.bit_game.mask([starting_domino]).bit_length() - 1
+        turn = hands[:, :, i].argmax(axis=1)
+        hands[g, turn, i] = False
+        left_end[:] = starting_domino.first
+        right_end[:] = starting_domino.second
+        g = _advance(hands, left_end, right_end, turn, result, g)
+
+    while len(g):
+        hand = hands[g, turn[g]]
+        valid = np.empty((len(g), _MOVES), dtype=bool)
+        valid[:, 0::2] = hand & _CONTAINS[left_end[g]]
+        valid[:, 1::2] = hand & _CONTAINS[right_end[g]] & \
+                         (left_end[g] != right_end[g])[:, None]
+
+        move_scores = np.empty((len(g), _MOVES))
+        for p, score in enumerate(scores):
+            seat = turn[g] == p
+            move_scores[seat] = score(rng, seat.sum())
+        move = np.where(valid, move_scores, -np.inf).argmax(axis=1)
+
+        d = move // 2
+        left = move % 2 == 0
+        hands[g, turn[g], d] = False
+
+        # the played domino replaces the end that it matches with its other value
+        first, second = _VALUES[d].T
+        empty = left_end[g] == _EMPTY
+        end = np.where(left, left_end[g], right_end[g])
+        other = np.where(first == end, second, first)
+        left_end[g] = np.where(empty, first, np.where(left, other, left_end[g]))
+        right_end[g] = np.where(empty, second, np.where(left, right_end[g], other))
+
+        g = _advance(hands, left_end, right_end, turn, result, g)
+
+    return result
@@ -0,0 +1,270 @@
+'''
+Benchmarks of the hot paths of the engine, the search, and the players.
+They run on a fixed corpus of positions, generated from seeded random
+games, so that runs on different versions of the code time the same work.
+Results are written as JSON, so that they can be stored and compared.
+
+.. code-block:: bash
+
+    $ python -m dominoes.bench --output before.json
+    $ python -m dominoes.bench --output after.json --baseline before.json
+'''
+import argparse
+import collections
+import copy
+import dominoes
+import gc
+import json
+import math
+import platform
+import random
+import sys
+import time
+
+# move numbers of the positions in the corpus
+MOVE_NUMBERS = (0, 4, 8, 12, 16)
+
+Benchmark = collections.namedtuple('Benchmark', ['name', 'setup', 'run', 'min_moves'])
+Benchmark.__doc__ = \
+'''
+namedtuple to represent a benchmark.
+
+:var name: name of the benchmark
+:var setup: function that takes a position and returns the argument to
+            pass to run. It is not timed, so it can copy the position.
+:var run: function that takes the value returned by setup, and does the
+          work to time
+:var min_moves: the benchmark only runs on positions with at least this
+                many moves, since its cost grows quickly with the amount
+                of dominoes remaining in hands
+'''
+
+def _player_benchmark(name, player, min_moves=0):
+    '''
+    :param str name: name of the benchmark
+    :param callable player: player to time
+    :param int min_moves: move number from which to time the player
+    :return: a Benchmark of calling the player on a position
+    '''
+    return Benchmark(name, copy.deepcopy, player, min_moves)
+
+def _search(game):
+    '''
+    Copies a game to be searched, replacing its board
+    with a SkinnyBoard, as the players do.
+
+    :param Game game: game to copy
+    :return: the copy
+    '''
+    game = copy.deepcopy(game)
+    game.skinny_board()
+
+    return game
+
+def _play_undo(hand):
+    '''
+    Plays the first domino of a hand, and draws it back.
+
+    :param Hand hand: hand to play from
+    :return: None
+    '''
+    d = hand[0]
+    hand.draw(d, hand.play(d))
+
+BENCHMARKS = (
+    Benchmark('Game.make_move', copy.deepcopy,
+              lambda g: g.make_move(*g.valid_moves[0]), 0),
+    Benchmark('Game.__deepcopy__', lambda g: g, copy.deepcopy, 0),
+    Benchmark('Game.clone', lambda g: g, lambda g: g.clone(), 0),
+    Benchmark('Hand.play', lambda g: copy.deepcopy(g.hands[g.turn]), _play_undo, 0),
+    Benchmark('Game.missing_values', lambda g: g, lambda g: g.missing_values(), 0),
+    Benchmark('Game.random_possible_hands', lambda g: g,
+              lambda g: g.random_possible_hands(), 0),
+    Benchmark('Game.all_possible_hands', lambda g: g,
+              lambda g: sum(1 for _ in g.all_possible_hands()), 16),
+    Benchmark('search.alphabeta', _search, dominoes.search.alphabeta, 12),
+    _player_benchmark('players.identity', dominoes.players.identity),
+    _player_benchmark('players.random', dominoes.players.random),
+    _player_benchmark('players.reverse', dominoes.players.reverse),
+    _player_benchmark('players.bota_gorda', dominoes.players.bota_gorda),
+    _player_benchmark('players.double', dominoes.players.double),
+    _player_benchmark('players.omniscient', dominoes.players.omniscient(), 12),
+    _player_benchmark('players.probabilistic_alphabeta',
+                      dominoes.players.probabilistic_alphabeta(sample_size=10), 16),
+    _player_benchmark('players.ismcts', dominoes.players.ismcts(iterations=100))
+)
+
+def corpus(positions, seed=0):
+    '''
+    Generates the positions to benchmark, by playing random moves from
+    random games. The same seed always generates the same positions.
+
+    :param int positions: amount of positions for each move number
+    :param int seed: seed of the random numbers used to generate the positions
+    :return: a dict mapping each move number in MOVE_NUMBERS
+             to a list of the Game objects with that many moves
+    '''
+    rand = random.getstate()
+    random.seed(seed)
+
+    games = {n: [] for n in MOVE_NUMBERS}
+    for n in MOVE_NUMBERS:
+        while len(games[n]) < positions:
+            g = dominoes.Game.new()
+            while g.result is None and len(g.moves) < n:
+                dominoes.players.random(g)
+                g.make_move(*g.valid_moves[0])
+
+            # positions in which the game already ended cannot be benchmarked
+            if g.result is None and len(g.moves) == n:
+                games[n].append(g)
+
+    random.setstate(rand)
+
+    return games
+
+def _time(benchmark, positions, number, seed):
+    '''
+    :param Benchmark benchmark: benchmark to time
+    :param list positions: positions to run the benchmark on
+    :param int number: amount of times to run the benchmark on each position
+    :param int seed: seed of the random numbers, set before the setup
+    :return: the seconds that running the benchmark took
+    '''
+    random.seed(seed)
+    args = [benchmark.setup(g) for _ in range(number) for g in positions]
+
+    # as in timeit, garbage collection is disabled while timing, since
+    # its cost depends on everything else that has been allocated
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for a in args:
+            benchmark.run(a)
+
+        return time.perf_counter() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+def run(games, benchmarks=BENCHMARKS, repeat=3, seed=0, min_time=0.02):
+    '''
+    Times each benchmark on the positions of each move number. Every
+    benchmark is run on all positions, enough times to take at least
+    min_time, so that fast benchmarks are not dominated by the noise of
+    the timer. This is repeated, and the fastest run is kept, to reduce
+    the noise from the rest of the system.
+
+    :param dict games: positions to benchmark, as returned by corpus()
+    :param Sequence benchmarks: Benchmark objects to run.
+                                Defaults to all benchmarks.
+    :param int repeat: amount of times to run each benchmark
+    :param int seed: seed of the random numbers used by the benchmarks,
+                     set before each run, so that randomized players
+                     do the same work on every run
+    :param float min_time: minimum seconds that each run should take
+    :return: a dict mapping the name of each benchmark to a dict
+             mapping move numbers, as strings, to the seconds
+             that a call to the benchmark takes on average
+    '''
+    rand = random.getstate()
+
+    results = {}
+    for b in benchmarks:
+        times = {}
+        for n, positions in sorted(games.items()):
+            if n < b.min_moves or not positions:
+                continue
+
+            # the first run also finds how many times to run the benchmark
+            best = _time(b, positions, 1, seed)
+            number = max(1, math.ceil(min_time / max(best, 1e-9)))
+            if number > 1:
+                best = float('inf')
+            for _ in range(repeat):
+                best = min(best, _time(b, positions, number, seed))
+
+            times[str(n)] = best / number / len(positions)
+
+        results[b.name] = times
+
+    random.setstate(rand)
+
+    return results
+
+def compare(baseline, results):
+    '''
+    :param dict baseline: results of an earlier run, as returned by run()
+    :param dict results: results of a later run, as returned by run()
+    :return: a dict with the same structure as the results, containing
+             the ratio of the time of each benchmark to its time in the
+             baseline. Benchmarks that are not in both runs are left out.
+    '''
+    ratios = {}
+    for name, times in results.items():
+        baseline_times = baseline.get(name, {})
+        common = {n: t / baseline_times[n] for n, t in times.items()
+                  if baseline_times.get(n)}
+        if common:
+            ratios[name] = common
+
+    return ratios
+
+def main(argv=None):
+    '''
+    Runs the benchmarks from the command line, and
+    writes their results as JSON. See --help.
+
+    :param list argv: command line arguments. Defaults to sys.argv[1:].
+    :return: None
+    '''
+    parser = argparse.ArgumentParser(prog='python -m dominoes.bench',
+                                     description='Benchmark the dominoes engine.')
+    parser.add_argument('--positions', type=int, default=10,
+                        help='amount of positions for each move number')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='amount of times to run each benchmark')
+    parser.add_argument('--min-time', type=float, default=0.02,
+                        help='minimum seconds that each run of a benchmark should take')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed of the random numbers')
+    parser.add_argument('--benchmark', action='append', dest='names',
+                        choices=[b.name for b in BENCHMARKS],
+                        help='benchmark to run; may be repeated. Defaults to all.')
+    parser.add_argument('--output', help='file to write the results to. Defaults to stdout.')
+    parser.add_argument('--baseline', help='results of an earlier run to compare to.'
+                                           ' The ratios are printed to stderr.')
+    args = parser.parse_args(argv)
+
+    benchmarks = [b for b in BENCHMARKS if args.names is None or b.name in args.names]
+    games = corpus(args.positions, args.seed)
+    report = {
+        'python': platform.python_version(),
+        'positions': args.positions,
+        'repeat': args.repeat,
+        'min_time': args.min_time,
+        'seed': args.seed,
+        'results': run(games, benchmarks, args.repeat, args.seed, args.min_time)
+    }
+
+    output = json.dumps(report, indent=4, sort_keys=True)
+    if args.output is None:
+        print(output)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+
+        ratios = compare(baseline, report['results'])
+        for name, times in sorted(ratios.items()):
+            moves = sorted(times, key=int)
+            print('{}: {}'.format(name, ', '.join(
+                'move {}: {:.2f}x'.format(n, times[n]) for n in moves
+            )), file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,404 @@
+import collections
+import dominoes
+import random
+
+# the 28 dominoes of the double six set. a domino's index in
+# this tuple is the position of its bit in a hand's bitmask.
+DOMINOES = tuple(dominoes.Domino(i, j) for i in range(7) for j in range(i, 7))
+
+# Domino objects compare and hash regardless of the order of
+# their values, so this also finds the index of inverted dominoes
+_INDEXES = {d: i for i, d in enumerate(DOMINOES)}
+
+# bitmasks of the dominoes that contain each value
+VALUE_MASKS = tuple(sum(1 << i for i, d in enumerate(DOMINOES) if v in d) for v in range(7))
+
+# bitmasks are split into 4 chunks of 7 bits, so that the points and the
+# dominoes in any bitmask can be computed with 4 lookups into these tables
+_CHUNK_BITS = 7
+_CHUNK_MASK = (1 << _CHUNK_BITS) - 1
+_CHUNK_POINTS = tuple(
+    tuple(sum(DOMINOES[c * _CHUNK_BITS + b].first + DOMINOES[c * _CHUNK_BITS + b].second
+              for b in range(_CHUNK_BITS) if m >> b & 1)
+          for m in range(1 << _CHUNK_BITS))
+    for c in range(4)
+)
+_CHUNK_INDEXES = tuple(
+    tuple(tuple(c * _CHUNK_BITS + b for b in range(_CHUNK_BITS) if m >> b & 1)
+          for m in range(1 << _CHUNK_BITS))
+    for c in range(4)
+)
+
+# information needed to undo a move, as returned by BitGame.make_undoable_move
+_Undo = collections.namedtuple('_Undo', ['domino', 'left', 'bit', 'left_end', 'right_end',
+                                         'turn', 'valid_moves', 'moves_length'])
+
+def mask(ds):
+    '''
+    :param Sequence ds: dominoes from the double six set
+    :return: bitmask of the provided dominoes
+    :raises NoSuchDominoException: if a domino is not in the double six set
+    '''
+    m = 0
+    for d in ds:
+        try:
+            m |= 1 << _INDEXES[d]
+        except KeyError:
+            raise dominoes.NoSuchDominoException('{} is not in the double six set!'.format(d))
+
+    return m
+
+def indexes(m):
+    '''
+    :param int m: bitmask of dominoes
+    :return: tuple of the indexes of the dominoes in the bitmask, in increasing order
+    '''
+    return _CHUNK_INDEXES[0][m & _CHUNK_MASK] + \
+           _CHUNK_INDEXES[1][m >> _CHUNK_BITS & _CHUNK_MASK] + \
+           _CHUNK_INDEXES[2][m >> 2 * _CHUNK_BITS & _CHUNK_MASK] + \
+           _CHUNK_INDEXES[3][m >> 3 * _CHUNK_BITS]
+
+def points(m):
+    '''
+    :param int m: bitmask of dominoes
+    :return: the sum of the values of the dominoes in the bitmask
+    '''
+    return _CHUNK_POINTS[0][m & _CHUNK_MASK] + \
+           _CHUNK_POINTS[1][m >> _CHUNK_BITS & _CHUNK_MASK] + \
+           _CHUNK_POINTS[2][m >> 2 * _CHUNK_BITS & _CHUNK_MASK] + \
+           _CHUNK_POINTS[3][m >> 3 * _CHUNK_BITS]
+
+class BitGame:
+    '''
+    Python class for objects that represent a dominoes game, with
+    the same rules as Game, but a more compact representation that
+    makes playing and searching faster. Each hand is represented
+    as a bitmask over the 28 dominoes of the double six set, and
+    the board is represented only by the values on its ends. As a
+    result, only games using the double six set are supported,
+    and the order of the dominoes within each hand is not kept.
+
+    BitGame objects support the same moves and valid moves as Game
+    objects, so they can be searched with dominoes.search.alphabeta
+    and sorted by the players in dominoes.players that only look at
+    the valid moves: identity, counter, random, reverse, bota_gorda,
+    and double. The players that copy the game or draw the hands that
+    the other players could have, such as omniscient and
+    probabilistic_alphabeta, need a Game.
+
+    :var hands: a list containing the bitmask of each player's hand
+    :var left_end: value on the left end of the board;
+                   None if the board is empty
+    :var right_end: value on the right end of the board;
+                    None if the board is empty
+    :var board_length: amount of dominoes on the board
+    :var moves: a list of the moves that have been played,
+                represented in the same way as in Game
+    :var turn: the player whose turn it is
+    :var valid_moves: a tuple of valid moves for the player whose turn it is
+    :var starting_player: first player to make a move
+    :var result: None if the game is in progress; otherwise a
+                 Result object indicating the outcome of the game
+
+    .. code-block:: python
+
+        >>> import dominoes
+        >>> g = dominoes.Game.new()
+        >>> bg = dominoes.BitGame.from_game(g)
+        >>> bg.hands
+        [54530146, 142632456, 70320389, 952464]
+        >>> bg.make_move(*bg.valid_moves[0])
+        >>> bg
+        Board: [0|6]
+        Player 0's hand: [0|1][0|5][1|6][4|4][4|6][5|5]
+        Player 1's hand: [0|3][1|3][1|4][2|2][2|3][4|5][6|6]
+        Player 2's hand: [0|0][0|2][1|2][2|5][3|5][3|6][5|6]
+        Player 3's hand: [0|4][1|1][1|5][2|4][2|6][3|3][3|4]
+        Player 1's turn
+        >>> bg.to_game().hands
+        [[0|1][0|5][1|6][4|4][4|6][5|5], [0|3][1|3][1|4][2|2][2|3][4|5][6|6], [0|0][0|2][1|2][2|5][3|5][3|6][5|6], [0|4][1|1][1|5][2|4][2|6][3|3][3|4]]
+    '''
+    def __init__(self, hands, left_end, right_end, board_length, moves,
+                 turn, valid_moves, starting_player, result):
+        self.hands = hands
+        self.left_end = left_end
+        self.right_end = right_end
+        self.board_length = board_length
+        self.moves = moves
+        self.turn = turn
+        self.valid_moves = valid_moves
+        self.starting_player = starting_player
+        self.result = result
+
+    @classmethod
+    def new(cls, starting_domino=None, starting_player=0):
+        '''
+        :param Domino starting_domino: the domino that should be played
+                                       to start the game. The player
+                                       with this domino in their hand
+                                       will play first.
+        :param int starting_player: the player that should play first.
+                                    This value is ignored if a starting
+                                    domino is provided.
+        :return: a new game, initialized according to
+                 starting_domino and starting_player
+        :raises NoSuchDominoException: if starting_domino is invalid
+        :raises NoSuchPlayerException: if starting_player is invalid
+        '''
+        order = list(range(len(DOMINOES)))
+        random.shuffle(order)
+        hands = [sum(1 << i for i in order[p * 7:(p + 1) * 7]) for p in range(4)]
+
+        if starting_domino is None:
+            dominoes.game._validate_player(starting_player)
+            valid_moves = tuple((DOMINOES[i], True) for i in indexes(hands[starting_player]))
+            return cls(hands, None, None, 0, [], starting_player,
+                       valid_moves, starting_player, None)
+
+        bit = mask([starting_domino])
+        starting_player = next(p for p, h in enumerate(hands) if h & bit)
+        valid_moves = ((starting_domino, True),)
+        game = cls(hands, None, None, 0, [], starting_player,
+                   valid_moves, starting_player, None)
+        game.make_move(*valid_moves[0])
+
+        return game
+
+    @classmethod
+    def from_game(cls, game):
+        '''
+        :param Game game: game to represent
+        :return: BitGame to represent the given Game
+        :raises NoSuchDominoException: if the game uses dominoes
+                                       outside of the double six set
+        '''
+        if game.board:
+            left_end = game.board.left_end()
+            right_end = game.board.right_end()
+        else:
+            left_end = None
+            right_end = None
+
+        return cls([mask(h) for h in game.hands], left_end, right_end,
+                   len(game.board), list(game.moves), game.turn,
+                   game.valid_moves, game.starting_player, game.result)
+
+    def to_game(self):
+        '''
+        :return: Game to represent this BitGame. Since only the ends of the
+                 board are known, the game uses a SkinnyBoard, and the dominoes
+                 in each hand are sorted in the order of their bitmask indexes.
+        '''
+        board = dominoes.SkinnyBoard(self.left_end, self.right_end, self.board_length)
+        hands = [dominoes.Hand(DOMINOES[i] for i in indexes(h)) for h in self.hands]
+
+        return dominoes.Game(board, hands, list(self.moves), self.turn,
+                             self.valid_moves, self.starting_player, self.result)
+
+    def position_key(self):
+        '''
+        :return: a hashable key for the current position of the game.
+                 See Game.position_key.
+        '''
+        if self.board_length:
+            ends = (self.left_end, self.right_end)
+        else:
+            ends = None
+
+        return ends, tuple(self.hands), self.turn
+
+    def remaining_points(self):
+        '''
+        :return: a list indicating the amount of points
+                 remaining in each player's hand
+        '''
+        return [points(h) for h in self.hands]
+
+    def _update_valid_moves(self):
+        '''
+        Updates self.valid_moves according to the latest game state.
+        Assumes that the board and all hands are non-empty.
+        '''
+        hand = self.hands[self.turn]
+        left_moves = hand & VALUE_MASKS[self.left_end]
+        if self.left_end == self.right_end:
+            right_moves = 0
+        else:
+            right_moves = hand & VALUE_MASKS[self.right_end]
+
+        # same order as Game: by domino, left end before right end
+        moves = []
+        for i in indexes(left_moves | right_moves):
+            if left_moves >> i & 1:
+                moves.append((DOMINOES[i], True))
+            if right_moves >> i & 1:
+                moves.append((DOMINOES[i], False))
+
+        self.valid_moves = tuple(moves)
+
+    def make_move(self, d, left):
+        '''
+        Plays a domino from the hand of the player whose turn it is onto one
+        end of the game board. If the game does not end, the turn is advanced
+        to the next player who has a valid move. See Game.make_move.
+
+        :param Domino d: domino to be played
+        :param bool left: end of the board on which to play the
+                          domino (True for left, False for right)
+        :return: a Result object if the game ends; None otherwise
+        :raises GameOverException: if the game has already ended
+        :raises NoSuchDominoException: if the domino to be played is not in
+                                       the hand of the player whose turn it is
+        :raises EndsMismatchException: if the domino cannot be placed on
+                                       the specified position in the board
+        '''
+        self._make_move(d, left)
+        return self.result
+
+    def make_undoable_move(self, d, left):
+        '''
+        Makes a move in the same way as BitGame.make_move, but returns
+        the information needed to take it back with BitGame.undo_move.
+        See Game.make_undoable_move.
+
+        :param Domino d: domino to be played
+        :param bool left: end of the board on which to play the
+                          domino (True for left, False for right)
+        :return: an object to pass to BitGame.undo_move
+        '''
+        left_end = self.left_end
+        right_end = self.right_end
+        turn = self.turn
+        valid_moves = self.valid_moves
+        moves_length = len(self.moves)
+
+        bit = self._make_move(d, left)
+
+        return _Undo(d, left, bit, left_end, right_end, turn, valid_moves, moves_length)
+
+    def undo_move(self, undo):
+        '''
+        Takes back a move made with BitGame.make_undoable_move.
+        See Game.undo_move.
+
+        :param undo: the object returned by BitGame.make_undoable_move
+        :return: None
+        '''
+        del self.moves[undo.moves_length:]
+        self.hands[undo.turn] |= undo.bit
+        self.left_end = undo.left_end
+        self.right_end = undo.right_end
+        self.board_length -= 1
+        self.turn = undo.turn
+        self.valid_moves = undo.valid_moves
+        self.result = None
+
+    def _make_move(self, d, left):
+        '''
+        Helper function for BitGame.make_move() and BitGame.make_undoable_move().
+
+        :return: the bit of the played domino
+        '''
+        if self.result is not None:
+            raise dominoes.GameOverException('Cannot make a move - the game is over!')
+
+        turn = self.turn
+        hand = self.hands[turn]
+        try:
+            bit = 1 << _INDEXES[d]
+        except KeyError:
+            bit = 0
+        if not hand & bit:
+            raise dominoes.NoSuchDominoException('Cannot make move -'
+                                                 ' {} is not in hand!'.format(d))
+
+        if not self.board_length:
+            self.left_end = d.first
+            self.right_end = d.second
+        elif left:
+            if d.first == self.left_end:
+                self.left_end = d.second
+            elif d.second == self.left_end:
+                self.left_end = d.first
+            else:
+                raise dominoes.EndsMismatchException(
+                    '{} cannot be added to the left of'
+                    ' the board - values do not match!'.format(d)
+                )
+        else:
+            if d.first == self.right_end:
+                self.right_end = d.second
+            elif d.second == self.right_end:
+                self.right_end = d.first
+            else:
+                raise dominoes.EndsMismatchException(
+                    '{} cannot be added to the right of'
+                    ' the board - values do not match!'.format(d)
+                )
+
+        hands = self.hands
+        hands[turn] = hand ^ bit
+        self.board_length += 1
+        self.moves.append((d, left))
+
+        # check if the game ended due to a player running out of dominoes
+        if not hands[turn]:
+            self.valid_moves = ()
+            self.result = dominoes.Result(
+                turn, True, pow(-1, turn) * sum(points(h) for h in hands)
+            )
+            return bit
+
+        # advance the turn to the next player with a valid move,
+        # recording the passes of the players in between
+        playable = VALUE_MASKS[self.left_end] | VALUE_MASKS[self.right_end]
+        for passes in range(3):
+            player = (turn + passes + 1) % 4
+            if hands[player] & playable:
+                self.moves.extend([None] * passes)
+                self.turn = player
+                self._update_valid_moves()
+                return bit
+
+        # no player has a valid move, so the game is stuck. as in Game,
+        # the turn goes around the table back to the player who moved.
+        if not hands[turn] & playable:
+            self.valid_moves = ()
+            team_points = [points(hands[0]) + points(hands[2]),
+                           points(hands[1]) + points(hands[3])]
+
+            if team_points[0] < team_points[1]:
+                self.result = dominoes.Result(turn, False, sum(team_points))
+            elif team_points[0] == team_points[1]:
+                self.result = dominoes.Result(turn, False, 0)
+            else:
+                self.result = dominoes.Result(turn, False, -sum(team_points))
+
+            return bit
+
+        # everyone else passed, and the player who moved can move again
+        self.moves.extend([None] * 3)
+        self._update_valid_moves()
+        return bit
+
+    def __eq__(self, other):
+        if not isinstance(other, type(self)):
+            return False
+
+        return self.__dict__ == other.__dict__
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __deepcopy__(self, _):
+        # hands are ints and moves are tuples of immutable
+        # objects, so shallow copies of the lists are sufficient
+        return type(self)(list(self.hands), self.left_end, self.right_end,
+                          self.board_length, list(self.moves), self.turn,
+                          self.valid_moves, self.starting_player, self.result)
+
+    def __str__(self):
+        return str(self.to_game())
+
+    def __repr__(self):
+        return str(self)
@@ -7,7 +7,21 @@ class Board:
     A domino board consists of a series of dominoes placed
     end to end such that the values on connected ends match.
 
-    :var board: deque representing the game board
+    The dominoes are stored in two persistent linked lists, one for each
+    side of the first domino that was added. Each node is a tuple of a
+    domino and the rest of its list, so nodes are never modified, and a
+    copy of a board shares them with the original. Copying a board and
+    adding a domino therefore take constant time, as does removing the
+    domino that was last added to an end, unless it is the first domino
+    and other dominoes were added to the other end after it. Removing
+    that domino takes linear time, since the linked lists are rebuilt.
+    Undoing moves in the reverse order in which they were made never
+    removes it.
+
+    :var board: read-only snapshot of the game board, as a deque
+                of its dominoes from left to right. It is built from
+                the linked lists on each access, in linear time, and
+                modifying it does not modify the board.
 
     .. code-block:: python
 
@@ -33,29 +47,79 @@ class Board:
         2
     '''
     def __init__(self):
-        self.board = collections.deque()
+        # first domino that was added, or None if the board is empty
+        self._center = None
+
+        # dominoes to the left of the center, from the left end inwards,
+        # and dominoes to the right of the center, from the right end
+        # inwards. each list is either None or a (domino, rest) tuple.
+        self._left = None
+        self._right = None
+
+        self._length = 0
+
+    @property
+    def board(self):
+        left = []
+        node = self._left
+        while node is not None:
+            left.append(node[0])
+            node = node[1]
+
+        right = []
+        node = self._right
+        while node is not None:
+            right.append(node[0])
+            node = node[1]
+
+        board = collections.deque(left)
+        if self._center is not None:
+            board.append(self._center)
+        board.extend(reversed(right))
+
+        return board
 
     def left_end(self):
         '''
         :return: the outward-facing value on the left end of the board
         :raises EmptyBoardException: if the board is empty
         '''
-        try:
-            return self.board[0].first
-        except IndexError:
-            raise dominoes.EmptyBoardException('Cannot retrieve the left end of'
-                                               ' the board because it is empty!')
+        if self._left is not None:
+            return self._left[0].first
+        if self._center is not None:
+            return self._center.first
+
+        raise dominoes.EmptyBoardException('Cannot retrieve the left end of'
+                                           ' the board because it is empty!')
 
     def right_end(self):
         '''
         :return: the outward-facing value on the right end of the board
         :raises EmptyBoardException: if the board is empty
         '''
-        try:
-            return self.board[-1].second
-        except IndexError:
-            raise dominoes.EmptyBoardException('Cannot retrieve the right end of'
-                                               ' the board because it is empty!')
+        if self._right is not None:
+            return self._right[0].second
+        if self._center is not None:
+            return self._center.second
+
+        raise dominoes.EmptyBoardException('Cannot retrieve the right end of'
+                                           ' the board because it is empty!')
+
+    def _set(self, board):
+        '''
+        Rebuilds the linked lists from a sequence of dominoes, with the first
+        domino as the center. This is only needed to remove a domino from an
+        end that has no dominoes left on its side of the center.
+
+        :param Sequence board: dominoes of the board, from left to right
+        :return: None
+        '''
+        self._center = board[0] if board else None
+        self._left = None
+        self._right = None
+        for d in board[1:]:
+            self._right = (d, self._right)
+        self._length = len(board)
 
     def _add_left(self, d):
         '''
@@ -66,17 +130,19 @@ class Board:
         :raises EndsMismatchException: if the values do not match
         '''
         if not self:
-            self.board.append(d)
+            self._center = d
         elif d.first == self.left_end():
-            self.board.appendleft(d.inverted())
+            self._left = (d.inverted(), self._left)
         elif d.second == self.left_end():
-            self.board.appendleft(d)
+            self._left = (d, self._left)
         else:
             raise dominoes.EndsMismatchException(
                 '{} cannot be added to the left of'
                 ' the board - values do not match!'.format(d)
             )
 
+        self._length += 1
+
     def _add_right(self, d):
         '''
         Adds the provided domino to the right end of the board.
@@ -86,17 +152,19 @@ class Board:
         :raises EndsMismatchException: if the values do not match
         '''
         if not self:
-            self.board.append(d)
+            self._center = d
         elif d.first == self.right_end():
-            self.board.append(d)
+            self._right = (d, self._right)
         elif d.second == self.right_end():
-            self.board.append(d.inverted())
+            self._right = (d.inverted(), self._right)
         else:
             raise dominoes.EndsMismatchException(
                 '{} cannot be added to the right of'
                 ' the board - values do not match!'.format(d)
             )
 
+        self._length += 1
+
     def add(self, d, left):
         '''
         Adds the provided domino to the specifed end of the board.
@@ -112,17 +180,61 @@ class Board:
         else:
             self._add_right(d)
 
+    def remove(self, d, left):
+        '''
+        Removes the provided domino from the specified end of the board.
+        The domino must be the last one that was added to that end, as
+        this is meant to undo a call to Board.add.
+
+        :param Domino d: domino to remove
+        :param bool left: end of the board from which to remove the
+                          domino (True for left, False for right)
+        :return: None
+        :raises EmptyBoardException: if the board is empty
+        '''
+        if not self:
+            raise dominoes.EmptyBoardException('Cannot remove {} from the'
+                                               ' board because it is empty!'.format(d))
+
+        if left and self._left is not None:
+            self._left = self._left[1]
+            self._length -= 1
+        elif not left and self._right is not None:
+            self._right = self._right[1]
+            self._length -= 1
+        elif self._length == 1:
+            self._center = None
+            self._length = 0
+        elif left:
+            self._set(list(self.board)[1:])
+        else:
+            self._set(list(self.board)[:-1])
+
+    def __copy__(self):
+        # the linked lists are immutable, so the copy can share them
+        board = type(self).__new__(type(self))
+        board._center = self._center
+        board._left = self._left
+        board._right = self._right
+        board._length = self._length
+
+        return board
+
+    def __deepcopy__(self, memo):
+        # Domino objects are immutable, so the copy can share them too
+        return self.__copy__()
+
     def __eq__(self, other):
         if not isinstance(other, type(self)):
             return False
 
-        return self.__dict__ == other.__dict__
+        return len(self) == len(other) and self.board == other.board
 
     def __ne__(self, other):
         return not self == other
 
     def __len__(self):
-        return len(self.board)
+        return self._length
 
     def __str__(self):
         return ''.join(str(d) for d in self.board)
@@ -1,4 +1,5 @@
 import collections
+import itertools
 
 # for convenience, immutability, and performance
 DominoBase = collections.namedtuple('DominoBase', ['first', 'second'])
@@ -10,6 +11,11 @@ class Domino(DominoBase):
     face into two square ends. Each end is marked with an
     integer value, typically ranging from 0 to 6 or 9.
 
+    Dominoes are interned: creating a domino with the same values, in the
+    same order, returns the same object. Both orientations of a domino share
+    an integer id, so comparing and hashing dominoes does not look at their
+    values.
+
     :param int first: value on one end
     :param int second: value on the other end
     :var first: value on one end
@@ -26,17 +32,62 @@ class Domino(DominoBase):
         [2|1]
         >>> d == d_inv
         True
+        >>> d is dominoes.Domino(1, 2)
+        True
         >>> other_d = dominoes.Domino(1, 3)
         >>> d == other_d
         False
         >>> 2 in d
         True
     '''
+    def __new__(cls, first, second):
+        # dominoes are interned, so that each pair of values is represented
+        # by the same object, and both orientations of a domino share an id
+        try:
+            return _DOMINOES[first, second]
+        except KeyError:
+            pass
+
+        d = super().__new__(cls, first, second)
+        if first == second:
+            inverted = d
+        else:
+            inverted = super().__new__(cls, second, first)
+
+        d._id = inverted._id = next(_IDS)
+        d._inverted = inverted
+        inverted._inverted = d
+
+        _DOMINOES[first, second] = d
+        _DOMINOES[second, first] = inverted
+
+        for v in {first, second}:
+            _VALUE_MASKS[v] = _VALUE_MASKS.get(v, 0) | 1 << d._id
+
+        return d
+
+    @classmethod
+    def _make(cls, iterable):
+        # namedtuple creates instances here without calling __new__,
+        # which would give them no id. they are interned instead.
+        values = tuple(iterable)
+        if len(values) != 2:
+            raise TypeError('Expected 2 arguments, got {}'.format(len(values)))
+
+        return cls(*values)
+
+    def _replace(self, **kwargs):
+        d = self._make((kwargs.pop('first', self.first), kwargs.pop('second', self.second)))
+        if kwargs:
+            raise ValueError('Got unexpected field names: {!r}'.format(list(kwargs)))
+
+        return d
+
     def inverted(self):
         '''
-        :return: a new Domino, with the same values, but in inverted positions
+        :return: the Domino with the same values, but in inverted positions
         '''
-        return Domino(self.second, self.first)
+        return self._inverted
 
     def __str__(self):
         return '[{}|{}]'.format(self.first, self.second)
@@ -50,8 +101,7 @@ class Domino(DominoBase):
 
         # order of values does not matter
         # e.g. Domino(1, 2) == Domino(2, 1)
-        return sorted((self.first, self.second)) == \
-            sorted((other.first, other.second))
+        return self._id == other._id
 
     def __ne__(self, other):
         return not self == other
@@ -59,7 +109,31 @@ class Domino(DominoBase):
     def __hash__(self):
         # order of values does not matter
         # e.g. hash(Domino(1, 2)) == hash(Domino(2, 1))
-        return hash(tuple(sorted((self.first, self.second))))
+        return self._id
 
     def __contains__(self, key):
         return key == self.first or key == self.second
+
+    def __reduce__(self):
+        # unpickled dominoes are interned as well
+        return type(self), (self.first, self.second)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, _):
+        return self
+
+# interned dominoes, keyed by their values in both orientations
+_DOMINOES = {}
+
+# bitmasks of the ids of the dominoes that contain each value
+_VALUE_MASKS = {}
+
+# ids of dominoes. the dominoes of the double six set are created first,
+# so that their ids do not depend on the order in which dominoes are
+# created, and are the same in every process.
+_IDS = itertools.count()
+for i in range(7):
+    for j in range(i, 7):
+        Domino(i, j)
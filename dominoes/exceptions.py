@@ -26,6 +26,13 @@ class GameOverException(Exception):
     '''
     pass
 
+class NoPossibleHandsException(Exception):
+    '''
+    Exception to be raised for errors involving
+    hands that are inconsistent with a game.
+    '''
+    pass
+
 class NoSuchDominoException(Exception):
     '''
     Exception to be raised for errors
@@ -1,8 +1,15 @@
+import bisect
+import collections
 import copy
 import dominoes
 import itertools
+import math
 import random
 
+# information needed to undo a move, as returned by Game.make_undoable_move
+_Undo = collections.namedtuple('_Undo', ['domino', 'left', 'index', 'turn',
+                                         'valid_moves', 'moves_length', 'missing'])
+
 def _randomized_hands():
     '''
     :return: 4 hands, obtained by shuffling the 28 dominoes used in
@@ -46,11 +53,7 @@ def _remaining_points(hands):
     :return: a list indicating the amount of points
              remaining in each of the input hands
     '''
-    points = []
-    for hand in hands:
-        points.append(sum(d.first + d.second for d in hand))
-
-    return points
+    return [hand._points() for hand in hands]
 
 def _validate_hands(hands, missing):
     '''
@@ -71,34 +74,222 @@ def _validate_hands(hands, missing):
 
     return True
 
-def _all_possible_partitionings(elements, sizes):
+def _all_possible_partitionings(elements, sizes, missing):
     '''
-    Helper function for Game.all_possible_hands(). Given a set of elements
-    and the sizes of partitions, yields all possible partitionings of the
-    elements into partitions of the provided sizes.
+    Helper function for Game.all_possible_hands(). Given a set of dominoes,
+    the sizes of partitions, and the values that must be missing from each
+    partition, yields all possible partitionings of the dominoes into
+    partitions of the provided sizes.
+
+    Each partition is only filled with dominoes that it can contain, and
+    dominoes that cannot be placed in any of the later partitions are
+    always placed in the current one, so that no partitioning that gets
+    started ever needs to be thrown away for containing a missing value.
 
-    :param set elements: a set of elements to partition.
+    :param set elements: a set of dominoes to partition.
     :param list sizes: a list of sizes for the partitions. The sum of the
-                       sizes should equal the length of the set of elements.
+                       sizes should equal the length of the set of dominoes.
+    :param list missing: a list of sets that indicate the values that must
+                         be missing from the respective partitions
     :yields: a tuple of tuples, each inner tuple corresponding to a partition.
     '''
-    try:
-        # get the size of the current partition
-        size = sizes[0]
-    except IndexError:
-        # base case: no more sizes left
-        yield ()
+    # get the partitions in which each domino can be placed
+    allowed = {d: {p for p, m in enumerate(missing) if not any(v in d for v in m)}
+               for d in elements}
+
+    def partitionings(elements, p):
+        try:
+            # get the size of the current partition
+            size = sizes[p]
+        except IndexError:
+            # base case: no more sizes left
+            yield ()
+            return
+
+        # dominoes that cannot be placed in a later partition must be placed in
+        # the current one. if they cannot be, no partitioning is possible.
+        later = set(range(p + 1, len(sizes)))
+        forced = tuple(d for d in elements if not allowed[d] & later)
+        if len(forced) > size or any(p not in allowed[d] for d in forced):
+            return
+
+        optional = [d for d in elements if p in allowed[d] and allowed[d] & later]
+
+        # iterate over all possible partitions of the current size
+        for partition in itertools.combinations(optional, size - len(forced)):
+            partition = forced + partition
+
+            # recursive case: pass down the remaining dominoes
+            for other_partitions in partitionings(elements.difference(partition), p + 1):
+                # put results together and yield up
+                yield (partition,) + other_partitions
+
+    return partitionings(elements, 0)
+
+def _splits(amount, partitions, capacities):
+    '''
+    Helper function for _random_possible_partitionings(). Yields all the ways
+    to split an amount of interchangeable elements among some partitions.
+
+    :param int amount: amount of elements to split
+    :param tuple partitions: indexes of the partitions that can get elements
+    :param tuple capacities: amount of elements that each partition can still get
+    :yields: a tuple with the amount of elements that each partition gets
+    '''
+    if not partitions:
+        if not amount:
+            yield (0,) * len(capacities)
         return
 
-    # don't include the current size in the recursive calls
-    sizes = sizes[1:]
+    # the first partition gets at least the elements
+    # that do not fit in the rest of the partitions
+    p = partitions[0]
+    rest = sum(capacities[q] for q in partitions[1:])
+    for k in range(max(amount - rest, 0), min(amount, capacities[p]) + 1):
+        for split in _splits(amount - k, partitions[1:], capacities):
+            yield split[:p] + (k,) + split[p + 1:]
+
+def _multinomial(split):
+    '''
+    :param tuple split: amount of elements in each partition
+    :return: the amount of ways to place distinct elements
+             into partitions of the provided sizes
+    '''
+    ways = math.factorial(sum(split))
+    for k in split:
+        ways //= math.factorial(k)
+
+    return ways
+
+def _random_possible_partitionings(elements, sizes, missing, sample_size):
+    '''
+    Helper function for Game.sample_possible_hands(). Given a list of dominoes,
+    the sizes of partitions, and the values that must be missing from each
+    partition, returns random partitionings of the dominoes, drawn
+    independently and uniformly among all possible partitionings.
+
+    Dominoes that can be placed in the same partitions are grouped together.
+    The amount of possible partitionings is counted for every way of splitting
+    each group among its partitions, and a split is drawn in proportion to
+    its amount, so no partitioning ever needs to be rejected. These counts
+    are shared by all the partitionings that get drawn.
+
+    :param list elements: a list of dominoes to partition
+    :param list sizes: a list of sizes for the partitions. The sum of the
+                       sizes should equal the length of the list of dominoes.
+    :param list missing: a list of sets that indicate the values that must
+                         be missing from the respective partitions
+    :param int sample_size: amount of partitionings to return
+    :return: a list of lists of lists, each inner list
+             corresponding to a partition
+    :raises NoPossibleHandsException: if no partitioning is possible
+    '''
+    # group the dominoes by the partitions in which they can be placed
+    groups = collections.defaultdict(list)
+    for d in elements:
+        partitions = tuple(p for p, m in enumerate(missing) if not any(v in d for v in m))
+        groups[partitions].append(d)
+    groups = list(groups.items())
+
+    # amount of possible partitionings of the groups starting at a given
+    # index, into partitions with the given capacities, keyed by both
+    counts = {}
+
+    def count(i, capacities):
+        try:
+            return counts[i, capacities]
+        except KeyError:
+            pass
+
+        if i == len(groups):
+            # base case: the partitioning is only possible if all partitions are full
+            total = int(not any(capacities))
+        else:
+            # recursive case: add up the partitionings that follow from each split
+            partitions, group = groups[i]
+            total = 0
+            for split in _splits(len(group), partitions, capacities):
+                rest = tuple(c - k for c, k in zip(capacities, split))
+                total += _multinomial(split) * count(i + 1, rest)
+
+        counts[i, capacities] = total
+        return total
+
+    capacities = tuple(sizes)
+    if not count(0, capacities):
+        raise dominoes.NoPossibleHandsException('No hands are possible'
+                                                ' given the known information!')
+
+    # splits of each group that can be drawn for the given capacities, with
+    # the running totals of their weights, keyed by group index and capacities
+    choices = {}
+
+    samples = []
+    for _ in range(sample_size):
+        partitioning = [[] for _ in sizes]
+        capacities = tuple(sizes)
+        for i, (partitions, group) in enumerate(groups):
+            try:
+                splits, cum_weights = choices[i, capacities]
+            except KeyError:
+                splits = []
+                cum_weights = []
+                total = 0
+                for split in _splits(len(group), partitions, capacities):
+                    rest = tuple(c - k for c, k in zip(capacities, split))
+                    weight = _multinomial(split) * count(i + 1, rest)
+                    if weight:
+                        total += weight
+                        splits.append((split, rest))
+                        cum_weights.append(total)
+                choices[i, capacities] = splits, cum_weights
+
+            # draw a split of the group, in proportion to the
+            # amount of possible partitionings that follow from it
+            drawn = bisect.bisect(cum_weights, random.randrange(cum_weights[-1]))
+            split, capacities = splits[drawn]
+
+            # place random dominoes of the group into each partition
+            group = random.sample(group, len(group))
+            start = 0
+            for p, k in enumerate(split):
+                partitioning[p].extend(group[start:start + k])
+                start += k
+
+        # do not leave the dominoes ordered by group
+        for p in partitioning:
+            random.shuffle(p)
+
+        samples.append(partitioning)
+
+    return samples
+
+def _missing_values(moves, starting_player):
+    '''
+    Replays the moves of a game, to compute the values that must be
+    missing from each player's hand, based on when they have passed.
 
-    # iterate over all possible partitions of the current size
-    for partition in itertools.combinations(elements, size):
-        # recursive case: pass down the remaining elements and the remaining sizes
-        for other_partitions in _all_possible_partitionings(elements.difference(partition), sizes):
-            # put results together and yield up
-            yield (partition,) + other_partitions
+    :param list moves: moves of the game, as in Game.moves
+    :param int starting_player: first player to make a move
+    :return: a list of frozensets, each one containing the values
+             that must be missing from the corresponding player's hand
+    '''
+    missing = [set() for _ in range(4)]
+
+    board = dominoes.SkinnyBoard()
+    player = starting_player
+    for move in moves:
+        if move is None:
+            # pass - update the missing values
+            missing[player].update([board.left_end(), board.right_end()])
+        else:
+            # not a pass - update the board
+            board.add(*move)
+
+        # move on to the next player
+        player = next_player(player)
+
+    return [frozenset(m) for m in missing]
 
 def next_player(player):
     '''
@@ -223,7 +414,7 @@ class Game:
         Player 1 won and scored 32 points!
     '''
     def __init__(self, board, hands, moves, turn,
-                 valid_moves, starting_player, result):
+                 valid_moves, starting_player, result, missing=None):
         self.board = board
         self.hands = hands
         self.moves = moves
@@ -232,6 +423,20 @@ class Game:
         self.starting_player = starting_player
         self.result = result
 
+        # values that must be missing from each player's hand, updated
+        # as passes are made. the list is replaced rather than modified,
+        # so that it can be shared with copies and restored on undo.
+        if missing is None:
+            self._missing = _missing_values(moves, starting_player)
+        else:
+            self._missing = missing
+
+        # bitmask of the players whose Hand, and whether the moves list,
+        # may be shared with a clone of the game. they are copied before
+        # being modified, so that the clone is not modified with them.
+        self._shared_hands = 0
+        self._shared_moves = False
+
     @classmethod
     def new(cls, starting_domino=None, starting_player=0):
         '''
@@ -272,6 +477,35 @@ class Game:
 
         return game
 
+    def position_key(self):
+        '''
+        Computes a key that identifies the current position of the game,
+        regardless of the order in which the moves leading to it were
+        played. Two games with the same key have the same values on the
+        ends of the board, the same dominoes remaining in each hand,
+        and the same player to move, so they have the same outcome
+        under optimal play.
+
+        :return: a hashable key for the current position of the game
+        '''
+        if self.board:
+            ends = (self.board.left_end(), self.board.right_end())
+        else:
+            ends = None
+
+        # order of dominoes within a hand, and order of values
+        # within a domino, do not affect the position
+        hands = tuple(h._position_key() for h in self.hands)
+
+        return ends, hands, self.turn
+
+    def remaining_points(self):
+        '''
+        :return: a list indicating the amount of points
+                 remaining in each player's hand
+        '''
+        return _remaining_points(self.hands)
+
     def skinny_board(self):
         '''
         Converts the board representation used by this game from a regular
@@ -281,21 +515,47 @@ class Game:
         '''
         self.board = dominoes.SkinnyBoard.from_board(self.board)
 
-    def _update_valid_moves(self):
+    def _end_values(self):
         '''
-        Updates self.valid_moves according to the latest game state.
-        Assumes that the board and all hands are non-empty.
+        Assumes that the board is non-empty.
+
+        :return: a tuple of the bitmasks of the ids of the dominoes that match
+                 the left end and the right end of the board. If both ends have
+                 the same value, the dominoes that match them only count for
+                 the left end, so that moves are not counted twice.
         '''
         left_end = self.board.left_end()
         right_end = self.board.right_end()
 
+        left_values = dominoes.domino._VALUE_MASKS.get(left_end, 0)
+        if left_end == right_end:
+            return left_values, 0
+
+        return left_values, dominoes.domino._VALUE_MASKS.get(right_end, 0)
+
+    def _update_valid_moves(self, left_values=None, right_values=None):
+        '''
+        Updates self.valid_moves according to the latest game state.
+        Assumes that the board and all hands are non-empty.
+
+        :param int left_values: the bitmask returned by _end_values()
+                                for the left end. Computed if not provided.
+        :param int right_values: the bitmask returned by _end_values()
+                                 for the right end. Computed if not provided.
+        '''
+        if left_values is None:
+            left_values, right_values = self._end_values()
+
+        hand = self.hands[self.turn]
+        left_mask = hand._mask & left_values
+        right_mask = hand._mask & right_values
+
         moves = []
-        for d in self.hands[self.turn]:
-            if left_end in d:
+        for d in hand:
+            bit = 1 << d._id
+            if left_mask & bit:
                 moves.append((d, True))
-            # do not double count moves if both of the board's ends have
-            # the same value, and a domino can be placed on both of them
-            if right_end in d and left_end != right_end:
+            if right_mask & bit:
                 moves.append((d, False))
 
         self.valid_moves = tuple(moves)
@@ -319,9 +579,68 @@ class Game:
         :raises EndsMismatchException: if the domino cannot be placed on
                                        the specified position in the board
         '''
+        self._make_move(d, left)
+        return self.result
+
+    def make_undoable_move(self, d, left):
+        '''
+        Makes a move in the same way as Game.make_move, but returns
+        the information needed to take it back with Game.undo_move.
+        This allows exploring moves on a single Game object, without
+        having to copy it before each move.
+
+        :param Domino d: domino to be played
+        :param bool left: end of the board on which to play the
+                          domino (True for left, False for right)
+        :return: an object to pass to Game.undo_move
+        :raises GameOverException: if the game has already ended
+        :raises NoSuchDominoException: if the domino to be played is not in
+                                       the hand of the player whose turn it is
+        :raises EndsMismatchException: if the domino cannot be placed on
+                                       the specified position in the board
+        '''
+        turn = self.turn
+        valid_moves = self.valid_moves
+        moves_length = len(self.moves)
+        missing = self._missing
+
+        i = self._make_move(d, left)
+
+        return _Undo(d, left, i, turn, valid_moves, moves_length, missing)
+
+    def undo_move(self, undo):
+        '''
+        Takes back a move made with Game.make_undoable_move, restoring the
+        board, the hands, the moves, the turn, the valid moves, and the
+        result to their state before the move. Moves must be undone in the
+        reverse order in which they were made.
+
+        :param undo: the object returned by Game.make_undoable_move
+        :return: None
+        '''
+        # remove the move, as well as any passes that followed it
+        self._own_moves()
+        del self.moves[undo.moves_length:]
+
+        self.board.remove(undo.domino, undo.left)
+        self._own_hand(undo.turn)
+        self.hands[undo.turn].draw(undo.domino, undo.index)
+
+        self.turn = undo.turn
+        self.valid_moves = undo.valid_moves
+        self.result = None
+        self._missing = undo.missing
+
+    def _make_move(self, d, left):
+        '''
+        Helper function for Game.make_move() and Game.make_undoable_move().
+
+        :return: the index within the hand of the played domino
+        '''
         if self.result is not None:
             raise dominoes.GameOverException('Cannot make a move - the game is over!')
 
+        self._own_hand(self.turn)
         i = self.hands[self.turn].play(d)
 
         try:
@@ -333,6 +652,7 @@ class Game:
             raise error
 
         # record the move
+        self._own_moves()
         self.moves.append((d, left))
 
         # check if the game ended due to a player running out of dominoes
@@ -341,24 +661,32 @@ class Game:
             self.result = dominoes.Result(
                 self.turn, True, pow(-1, self.turn) * sum(_remaining_points(self.hands))
             )
-            return self.result
+            return i
 
-        # advance the turn to the next player with a valid move.
-        # if no player has a valid move, the game is stuck. also,
-        # record all the passes.
-        passes = []
+        # advance the turn to the next player with a valid move. only
+        # players with a domino that matches an end of the board have
+        # one, so the other players pass without looking at their
+        # dominoes. if no player has a valid move, the game is stuck.
+        # also, record all the passes.
+        left_values, right_values = self._end_values()
+        ends_values = left_values | right_values
+
+        players_passed = []
         stuck = True
         for _ in self.hands:
             self.turn = next_player(self.turn)
-            self._update_valid_moves()
-            if self.valid_moves:
-                self.moves.extend(passes)
+            if self.hands[self.turn]._mask & ends_values:
+                self._update_valid_moves(left_values, right_values)
+                if players_passed:
+                    self.moves.extend([None] * len(players_passed))
+                    self._update_missing_values(players_passed)
                 stuck = False
                 break
             else:
-                passes.append(None)
+                players_passed.append(self.turn)
 
         if stuck:
+            self.valid_moves = ()
             player_points = _remaining_points(self.hands)
             team_points = [player_points[0] + player_points[2],
                            player_points[1] + player_points[3]]
@@ -370,43 +698,87 @@ class Game:
             else:
                 self.result = dominoes.Result(self.turn, False, -sum(team_points))
 
-            return self.result
+        return i
+
+    def _own_hand(self, player):
+        '''
+        Copies a player's Hand if it may be shared with a clone of the game,
+        so that it can be modified without modifying the clone.
+
+        :param int player: player whose hand is about to be modified
+        :return: None
+        '''
+        if self._shared_hands >> player & 1:
+            self.hands[player] = dominoes.Hand(self.hands[player])
+            self._shared_hands &= ~(1 << player)
+
+    def _own_moves(self):
+        '''
+        Copies the moves list if it may be shared with a clone of the game,
+        so that it can be modified without modifying the clone.
+
+        :return: None
+        '''
+        if self._shared_moves:
+            self.moves = list(self.moves)
+            self._shared_moves = False
+
+    def _update_missing_values(self, players):
+        '''
+        Adds the values on the ends of the board to the values
+        that must be missing from the hands of players who passed.
+
+        :param list players: players who passed
+        :return: None
+        '''
+        ends = {self.board.left_end(), self.board.right_end()}
+
+        missing = list(self._missing)
+        for p in players:
+            missing[p] = missing[p] | ends
+
+        self._missing = missing
 
     def missing_values(self):
         '''
-        Computes the values that must be missing from each
-        player's hand, based on when they have passed.
+        Returns the values that must be missing from each player's hand,
+        based on when they have passed. They are kept up to date as moves
+        are made, so the game does not need to be replayed.
 
         :return: a list of sets, each one containing the
                  values that must be missing from the
                  corresponding player's hand
         '''
-        missing = [set() for _ in self.hands]
-
-        # replay the game from the beginning
-        board = dominoes.SkinnyBoard()
-        player = self.starting_player
-        for move in self.moves:
-            if move is None:
-                # pass - update the missing values
-                missing[player].update([board.left_end(), board.right_end()])
-            else:
-                # not a pass - update the board
-                board.add(*move)
-
-            # move on to the next player
-            player = next_player(player)
-
-        return missing
+        return [set(m) for m in self._missing]
 
     def random_possible_hands(self):
         '''
         Returns random possible hands for all players, given the information
         known by the player whose turn it is. This information includes the
         current player's hand, the sizes of the other players' hands, and the
-        moves played by every player, including the passes.
+        moves played by every player, including the passes. All possible
+        hands are equally likely to be returned.
 
         :return: a list of possible Hand objects, corresponding to each player
+        :raises NoPossibleHandsException: if no hands are possible, which
+                                          can only happen if the hands are
+                                          inconsistent with the passes
+        '''
+        return self.sample_possible_hands(1)[0]
+
+    def sample_possible_hands(self, sample_size):
+        '''
+        Returns random possible hands for all players, drawn independently in
+        the same way as in Game.random_possible_hands(). Drawing many at once
+        is faster than calling Game.random_possible_hands() repeatedly, since
+        the information known about the hands only needs to be processed once.
+
+        :param int sample_size: amount of possible hands to return
+        :return: a list of lists of possible Hand objects, each corresponding to
+                 each player
+        :raises NoPossibleHandsException: if no hands are possible, which
+                                          can only happen if the hands are
+                                          inconsistent with the passes
         '''
         # compute values that must be missing from
         # each hand, to rule out impossible hands
@@ -420,24 +792,28 @@ class Game:
         # initial set of dominoes
         other_dominoes = [d for p, h in enumerate(self.hands) for d in h if p != self.turn]
 
-        while True:
-            # generator for a shuffled shallow copy of other_dominoes
-            shuffled_dominoes = (d for d in random.sample(other_dominoes, len(other_dominoes)))
+        # get the lengths of all the other hands, so that we know how
+        # many dominoes to place in each, and the values missing from them
+        other_hand_lengths = [len(h) for p, h in enumerate(self.hands) if p != self.turn]
+        other_missing = [m for p, m in enumerate(missing) if p != self.turn]
+
+        samples = []
+        for possible_hands in _random_possible_partitionings(other_dominoes, other_hand_lengths,
+                                                             other_missing, sample_size):
+            # generator for the dominoes in each of the other players' hands
+            possible_hands = (h for h in possible_hands)
 
-            # generate random hands by partitioning the shuffled dominoes according
-            # to how many dominoes need to be in each of the other hands. since we
+            # build a list containing possible hands for all players. since we
             # know the current player's hand, we just use a shallow copy of it
             hands = []
             for player, hand in enumerate(self.hands):
                 if player != self.turn:
-                    hand = [next(shuffled_dominoes) for _ in hand]
+                    hand = next(possible_hands)
                 hands.append(dominoes.Hand(hand))
 
-            # only return the hands if they are possible, according to the values we
-            # know to be missing from each hand. if the hands are not possible, try
-            # generating random hands again
-            if _validate_hands(hands, missing):
-                return hands
+            samples.append(hands)
+
+        return samples
 
     def all_possible_hands(self):
         '''
@@ -460,12 +836,15 @@ class Game:
         # initial set of dominoes
         other_dominoes = {d for p, h in enumerate(self.hands) for d in h if p != self.turn}
 
-        # get the lengths of all the other hands, so
-        # that we know how many dominoes to place in each
+        # get the lengths of all the other hands, so that we know how
+        # many dominoes to place in each, and the values missing from them
         other_hand_lengths = [len(h) for p, h in enumerate(self.hands) if p != self.turn]
+        other_missing = [m for p, m in enumerate(missing) if p != self.turn]
 
-        # iterate over all possible hands that the other players might have
-        for possible_hands in _all_possible_partitionings(other_dominoes, other_hand_lengths):
+        # iterate over all possible hands that the other players might have.
+        # only hands without the values missing from them get generated.
+        for possible_hands in _all_possible_partitionings(other_dominoes, other_hand_lengths,
+                                                          other_missing):
             # given possible hands for all players, this is a generator for
             # tuples containing the dominoes that are in the other players' hands
             possible_hands = (h for h in possible_hands)
@@ -478,33 +857,86 @@ class Game:
                     hand = next(possible_hands)
                 hands.append(dominoes.Hand(hand))
 
-            # only yield the hands if they are possible, according
-            # to the values we know to be missing from each hand
-            if _validate_hands(hands, missing):
-                yield hands
+            yield hands
 
-    def __eq__(self, other):
-        if not isinstance(other, type(self)):
-            return False
+    def clone(self):
+        '''
+        Copies the game cheaply, for exploring moves without modifying it.
+        The copy shares the hands and the moves list with the original,
+        and each game copies them only before modifying them itself, so
+        the hands that are never played from are never copied. Games that
+        only read the hands and the moves, such as the ones searched by
+        the players, are therefore much cheaper to clone than to deepcopy.
+
+        Note that the sharing is only undone by the methods of Game. If
+        the hands or the moves list of the copy or the original are to
+        be modified directly, they must be replaced by copies first,
+        or the game must be copied with copy.deepcopy instead.
+
+        :return: a new game, in the same state as this one
+
+        .. code-block:: python
+
+            >>> import dominoes
+            >>> g = dominoes.Game.new()
+            >>> g.make_move(*g.valid_moves[0])
+            >>> c = g.clone()
+            >>> p = c.turn
+            >>> c.hands[p] is g.hands[p]
+            True
+            >>> c.make_move(*c.valid_moves[0])
+            >>> c.hands[p] is g.hands[p]
+            False
+            >>> len(c.moves) > len(g.moves)
+            True
+        '''
+        game = type(self)(self._copy_board(), list(self.hands), self.moves,
+                          self.turn, self.valid_moves, self.starting_player,
+                          self.result, self._missing)
 
-        return self.__dict__ == other.__dict__
+        # the hands and the moves list are now shared by both games
+        self._shared_hands = game._shared_hands = (1 << len(self.hands)) - 1
+        self._shared_moves = game._shared_moves = True
 
-    def __ne__(self, other):
-        return not self == other
+        return game
 
-    def __deepcopy__(self, _):
+    def _copy_board(self):
+        '''
+        :return: a copy of the game board. Both kinds of boards
+                 can be copied in constant time.
+        '''
         if isinstance(self.board, dominoes.SkinnyBoard):
             if self.board:
                 # SkinnyBoard attributes are ints; no need to deepcopy
-                board = dominoes.SkinnyBoard(self.board.left_end(),
-                                             self.board.right_end(),
-                                             len(self.board))
+                return dominoes.SkinnyBoard(self.board.left_end(),
+                                            self.board.right_end(),
+                                            len(self.board))
             else:
                 # board is empty
-                board = dominoes.SkinnyBoard()
+                return dominoes.SkinnyBoard()
         else:
-            # TODO: optimize for Board class
-            board = copy.deepcopy(self.board)
+            # Board copies share their dominoes with the original
+            return copy.copy(self.board)
+
+    def _state(self):
+        '''
+        :return: a dict of the attributes that determine the state of the
+                 game, leaving out whether objects are shared with clones
+        '''
+        return {k: v for k, v in self.__dict__.items()
+                if k not in ('_shared_hands', '_shared_moves')}
+
+    def __eq__(self, other):
+        if not isinstance(other, type(self)):
+            return False
+
+        return self._state() == other._state()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __deepcopy__(self, _):
+        board = self._copy_board()
 
         # only need to copy the Hand, because the Domino objects are
         # immutable. note that using copy.copy does not work because
@@ -527,8 +959,11 @@ class Game:
         # just an int; no need to deepcopy
         starting_player = self.starting_player
 
+        # list of frozensets that is never modified; no need to copy
+        missing = self._missing
+
         return type(self)(board, hands, moves, turn,
-                          valid_moves, starting_player, result)
+                          valid_moves, starting_player, result, missing)
 
     def __str__(self):
         string_list = ['Board: {}'.format(self.board)]
@@ -9,11 +9,7 @@ def contains_value(hand, value):
     :param int value: value to look for in the hand
     :return: bool indicating whether the value was found in the hand
     '''
-    for d in hand:
-        if value in d:
-            return True
-
-    return False
+    return bool(hand._value_mask(value))
 
 class Hand(collections.abc.Sequence):
     '''
@@ -41,8 +37,26 @@ class Hand(collections.abc.Sequence):
         [1|3]
     '''
     def __init__(self, dominoes):
+        if isinstance(dominoes, Hand):
+            # copying a hand does not need to rebuild its bitmask
+            self._dominoes = list(dominoes._dominoes)
+            self._mask = dominoes._mask
+            self._duplicates = dominoes._duplicates
+            return
+
         self._dominoes = list(dominoes)
 
+        # bitmask of the ids of the dominoes in the hand, which gives
+        # constant time membership tests. the list keeps their order.
+        self._mask = 0
+        for d in self._dominoes:
+            self._mask |= 1 << d._id
+
+        # amount of dominoes that are in the hand more than once, which
+        # the bitmask cannot represent. hands dealt from a set of dominoes
+        # have none, so their bitmask is updated in constant time.
+        self._duplicates = len(self._dominoes) - bin(self._mask).count('1')
+
     def play(self, d):
         '''
         Removes a domino from the hand.
@@ -52,12 +66,21 @@ class Hand(collections.abc.Sequence):
         :raises NoSuchDominoException: if the domino is not in the hand
         '''
         try:
-            i = self._dominoes.index(d)
-        except ValueError:
+            bit = 1 << d._id
+        except AttributeError:
+            bit = 0
+        if not self._mask & bit:
             raise dominoes.NoSuchDominoException('Cannot make move -'
                                                  ' {} is not in hand!'.format(d))
 
+        i = self._dominoes.index(d)
         self._dominoes.pop(i)
+
+        if self._duplicates and d in self._dominoes:
+            self._duplicates -= 1
+        else:
+            self._mask ^= bit
+
         return i
 
     def draw(self, d, i=None):
@@ -74,14 +97,60 @@ class Hand(collections.abc.Sequence):
         else:
             self._dominoes.insert(i, d)
 
+        bit = 1 << d._id
+        if self._mask & bit:
+            self._duplicates += 1
+        else:
+            self._mask |= bit
+
+    def _value_mask(self, value):
+        '''
+        :param int value: value to look for in the hand
+        :return: the bitmask of the ids of the dominoes in the hand that
+                 contain the value. It is computed from the bitmask of
+                 the hand, so it does not need to be updated as dominoes
+                 are played and drawn.
+        '''
+        return self._mask & dominoes.domino._VALUE_MASKS.get(value, 0)
+
+    def _points(self):
+        '''
+        :return: the sum of the values of the dominoes in the hand. For hands
+                 of dominoes from the double six set, whose ids are 0 to 27,
+                 it is looked up from the bitmask of the hand, so it does
+                 not need to be kept up to date as dominoes are played.
+        '''
+        if not self._duplicates and not self._mask >> 28:
+            return dominoes.bit_game.points(self._mask)
+
+        return sum(d.first + d.second for d in self._dominoes)
+
+    def _position_key(self):
+        '''
+        :return: a hashable key for the dominoes in the hand, regardless of
+                 their order, and of the order of the values within each
+                 domino. Since both orientations of a domino share an id,
+                 this is the bitmask of the hand, unless it has duplicates.
+        '''
+        if not self._duplicates:
+            return self._mask
+
+        return tuple(sorted(d._id for d in self._dominoes))
+
+    def __contains__(self, d):
+        return isinstance(d, dominoes.Domino) and bool(self._mask >> d._id & 1)
+
     def __getitem__(self, i):
         return self._dominoes[i]
 
+    def __iter__(self):
+        return iter(self._dominoes)
+
     def __eq__(self, other):
         if not isinstance(other, type(self)):
             return False
 
-        return self.__dict__ == other.__dict__
+        return self._dominoes == other._dominoes
 
     def __ne__(self, other):
         return not self == other
@@ -29,9 +29,11 @@ may be applied one after another for easy composability.
         game.valid_moves = tuple(sorted(game.valid_moves, key=lambda m: m[0].first != m[0].second))
 '''
 import collections
-import copy
 import dominoes
+import math
+import multiprocessing
 import random as rand
+import time
 
 def identity(game):
     '''
@@ -121,13 +123,56 @@ class omniscient:
                             Ordering better moves first may significantly
                             reduce the amount of moves that need to be
                             explored. The identity player is the default.
+    :param TranspositionTable transposition_table: table used by the underlying
+                                                   calls to alphabeta search. It
+                                                   is shared across calls, so
+                                                   positions searched for an
+                                                   earlier move do not need to
+                                                   be searched again. By default
+                                                   no table is used.
+    :param float max_time: seconds that each decision may take. If this
+                           or max_nodes is provided, the player runs an
+                           iterative deepening search, and prefers the
+                           best move found by the deepest search that
+                           completed within the budget. By default the
+                           search runs until the end of the game.
+    :param int max_nodes: amount of positions that each decision may search.
+                          By default the search runs until the end of the game.
+    :param MoveHistory history: history of the moves that caused cutoffs in
+                                the underlying calls to alphabeta search, used
+                                to sort moves after the player sorts them. It
+                                is shared across calls. Only used when there is
+                                no budget. By default only the player sorts moves.
+    :param Tablebase tablebase: tablebase in which the underlying calls to
+                                alphabeta search look up the exact values of
+                                positions instead of searching them. By
+                                default every position is searched.
+    :param int workers: amount of processes among which to split the moves
+                        available at the root of the underlying call to
+                        alphabeta search. Only used when there is no budget.
+                        By default the search runs in the current process.
+    :param bool collect_stats: if True, the statistics of the search run on
+                               each call are appended to self.stats. The
+                               default is False.
     :param str name: the name of this player. The default is the name
                      of this class.
+    :var list stats: SearchStats of each call that ran a search,
+                     if they are being collected
     :var str __name__: the name of this player
     '''
-    def __init__(self, start_move=0, player=identity, name=None):
+    def __init__(self, start_move=0, player=identity, transposition_table=None,
+                 max_time=None, max_nodes=None, history=None, tablebase=None,
+                 workers=None, collect_stats=False, name=None):
         self._start_move = start_move
         self._player = player
+        self._transposition_table = transposition_table
+        self._max_time = max_time
+        self._max_nodes = max_nodes
+        self._history = history
+        self._tablebase = tablebase
+        self._workers = workers
+        self._collect_stats = collect_stats
+        self.stats = []
         if name is None:
             self.__name__ = type(self).__name__
         else:
@@ -139,19 +184,101 @@ class omniscient:
         if len(game.moves) < self._start_move or len(game.valid_moves) == 1:
             return
 
-        # so that we don't modify the original game
-        game_copy = copy.deepcopy(game)
+        # so that we don't modify the original game. the search
+        # only makes and undoes moves, so a clone is enough.
+        game_copy = game.clone()
 
         # for performance
         game_copy.skinny_board()
 
-        # perform an alphabeta search to find the optimal move sequence
-        moves, _ = dominoes.search.alphabeta(game_copy, player=self._player)
+        if self._collect_stats:
+            stats = dominoes.search.SearchStats()
+            self.stats.append(stats)
+        else:
+            stats = None
+
+        if self._max_time is None and self._max_nodes is None:
+            # perform an alphabeta search to find the optimal move sequence
+            moves, _ = dominoes.search.alphabeta(game_copy, player=self._player,
+                                                 transposition_table=self._transposition_table,
+                                                 history=self._history,
+                                                 tablebase=self._tablebase,
+                                                 stats=stats, workers=self._workers)
+        else:
+            # search as deep as the budget allows
+            moves, _, _ = dominoes.search.iterative_deepening(
+                game_copy, self._max_time, self._max_nodes, self._player,
+                self._transposition_table, self._tablebase, stats
+            )
 
         # place the optimal move at the beginning of game.valid_moves,
         # while leaving the rest of the ordering unchanged
         game.valid_moves = (moves[0],) + tuple(m for m in game.valid_moves if m != moves[0])
 
+def _optimal_move(game, hands, player, transposition_table, tablebase, stats):
+    '''
+    Helper function for probabilistic_alphabeta.
+
+    :param Game game: game in which to assume the provided hands.
+                      It is not modified.
+    :param list hands: hands to assume for all players
+    :param callable player: player used to sort moves to be explored
+    :param TranspositionTable transposition_table: table to use in the search
+    :param Tablebase tablebase: tablebase to use in the search
+    :param SearchStats stats: statistics to update with the search
+    :return: the optimal move, given the assumed hands
+    '''
+    game_copy = game.clone()
+    game_copy.hands = hands
+
+    return dominoes.search.alphabeta(game_copy, player=player,
+                                     transposition_table=transposition_table,
+                                     tablebase=tablebase, stats=stats)[0][0]
+
+# amount of possible hands sent to a worker process at a time
+_POSSIBLE_HANDS_CHUNKSIZE = 4
+
+# transposition table and tablebase of the current worker process
+_possible_hands_table = None
+_possible_hands_tablebase = None
+
+def _init_possible_hands_worker(table_size, tablebase):
+    '''
+    Initializes a process that searches possible hands for probabilistic_alphabeta.
+
+    :param int table_size: size of the transposition table to use in
+                           this process; None to not use a table
+    :param Tablebase tablebase: tablebase to use in this process;
+                                None to not use a tablebase
+    :return: None
+    '''
+    global _possible_hands_table
+    global _possible_hands_tablebase
+
+    _possible_hands_tablebase = tablebase
+    if table_size is None:
+        _possible_hands_table = None
+    else:
+        _possible_hands_table = dominoes.search.TranspositionTable(table_size)
+
+def _possible_hands_optimal_move(args):
+    '''
+    Calls _optimal_move in a worker process.
+
+    :param tuple args: game, possible hands, player, and whether to collect statistics
+    :return: a tuple of the optimal move, given the possible hands, and
+             the statistics of the search, if they were collected
+    '''
+    game, hands, player, collect_stats = args
+
+    if collect_stats:
+        stats = dominoes.search.SearchStats()
+    else:
+        stats = None
+
+    return _optimal_move(game, hands, player, _possible_hands_table,
+                         _possible_hands_tablebase, stats), stats
+
 class probabilistic_alphabeta:
     '''
     This player repeatedly assumes the other players' hands, runs alphabeta search,
@@ -175,14 +302,59 @@ class probabilistic_alphabeta:
                             Ordering better moves first may significantly
                             reduce the amount of moves that need to be
                             explored. The identity player is the default.
+    :param TranspositionTable transposition_table: table used by the underlying
+                                                   calls to alphabeta search.
+                                                   Positions are keyed on all
+                                                   hands, so results are only
+                                                   reused between assumed hands
+                                                   that lead to the same
+                                                   positions. It is shared
+                                                   across calls. By default
+                                                   no table is used.
+    :param int table_size: if no transposition table is provided, the size
+                           of a table that each call creates and shares
+                           among the searches of all of its possible hands,
+                           which reach the same positions once the dominoes
+                           that they disagree on have been played. The table
+                           is discarded after the call, which bounds the
+                           memory used. This searches fewer positions, but
+                           looking up every position also has a cost, so it
+                           pays off when searches are large. By default no
+                           table is used.
+    :param Tablebase tablebase: tablebase in which the underlying calls to
+                                alphabeta search look up the exact values of
+                                positions instead of searching them. By
+                                default every position is searched.
+    :param int workers: amount of processes among which to split the searches
+                        of the possible hands. Random hands are still drawn in
+                        the current process, so the result is the same as that
+                        of a serial run with the same random seed. The player
+                        must be picklable. Since processes cannot share a table,
+                        each one uses its own table of the same size as the
+                        table that the searches would otherwise use, which is
+                        left unused. By default all searches run in the
+                        current process.
+    :param bool collect_stats: if True, the statistics of the searches run on
+                               each call, added up over all possible hands, are
+                               appended to self.stats. The default is False.
     :param str name: the name of this player. The default is the name
                      of this class.
+    :var list stats: SearchStats of each call that ran searches,
+                     if they are being collected
     :var str __name__: the name of this player
     '''
-    def __init__(self, start_move=0, sample_size=float('inf'), player=identity, name=None):
+    def __init__(self, start_move=0, sample_size=float('inf'), player=identity,
+                 transposition_table=None, table_size=None, tablebase=None,
+                 workers=None, collect_stats=False, name=None):
         self._start_move = start_move
         self._sample_size = sample_size
         self._player = player
+        self._transposition_table = transposition_table
+        self._table_size = table_size
+        self._tablebase = tablebase
+        self._workers = workers
+        self._collect_stats = collect_stats
+        self.stats = []
         if name is None:
             self.__name__ = type(self).__name__
         else:
@@ -194,29 +366,233 @@ class probabilistic_alphabeta:
         if len(game.moves) < self._start_move or len(game.valid_moves) == 1:
             return
 
+        if self._transposition_table is not None:
+            table = self._transposition_table
+        elif self._table_size is not None:
+            # share solved positions among the possible hands of this call only
+            table = dominoes.search.TranspositionTable(self._table_size)
+        else:
+            table = None
+
         if self._sample_size == float('inf'):
             # by default consider all hands the other players could possibly have
             hands = game.all_possible_hands()
         else:
-            # otherwise obtain a random sample
-            hands = (game.random_possible_hands() for _ in range(self._sample_size))
+            # otherwise obtain a random sample. it is drawn up front, in this
+            # process, so that parallel runs draw the same hands as serial runs
+            hands = game.sample_possible_hands(self._sample_size)
 
-        # iterate over the selected possible hands
-        counter = collections.Counter()
-        for h in hands:
-            # do not modify the original game
-            game_copy = copy.deepcopy(game)
-
-            # set the possible hands
-            game_copy.hands = h
+        # do not modify the original game. for performance, searches use a SkinnyBoard.
+        game_copy = game.clone()
+        game_copy.skinny_board()
 
-            # for performance
-            game_copy.skinny_board()
+        if self._collect_stats:
+            stats = dominoes.search.SearchStats()
+            self.stats.append(stats)
+        else:
+            stats = None
 
-            # run alphabeta and record the optimal move
-            counter.update([
-                dominoes.search.alphabeta(game_copy, player=self._player)[0][0]
-            ])
+        # iterate over the selected possible hands, running
+        # alphabeta and recording the optimal move for each
+        counter = collections.Counter()
+        if self._workers is None:
+            for h in hands:
+                counter.update([
+                    _optimal_move(game_copy, h, self._player, table, self._tablebase, stats)
+                ])
+        else:
+            if table is None:
+                table_size = None
+            else:
+                table_size = table.max_size
+
+            args = ((game_copy, h, self._player, self._collect_stats) for h in hands)
+            with multiprocessing.Pool(self._workers, _init_possible_hands_worker,
+                                      (table_size, self._tablebase)) as pool:
+                for move, move_stats in pool.imap_unordered(_possible_hands_optimal_move, args,
+                                                            _POSSIBLE_HANDS_CHUNKSIZE):
+                    counter.update([move])
+                    if stats is not None:
+                        stats.update(move_stats)
 
         # prefer moves that are more frequently optimal
         game.valid_moves = tuple(sorted(game.valid_moves, key=lambda m: -counter[m]))
+
+# amount of possible hands drawn at a time by ismcts
+_ISMCTS_SAMPLE_SIZE = 100
+
+class _ISMCTSNode:
+    '''
+    Helper class for ismcts. Represents a node in the tree searched by ismcts,
+    which is reached by playing a move from its parent node. Since the tree is
+    shared by all the hands that the other players could possibly have, a move
+    is only available in some of them.
+
+    :param int player: player that plays the move leading to this node
+    :var int player: player that plays the move leading to this node
+    :var dict children: nodes reached from this node, keyed by the
+                        player that plays their move and their move
+    :var int visits: amount of iterations that have gone through this node
+    :var float reward: total reward of the iterations that have gone through
+                       this node, from the perspective of its player
+    :var int availability: amount of iterations in which the move leading to
+                           this node could have been played from its parent
+    '''
+    def __init__(self, player=None):
+        self.player = player
+        self.children = {}
+        self.visits = 0
+        self.reward = 0
+        self.availability = 0
+
+    def upper_confidence_bound(self, exploration):
+        '''
+        :param float exploration: weight given to exploring less visited nodes
+        :return: the mean reward of this node, plus a term that grows with the
+                 amount of times this node could have been visited but was not
+        '''
+        return self.reward / self.visits + \
+            exploration * math.sqrt(math.log(self.availability) / self.visits)
+
+class ismcts:
+    '''
+    This player runs an information set Monte Carlo tree search (ISMCTS) from
+    the perspective of the player whose turn it is. On each iteration, it
+    assumes random hands for the other players that are possible given all
+    known information, including its hand, the sizes of the other players'
+    hands, and the moves played by every player, including the passes. It
+    then descends a single tree of moves shared by all iterations, using
+    only the moves that are valid with the assumed hands, plays the rest of
+    the game with a rollout player, and updates the tree with the result.
+    Unlike probabilistic_alphabeta, it does not need to solve the game for
+    each assumed set of hands, so it can stop after any amount of iterations,
+    and its decisions improve as it runs more of them. It prefers the moves
+    that were explored the most. An instance of this class must first be
+    initialized before it can be called in the usual way.
+
+    :param int start_move: move number at which to start applying this
+                           player. If this player is called before the
+                           specified move number, it will have no effect.
+                           Moves are 0-indexed. The default is 0.
+    :param int iterations: amount of iterations that each decision may run.
+                           Use float('inf') to only limit the time. The
+                           default is 1000.
+    :param float max_time: seconds that each decision may take. The search
+                           stops when either budget runs out. By default
+                           only the amount of iterations is limited.
+    :param callable rollout: player used to choose the moves played after
+                             leaving the tree. It plays its most preferred
+                             move. The random player is the default.
+    :param float exploration: weight given to exploring moves that have not
+                              been explored much, relative to the rewards,
+                              which range from -1 to 1. The default is 1.4.
+    :param str name: the name of this player. The default is the name
+                     of this class.
+    :var str __name__: the name of this player
+    '''
+    def __init__(self, start_move=0, iterations=1000, max_time=None,
+                 rollout=random, exploration=1.4, name=None):
+        self._start_move = start_move
+        self._iterations = iterations
+        self._max_time = max_time
+        self._rollout = rollout
+        self._exploration = exploration
+        if name is None:
+            self.__name__ = type(self).__name__
+        else:
+            self.__name__ = name
+
+    def _iterate(self, game, hands, root, scale):
+        '''
+        Runs one iteration of the search.
+
+        :param Game game: game in which to assume possible hands. It is modified.
+        :param list hands: possible hands to assume for all players
+        :param _ISMCTSNode root: root of the tree to search
+        :param int scale: amount by which to divide the points
+                          of the game to obtain the rewards
+        :return: None
+        '''
+        game.hands = hands
+
+        # selection and expansion - descend the tree until reaching
+        # a move that has not been explored with any assumed hands
+        node = root
+        path = []
+        while game.result is None:
+            # which player makes a move depends on the passes, and so on the
+            # assumed hands. children are keyed by the player as well, so that
+            # their rewards are always from the perspective of that player.
+            unexplored = [m for m in game.valid_moves if (game.turn, m) not in node.children]
+            if unexplored:
+                move = rand.choice(unexplored)
+                node.children[game.turn, move] = _ISMCTSNode(game.turn)
+
+            # only the moves that are valid with these hands are available
+            children = [(m, node.children[game.turn, m]) for m in game.valid_moves
+                        if (game.turn, m) in node.children]
+            for _, child in children:
+                child.availability += 1
+
+            if not unexplored:
+                move, _ = max(children,
+                              key=lambda c: c[1].upper_confidence_bound(self._exploration))
+
+            node = node.children[game.turn, move]
+            path.append(node)
+            game.make_move(*move)
+
+            if unexplored:
+                break
+
+        # simulation - play the rest of the game with the rollout player
+        while game.result is None:
+            self._rollout(game)
+            game.make_move(*game.valid_moves[0])
+
+        # backpropagation - points are positive when team 0 wins them
+        for node in path:
+            node.visits += 1
+            node.reward += pow(-1, node.player) * game.result.points / scale
+
+    def __call__(self, game):
+        # do not perform a potentially slow operation if it is
+        # too early in the game or if there is only one valid move
+        if len(game.moves) < self._start_move or len(game.valid_moves) == 1:
+            return
+
+        # do not modify the original game. for performance, iterations use a SkinnyBoard.
+        game_copy = game.clone()
+        game_copy.skinny_board()
+
+        # a game cannot end with more points than remain in the hands,
+        # so dividing by them keeps the rewards between -1 and 1
+        scale = max(sum(game.remaining_points()), 1)
+
+        root = _ISMCTSNode()
+        if self._max_time is not None:
+            deadline = time.time() + self._max_time
+        iterations = 0
+        hands = []
+        while iterations < self._iterations:
+            # always run at least one iteration, so that there are moves to prefer
+            if iterations and self._max_time is not None and time.time() > deadline:
+                break
+
+            # possible hands are faster to draw many at a time
+            if not hands:
+                hands = game_copy.sample_possible_hands(
+                    min(self._iterations - iterations, _ISMCTS_SAMPLE_SIZE)
+                )
+
+            self._iterate(game_copy.clone(), hands.pop(), root, scale)
+            iterations += 1
+
+        # prefer moves that were explored more often
+        def visits(move):
+            try:
+                return -root.children[game.turn, move].visits
+            except KeyError:
+                return 0
+
+        game.valid_moves = tuple(sorted(game.valid_moves, key=visits))
@@ -1,13 +1,313 @@
+import collections
+import contextlib
 import copy
 import dominoes
+import multiprocessing
 import operator
+import time
+
+# flags for the values stored in a TranspositionTable
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+class TranspositionTable:
+    '''
+    Python class for objects that remember the results of alphabeta
+    search, so that positions reached via different move orders only
+    get searched once. Positions are identified by Game.position_key.
+    Each entry stores a value, a flag indicating whether that value is
+    exact or only a lower or upper bound on the true value (due to
+    alpha-beta cutoffs), and the best move sequence found. Once the
+    table is full, the least recently used entry gets evicted.
+
+    :param int max_size: maximum amount of positions to remember.
+                         The default is 1,000,000.
+    :var int max_size: maximum amount of positions to remember
+    :var int hits: amount of lookups that found an entry
+    :var int misses: amount of lookups that did not find an entry
+
+    .. code-block:: python
+
+        >>> import dominoes
+        >>> tt = dominoes.search.TranspositionTable(max_size=2)
+        >>> tt.store('a', dominoes.search.EXACT, 10, ())
+        >>> tt.store('b', dominoes.search.LOWER_BOUND, 5, ())
+        >>> tt.get('a')
+        (0, 10, ())
+        >>> tt.store('c', dominoes.search.UPPER_BOUND, 0, ())
+        >>> tt.get('b')
+        >>> len(tt)
+        2
+    '''
+    def __init__(self, max_size=1000000):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+
+    def get(self, key):
+        '''
+        :param key: key of the position to look up
+        :return: a tuple of flag, value, and moves if the position
+                 is in the table; None otherwise
+        '''
+        try:
+            entry = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def store(self, key, flag, value, moves):
+        '''
+        Stores the result of searching a position, evicting the least
+        recently used entry if the table is full.
+
+        :param key: key of the position that was searched
+        :param int flag: EXACT, LOWER_BOUND, or UPPER_BOUND
+        :param value: value obtained by searching the position
+        :param tuple moves: best move sequence found from the position
+        :return: None
+        '''
+        self._entries[key] = (flag, value, moves)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        '''
+        Removes all entries from the table.
+
+        :return: None
+        '''
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+class MoveHistory:
+    '''
+    Python class for objects that remember which moves caused alpha-beta
+    cutoffs during search, so that they can be explored first in other
+    positions. Moves that caused the most recent cutoffs after a given
+    amount of moves into the game are remembered as killer moves, and are
+    explored first in other positions at that point of the game. The other
+    moves are explored in decreasing order of the amount of cutoffs they
+    caused anywhere in the search, with cutoffs earlier in the game, which
+    prune more positions, weighing more. Since moves are identified by their
+    domino and end, and points in the game by their amount of moves, the
+    same history may be reused across searches of the same game.
+
+    :param int killers: amount of killer moves to remember for each
+                        point of the game. The default is 2.
+
+    .. code-block:: python
+
+        >>> import dominoes
+        >>> d1 = dominoes.Domino(1, 2)
+        >>> d2 = dominoes.Domino(1, 3)
+        >>> g = dominoes.Game.new(starting_player=0)
+        >>> g.hands = [dominoes.Hand([d1, d2]), dominoes.Hand([]),
+        ...            dominoes.Hand([]), dominoes.Hand([])]
+        >>> g.valid_moves = ((d1, True), (d2, True))
+        >>> h = dominoes.search.MoveHistory()
+        >>> h.record(0, (d2, True))
+        >>> h.order(g)
+        >>> g.valid_moves
+        (([1|3], True), ([1|2], True))
+    '''
+    def __init__(self, killers=2):
+        self._max_killers = killers
+        self._killers = {}
+        self._cutoffs = collections.Counter()
+
+    def record(self, ply, move):
+        '''
+        Records that a move caused an alpha-beta cutoff.
+
+        :param int ply: amount of moves made in the game before the move,
+                        including passes
+        :param tuple move: move that caused the cutoff
+        :return: None
+        '''
+        # cutoffs earlier in the game prune larger subtrees, so they weigh
+        # more. a game has at most 28 moves, not counting passes.
+        self._cutoffs[move] += max(28 - ply, 1) ** 2
+
+        killers = self._killers.setdefault(ply, [])
+        if move in killers:
+            killers.remove(move)
+        killers.insert(0, move)
+        del killers[self._max_killers:]
+
+    def order(self, game):
+        '''
+        Sorts a game's valid moves, placing the killer moves for its point
+        of the game first, and the other moves in decreasing order of the
+        weighted amount of cutoffs they caused. The sort is stable, so moves that
+        are tied keep their relative order.
+
+        :param Game game: game whose valid moves to sort
+        :return: None
+        '''
+        killers = self._killers.get(len(game.moves), ())
+
+        def key(move):
+            try:
+                return killers.index(move), 0
+            except ValueError:
+                return len(killers), -self._cutoffs[move]
+
+        game.valid_moves = tuple(sorted(game.valid_moves, key=key))
+
+    def clear(self):
+        '''
+        Forgets all recorded cutoffs.
+
+        :return: None
+        '''
+        self._killers.clear()
+        self._cutoffs.clear()
+
+class SearchStats:
+    '''
+    Python class for objects that collect statistics about searches. An
+    object may be passed to several searches, in which case it adds up
+    their statistics. Depths are measured in moves from the root of each
+    search, including passes.
+
+    :var int nodes: amount of positions visited, including ended games
+    :var int expanded: amount of positions whose moves were explored
+    :var int children: amount of moves explored from expanded positions
+    :var collections.Counter cutoffs: amount of alpha-beta cutoffs at each depth
+    :var int transposition_hits: amount of positions found in the
+                                 transposition table, if any
+    :var int tablebase_hits: amount of positions found in the tablebase, if any
+    :var int bound_cutoffs: amount of positions that were not searched because
+                            their points left to score could not reach the window
+    :var int max_depth: deepest position visited
+    :var float elapsed: seconds spent searching
+
+    .. code-block:: python
+
+        >>> import dominoes
+        >>> d1 = dominoes.Domino(1, 2)
+        >>> d2 = dominoes.Domino(2, 3)
+        >>> d3 = dominoes.Domino(3, 4)
+        >>> d4 = dominoes.Domino(4, 5)
+        >>> d5 = dominoes.Domino(1, 6)
+        >>> g = dominoes.Game.new(starting_player=0)
+        >>> g.hands = [dominoes.Hand([d1, d5]), dominoes.Hand([d2]),
+        ...            dominoes.Hand([d3]), dominoes.Hand([d4])]
+        >>> g.valid_moves = ((d1, True), (d5, True))
+        >>> stats = dominoes.search.SearchStats()
+        >>> dominoes.search.alphabeta(g, stats=stats)
+        ([([1|6], True), ([1|2], True)], 21)
+        >>> stats.nodes
+        5
+        >>> stats.max_depth
+        5
+        >>> stats.branching_factor
+        1.3333333333333333
+    '''
+    def __init__(self):
+        self.nodes = 0
+        self.expanded = 0
+        self.children = 0
+        self.cutoffs = collections.Counter()
+        self.transposition_hits = 0
+        self.tablebase_hits = 0
+        self.bound_cutoffs = 0
+        self.max_depth = 0
+        self.elapsed = 0.0
+
+        # amount of moves in the game at the root of the current search
+        self._root_moves = 0
+
+    @property
+    def branching_factor(self):
+        '''
+        :return: average amount of moves explored from
+                 expanded positions; 0 if none were expanded
+        '''
+        if not self.expanded:
+            return 0
+        return self.children / self.expanded
+
+    def update(self, other):
+        '''
+        Adds the statistics of another object to this one,
+        for example those collected in another process.
+
+        :param SearchStats other: statistics to add
+        :return: None
+        '''
+        self.nodes += other.nodes
+        self.expanded += other.expanded
+        self.children += other.children
+        self.cutoffs.update(other.cutoffs)
+        self.transposition_hits += other.transposition_hits
+        self.tablebase_hits += other.tablebase_hits
+        self.bound_cutoffs += other.bound_cutoffs
+        self.max_depth = max(self.max_depth, other.max_depth)
+        self.elapsed += other.elapsed
+
+    def __str__(self):
+        string_list = [
+            'Nodes: {}'.format(self.nodes),
+            'Branching factor: {:.2f}'.format(self.branching_factor),
+            'Cutoffs by depth: {}'.format(dict(sorted(self.cutoffs.items()))),
+            'Transposition hits: {}'.format(self.transposition_hits),
+            'Tablebase hits: {}'.format(self.tablebase_hits),
+            'Bound cutoffs: {}'.format(self.bound_cutoffs),
+            'Max depth: {}'.format(self.max_depth),
+            'Elapsed: {:.3f}s'.format(self.elapsed)
+        ]
+
+        return '\n'.join(string_list)
+
+    def __repr__(self):
+        return str(self)
+
+@contextlib.contextmanager
+def _collecting(stats, game):
+    '''
+    Context manager within which a search of the provided game collects
+    statistics, so that the time it takes gets added to them.
+
+    :param SearchStats stats: statistics to collect; None to not collect any
+    :param Game game: game at the root of the search
+    '''
+    if stats is None:
+        yield
+        return
+
+    stats._root_moves = len(game.moves)
+    start = time.time()
+    try:
+        yield
+    finally:
+        stats.elapsed += time.time() - start
 
 def make_moves(game, player=dominoes.players.identity):
     '''
     For each of a Game object's valid moves, yields
     a tuple containing the move and the Game object
     obtained by playing the move on the original Game
-    object. The original Game object will be modified.
+    object. Moves are made in place and taken back
+    before the next move is made, so the yielded Game
+    object is the original Game object, and it should
+    not be used after advancing to the next move. Once
+    the generator is exhausted or closed, the original
+    Game object is back in its initial state, except
+    for the order of its valid moves.
 
     :param Game game: the game to make moves on
     :param callable player: a player to call on the
@@ -24,58 +324,662 @@ def make_moves(game, player=dominoes.players.identity):
     # determine the order in which to make moves
     player(game)
 
-    # copy the original game before making all
-    # but the last move
-    for move in game.valid_moves[:-1]:
-        new_game = copy.deepcopy(game)
-        new_game.make_move(*move)
-        yield move, new_game
+    for move in game.valid_moves:
+        undo = game.make_undoable_move(*move)
+        try:
+            yield move, game
+        finally:
+            # restore the game, even if the caller
+            # stops iterating before the last move
+            game.undo_move(undo)
 
-    # don't copy the original game before making
-    # the last move
-    move = game.valid_moves[-1]
-    game.make_move(*move)
-    yield move, game
+class _BudgetExhausted(Exception):
+    '''
+    Exception to be raised when a search runs out of its budget.
+    '''
+    pass
 
-def alphabeta(game, alpha_beta=(-float('inf'), float('inf')),
-              player=dominoes.players.identity):
+class _Budget:
     '''
-    Runs minimax search with alpha-beta pruning on the provided game.
+    Python class for objects that keep track of the time
+    and the amount of positions used up by a search.
 
-    :param Game game: game to search
-    :param tuple alpha_beta: a tuple of two floats that indicate
-                             the initial values of alpha and beta,
-                             respectively. The default is (-inf, inf).
-    :param callable player: player used to sort moves to be explored.
-                            Ordering better moves first may significantly
-                            reduce the amount of moves that need to be
-                            explored. The identity player is the default.
+    :param float max_time: seconds after which the search must stop;
+                           None for no time limit
+    :param int max_nodes: amount of positions after which the search
+                          must stop; None for no limit
+    '''
+    def __init__(self, max_time=None, max_nodes=None):
+        if max_time is None:
+            self._deadline = None
+        else:
+            self._deadline = time.time() + max_time
+        self._max_nodes = max_nodes
+        self.nodes = 0
+
+    def spend(self):
+        '''
+        Records that one more position is being searched.
+
+        :return: None
+        :raises _BudgetExhausted: if the search has run out of time or positions
+        '''
+        self.nodes += 1
+        if self._max_nodes is not None and self.nodes > self._max_nodes:
+            raise _BudgetExhausted
+        if self._deadline is not None and time.time() > self._deadline:
+            raise _BudgetExhausted
+
+def _evaluate(game):
+    '''
+    Estimates the value of a game that has not ended, for searches that stop
+    before the end of the game. Each team wants to get rid of its points, so
+    the estimate is the amount of points remaining in the hands of the team
+    consisting of players 1 and 3, minus the amount of points remaining in
+    the hands of the team consisting of players 0 and 2.
+
+    :param Game game: game to evaluate
+    :return: the estimated value of the game
+    '''
+    points = game.remaining_points()
+    return points[1] + points[3] - points[0] - points[2]
+
+def _score_bound(game, points):
+    '''
+    Bounds the value of a game that has not ended. However the game ends,
+    the team that scores gets at most the points remaining in all hands,
+    and the player whose turn it is plays one of its valid moves before
+    that, which takes at least the points of that domino out of the hands.
+
+    :param Game game: game to bound
+    :param int points: points remaining in all hands of the game
+    :return: an amount of points that the absolute value of the game cannot exceed
+    '''
+    return points - min(d.first + d.second for d, _ in game.valid_moves)
+
+def _alphabeta(game, alpha_beta, player, transposition_table, depth, budget,
+               pvs=False, history=None, tablebase=None, stats=None, points=None):
     '''
+    Helper function for alphabeta(), iterative_deepening(), and
+    principal_variation_search().
+
+    :param int depth: amount of moves to search before evaluating
+                      the game with _evaluate(); None to search
+                      until the end of the game
+    :param _Budget budget: budget to spend on each searched position;
+                           None for an unlimited budget
+    :param bool pvs: if True, only the first move of each position gets
+                     searched with the full window. The other moves get
+                     searched with a null window, which only determines
+                     whether they are better than the best move so far,
+                     and they get searched again if they are.
+    :param MoveHistory history: history in which to record the moves that
+                                cause cutoffs, and with which to sort moves
+                                after the player; None to only use the player
+    :param Tablebase tablebase: tablebase in which to look up the exact values
+                                of the positions reached by the moves of the
+                                game, instead of searching them. The game
+                                itself is always searched, so that there is a
+                                best move. None to search every position.
+    :param SearchStats stats: statistics to update with this search;
+                              None to not collect statistics
+    :param int points: points remaining in all hands of the game, which
+                       bound its value; None to add them up, for the game
+                       at the root of the search, which is never cut off
+    :return: a tuple of the best move sequence found, its value, and a
+             bool indicating whether the value is exact, which is the case
+             if no positions had to be evaluated due to the depth limit
+    '''
+    if stats is not None:
+        ply = len(game.moves) - stats._root_moves
+        stats.nodes += 1
+        stats.max_depth = max(stats.max_depth, ply)
+
     # base case - game is over
     if game.result is not None:
-        return [], game.result.points
+        return [], game.result.points, True
+
+    if budget is not None:
+        budget.spend()
+
+    if transposition_table is not None:
+        key = game.position_key()
+        entry = transposition_table.get(key)
+        if entry is not None:
+            if stats is not None:
+                stats.transposition_hits += 1
+
+            # stored bounds only cause cutoffs, without narrowing the window.
+            # a narrowed window could make a bound look like an exact value,
+            # whose move sequence does not lead to it, such as score bounds.
+            flag, value, moves = entry
+            if flag == EXACT or \
+               flag == LOWER_BOUND and value >= alpha_beta[1] or \
+               flag == UPPER_BOUND and value <= alpha_beta[0]:
+                return list(moves), value, True
+
+        # window that the position is searched with
+        searched_alpha_beta = alpha_beta
+
+    # the game cannot be worth more points than the ones left to score, so it
+    # does not need to be searched if they cannot reach the window. the bound
+    # has no move sequence that leads to it, which is fine because values
+    # outside of the window are never chosen as the value of the game. the
+    # root is always searched, so that there is a best move.
+    root = points is None
+    if root:
+        points = sum(game.remaining_points())
+    bound = _score_bound(game, points)
+    if not root and bound <= alpha_beta[0]:
+        if stats is not None:
+            stats.bound_cutoffs += 1
+        return [], bound, True
+    elif not root and -bound >= alpha_beta[1]:
+        if stats is not None:
+            stats.bound_cutoffs += 1
+        return [], -bound, True
+
+    # base case - depth limit reached
+    if depth is not None and depth <= 0:
+        return [], _evaluate(game), False
 
     if game.turn % 2:
         # minimizing player
         best_value = float('inf')
+        best_possible = -bound
         op = operator.lt
         update = lambda ab, v: (ab[0], min(ab[1], v))
+        null_window = lambda ab: (ab[1] - 1, ab[1])
+        re_search_window = lambda ab, v: (ab[0], v + 1)
     else:
         # maximizing player
         best_value = -float('inf')
+        best_possible = bound
         op = operator.gt
         update = lambda ab, v: (max(ab[0], v), ab[1])
+        null_window = lambda ab: (ab[0], ab[0] + 1)
+        re_search_window = lambda ab, v: (v - 1, ab[1])
 
-    # recursive case - game is not over
-    for move, new_game in make_moves(game, player):
-        moves, value = alphabeta(new_game, alpha_beta, player)
-        if op(value, best_value):
-            best_value = value
-            best_moves = moves
-            best_moves.insert(0, move)
-            alpha_beta = update(alpha_beta, best_value)
-            if alpha_beta[1] <= alpha_beta[0]:
-                # alpha-beta cutoff
-                break
+    if depth is not None:
+        depth -= 1
+
+    # amount of moves in the game, which identifies its point for the move history
+    moves_made = len(game.moves)
+
+    if history is None:
+        ordering = player
+    else:
+        def ordering(g):
+            player(g)
+            history.order(g)
+
+    if stats is not None:
+        stats.expanded += 1
+
+    # recursive case - game is not over. closing the generator
+    # takes back the last move if there is an alpha-beta cutoff.
+    exact = True
+    first = True
+    with contextlib.closing(make_moves(game, ordering)) as children:
+        for move, new_game in children:
+            if stats is not None:
+                stats.children += 1
+
+            new_points = points - move[0].first - move[0].second
+
+            if tablebase is None:
+                value = None
+            else:
+                value = tablebase.get(new_game)
+
+            if value is not None:
+                if stats is not None:
+                    stats.tablebase_hits += 1
+
+                # the move sequence stops at positions found in the tablebase
+                moves = []
+                exact_value = True
+            elif pvs and not first:
+                # values are integers, so a window of width 1 is enough
+                # to tell whether the move is better than the best so far
+                moves, value, exact_value = _alphabeta(new_game, null_window(alpha_beta),
+                                                       player, transposition_table, depth,
+                                                       budget, pvs, history, tablebase, stats,
+                                                       new_points)
+                exact = exact and exact_value
+
+                # the move is better, but its value is only a bound. the bound
+                # narrows the window that the move gets searched again with.
+                if alpha_beta[0] < value < alpha_beta[1]:
+                    moves, value, exact_value = _alphabeta(new_game,
+                                                           re_search_window(alpha_beta, value),
+                                                           player, transposition_table, depth,
+                                                           budget, pvs, history, tablebase,
+                                                           stats, new_points)
+            else:
+                moves, value, exact_value = _alphabeta(new_game, alpha_beta, player,
+                                                       transposition_table, depth, budget,
+                                                       pvs, history, tablebase, stats,
+                                                       new_points)
+            first = False
+            exact = exact and exact_value
+            if op(value, best_value):
+                best_value = value
+                best_moves = moves
+                best_moves.insert(0, move)
+                alpha_beta = update(alpha_beta, best_value)
+                if alpha_beta[1] <= alpha_beta[0] or best_value == best_possible:
+                    # alpha-beta cutoff, or no move can score more points
+                    if history is not None:
+                        history.record(moves_made, move)
+                    if stats is not None:
+                        stats.cutoffs[ply] += 1
+                    break
+
+    # values that depend on the depth limit are not stored,
+    # since they would not be valid for deeper searches
+    if transposition_table is not None and exact:
+        if best_value <= searched_alpha_beta[0]:
+            flag = UPPER_BOUND
+        elif best_value >= searched_alpha_beta[1]:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+
+        transposition_table.store(key, flag, best_value, tuple(best_moves))
+
+    return best_moves, best_value, exact
+
+# best value found so far by the processes searching the root moves of a game in
+# parallel, and the transposition table, move history, and tablebase of the current process
+_root_bound = None
+_worker_table = None
+_worker_history = None
+_worker_tablebase = None
+
+def _init_root_worker(root_bound, table_size, history, tablebase):
+    '''
+    Initializes a process that searches root moves for _parallel_alphabeta().
+
+    :param multiprocessing.Value root_bound: best value found so far
+    :param int table_size: size of the transposition table to use in
+                           this process; None to not use a table
+    :param MoveHistory history: move history to use in this process;
+                                None to not use a history
+    :param Tablebase tablebase: tablebase to use in this process;
+                                None to not use a tablebase
+    :return: None
+    '''
+    global _root_bound
+    global _worker_table
+    global _worker_history
+    global _worker_tablebase
+
+    _root_bound = root_bound
+    _worker_history = history
+    _worker_tablebase = tablebase
+    if table_size is None:
+        _worker_table = None
+    else:
+        _worker_table = TranspositionTable(table_size)
+
+def _search_root_move(args):
+    '''
+    Searches the game obtained by making one of the root moves, with
+    an alpha-beta window narrowed by the best value found so far by
+    any process. Then shares the value found, if it is better.
+
+    :param tuple args: index of the root move, root move, game
+                       after making the root move, alpha-beta
+                       window of the root, whether the root is a
+                       maximizing node, player, depth limit, and
+                       amount of moves in the game at the root, or
+                       None to not collect statistics
+    :return: a tuple of the index of the root move, the best move sequence
+             found, its value, a bool indicating whether the value is inside
+             the narrowed alpha-beta window, in which case it is exact, and
+             the statistics of the search, if they were collected
+    '''
+    i, move, game, alpha_beta, maximizing, player, depth, root_moves = args
+
+    if root_moves is None:
+        stats = None
+    else:
+        stats = SearchStats()
+        stats._root_moves = root_moves
+
+    with _root_bound.get_lock():
+        bound = _root_bound.value
+
+    if maximizing:
+        alpha_beta = (max(alpha_beta[0], bound), alpha_beta[1])
+    else:
+        alpha_beta = (alpha_beta[0], min(alpha_beta[1], bound))
+
+    if _worker_tablebase is None:
+        value = None
+    else:
+        value = _worker_tablebase.get(game)
+
+    if value is None:
+        moves, value, _ = _alphabeta(game, alpha_beta, player, _worker_table, depth, None,
+                                     history=_worker_history, tablebase=_worker_tablebase,
+                                     stats=stats)
+    else:
+        moves = []
+        if stats is not None:
+            stats.tablebase_hits += 1
+    moves.insert(0, move)
+
+    with _root_bound.get_lock():
+        if maximizing:
+            improved = value > alpha_beta[0]
+            _root_bound.value = max(_root_bound.value, value)
+        else:
+            improved = value < alpha_beta[1]
+            _root_bound.value = min(_root_bound.value, value)
+
+    return i, moves, value, improved, stats
+
+def _parallel_alphabeta(game, alpha_beta, player, transposition_table, depth, history,
+                        tablebase, stats, workers):
+    '''
+    Helper function for alphabeta(). Searches each of the root moves of the
+    game in a pool of processes. The processes share the best value found so
+    far, so that the root moves searched later get narrower alpha-beta windows.
+    '''
+    if stats is not None:
+        stats.nodes += 1
+
+    # base case - game is over
+    if game.result is not None:
+        return [], game.result.points
+
+    maximizing = not game.turn % 2
+
+    # the root moves use up one move of the depth limit
+    if depth is not None:
+        depth -= 1
+
+    if history is None:
+        ordering = player
+    else:
+        def ordering(g):
+            player(g)
+            history.order(g)
+
+    if stats is None:
+        root_moves = None
+    else:
+        root_moves = len(game.moves)
+
+    # copy the games, since the processes receive them after moves are taken back
+    args = [(i, move, copy.deepcopy(new_game), alpha_beta, maximizing, player, depth, root_moves)
+            for i, (move, new_game) in enumerate(make_moves(game, ordering))]
+
+    if stats is not None:
+        stats.expanded += 1
+        stats.children += len(args)
+
+    if transposition_table is None:
+        table_size = None
+    else:
+        table_size = transposition_table.max_size
+
+    root_bound = multiprocessing.Value('d', -float('inf') if maximizing else float('inf'))
+
+    results = []
+    with multiprocessing.Pool(workers, _init_root_worker,
+                              (root_bound, table_size, history, tablebase)) as pool:
+        cutoff = False
+        for result in pool.imap_unordered(_search_root_move, args):
+            # after an alpha-beta cutoff, the shared value leaves the remaining
+            # root moves an empty window, so their searches end right away.
+            # they are still waited for, since terminating the pool while it
+            # is sending them to the processes can deadlock.
+            if cutoff:
+                continue
+
+            results.append(result)
+            if stats is not None:
+                stats.update(result[4])
+
+            value = result[2]
+            if (maximizing and value >= alpha_beta[1]) or \
+               (not maximizing and value <= alpha_beta[0]):
+                if stats is not None:
+                    stats.cutoffs[0] += 1
+                cutoff = True
+
+    # values that did not improve on the shared value are only bounds, so
+    # prefer exact values. ties are broken by the order of the root moves,
+    # as in a serial search.
+    exact_results = [r for r in results if r[3]] or results
+    sign = 1 if maximizing else -1
+    _, best_moves, best_value, _, _ = min(exact_results, key=lambda r: (-sign * r[2], r[0]))
 
     return best_moves, best_value
+
+def alphabeta(game, alpha_beta=(-float('inf'), float('inf')),
+              player=dominoes.players.identity, transposition_table=None,
+              depth=None, history=None, tablebase=None, stats=None, workers=None):
+    '''
+    Runs minimax search with alpha-beta pruning on the provided game.
+
+    :param Game game: game to search
+    :param tuple alpha_beta: a tuple of two floats that indicate
+                             the initial values of alpha and beta,
+                             respectively. The default is (-inf, inf).
+    :param callable player: player used to sort moves to be explored.
+                            Ordering better moves first may significantly
+                            reduce the amount of moves that need to be
+                            explored. The identity player is the default.
+    :param TranspositionTable transposition_table: table in which to look up
+                                                   and store the results of
+                                                   searching positions, so that
+                                                   transpositions only get
+                                                   searched once. The same
+                                                   table may be reused across
+                                                   calls. By default no table
+                                                   is used.
+    :param int depth: amount of moves to search ahead. Games that have not
+                      ended after this many moves are valued by the difference
+                      between the points left in each team's hands. By default
+                      searches until the end of the game.
+    :param MoveHistory history: history of the moves that caused cutoffs,
+                                used to sort moves after the player sorts
+                                them. It gets updated during the search, and
+                                the same history may be reused across calls
+                                on the same game. By default only the player
+                                sorts moves.
+    :param Tablebase tablebase: tablebase in which to look up the exact values
+                                of positions instead of searching them. The
+                                move sequence found stops at the first position
+                                found in the tablebase. The root is always
+                                searched, so that there is a best move. By
+                                default every position is searched.
+    :param SearchStats stats: statistics to update with this search, such
+                              as the amount of positions visited. By default
+                              no statistics are collected.
+    :param int workers: amount of processes among which to split the moves
+                        available at the root of the search. Each root move
+                        is searched with the best value found by any process
+                        at the time its search starts, so the value is the
+                        same as that of a serial search. The player must be
+                        picklable. Since processes cannot share a table, each
+                        one uses its own table of the same size as the provided
+                        transposition table, which is left unused. Likewise,
+                        the provided history sorts the root moves, and each
+                        process sorts and records the moves of its subtrees
+                        with its own copy of it. The moves recorded by the
+                        processes are not added to the provided history. The
+                        tablebase gets mapped by each process, and the
+                        statistics of all processes get added up. By default
+                        the search runs in the current process.
+    :return: a tuple of the best move sequence found and its value
+    '''
+    with _collecting(stats, game):
+        if workers is not None:
+            return _parallel_alphabeta(game, alpha_beta, player, transposition_table, depth,
+                                       history, tablebase, stats, workers)
+
+        moves, value, _ = _alphabeta(game, alpha_beta, player, transposition_table, depth,
+                                     None, history=history, tablebase=tablebase, stats=stats)
+        return moves, value
+
+def principal_variation_search(game, expected_value=None, aspiration_window=2,
+                               player=dominoes.players.identity,
+                               transposition_table=None, depth=None, history=None,
+                               tablebase=None, stats=None):
+    '''
+    Runs principal variation search (also known as NegaScout) on the
+    provided game. This is a variant of alphabeta search that assumes
+    that the first move explored in each position is the best one. The
+    other moves only get searched with a null window, which is enough
+    to prove that they are not better, and they only get searched again
+    with the full window if they turn out to be better. This relies on
+    the values of games being integers. It only pays off with good move
+    ordering and a transposition table, which makes searching a move
+    again cheap. Without a table, the repeated searches usually visit
+    more positions than alphabeta search does.
+
+    If an expected value is provided, for example the value found on the
+    previous turn, the search starts with an aspiration window around it.
+    If the value turns out to be outside of that window, the search is
+    repeated with a window that extends past it.
+
+    :param Game game: game to search
+    :param int expected_value: value that the game is expected to have.
+                               By default the search starts with a
+                               window of (-inf, inf).
+    :param int aspiration_window: amount by which the value may differ from
+                                  the expected value without having to
+                                  repeat the search. The default is 2.
+    :param callable player: player used to sort moves to be explored.
+                            The identity player is the default.
+    :param TranspositionTable transposition_table: table in which to look up
+                                                   and store the results of
+                                                   searching positions. By
+                                                   default no table is used,
+                                                   but one should be provided
+                                                   for the search to be faster
+                                                   than alphabeta search.
+    :param int depth: amount of moves to search ahead. By default
+                      searches until the end of the game.
+    :param MoveHistory history: history of the moves that caused cutoffs,
+                                used to sort moves after the player sorts
+                                them. By default only the player sorts moves.
+    :param Tablebase tablebase: tablebase in which to look up the exact values
+                                of positions instead of searching them. The
+                                root is always searched. By default every
+                                position is searched.
+    :param SearchStats stats: statistics to update with this search, including
+                              the searches repeated due to the aspiration
+                              window. By default no statistics are collected.
+    :return: a tuple of the best move sequence found and its value
+
+    .. code-block:: python
+
+        >>> import dominoes
+        >>> d1 = dominoes.Domino(1, 2)
+        >>> d2 = dominoes.Domino(2, 3)
+        >>> d3 = dominoes.Domino(3, 4)
+        >>> d4 = dominoes.Domino(4, 5)
+        >>> d5 = dominoes.Domino(1, 6)
+        >>> g = dominoes.Game.new(starting_player=0)
+        >>> g.hands = [dominoes.Hand([d1, d5]), dominoes.Hand([d2]),
+        ...            dominoes.Hand([d3]), dominoes.Hand([d4])]
+        >>> g.valid_moves = ((d1, True), (d5, True))
+        >>> dominoes.search.alphabeta(g)[1]
+        21
+        >>> dominoes.search.principal_variation_search(g, expected_value=0)[1]
+        21
+    '''
+    if expected_value is None:
+        alpha_beta = (-float('inf'), float('inf'))
+    else:
+        alpha_beta = (expected_value - aspiration_window, expected_value + aspiration_window)
+
+    with _collecting(stats, game):
+        while True:
+            moves, value, _ = _alphabeta(game, alpha_beta, player,
+                                         transposition_table, depth, None, True, history,
+                                         tablebase, stats)
+
+            if value <= alpha_beta[0]:
+                # the value is at most the one found
+                alpha_beta = (-float('inf'), value + 1)
+            elif value >= alpha_beta[1]:
+                # the value is at least the one found
+                alpha_beta = (value - 1, float('inf'))
+            else:
+                return moves, value
+
+def iterative_deepening(game, max_time=None, max_nodes=None,
+                        player=dominoes.players.identity, transposition_table=None,
+                        tablebase=None, stats=None):
+    '''
+    Runs alphabeta search on the provided game with increasing depth limits,
+    until either the search reaches the end of the game, or it runs out of
+    time or positions to search. Each search starts by exploring the best
+    move found by the previous one. The search with a depth limit of 1 is
+    always completed, so that there is a best move to return.
+
+    :param Game game: game to search
+    :param float max_time: seconds after which to stop searching. By
+                           default there is no time limit.
+    :param int max_nodes: amount of positions after which to stop searching.
+                          By default there is no limit.
+    :param callable player: player used to sort moves to be explored.
+                            The identity player is the default.
+    :param TranspositionTable transposition_table: table in which to look up
+                                                   and store the results of
+                                                   searching positions. By
+                                                   default no table is used.
+    :param Tablebase tablebase: tablebase in which to look up the exact values
+                                of positions instead of searching them. The
+                                root is always searched. By default every
+                                position is searched.
+    :param SearchStats stats: statistics to update with this search, including
+                              all of its depth limits. By default no statistics
+                              are collected.
+    :return: a tuple of the best move sequence found by the deepest completed
+             search, its value, and a bool indicating whether the value is
+             exact, which is the case if that search reached the end of the game
+    '''
+    # base case - game is over
+    if game.result is not None:
+        return [], game.result.points, True
+
+    root_moves = len(game.moves)
+    best_move = None
+
+    def _best_move_first(g):
+        player(g)
+
+        # only at the root - explore the best move from the previous search first
+        if len(g.moves) == root_moves and best_move in g.valid_moves:
+            g.valid_moves = (best_move,) + tuple(m for m in g.valid_moves if m != best_move)
+
+    budget = _Budget(max_time, max_nodes)
+    depth = 1
+    with _collecting(stats, game):
+        while True:
+            try:
+                # do not spend the budget on the first search,
+                # since it is needed to find any move at all
+                moves, value, exact = _alphabeta(game, (-float('inf'), float('inf')),
+                                                 _best_move_first, transposition_table,
+                                                 depth,
+                                                 budget if best_move is not None else None,
+                                                 tablebase=tablebase, stats=stats)
+            except _BudgetExhausted:
+                break
+
+            best_move = moves[0]
+            if exact:
+                break
+
+            depth += 1
+
+    return moves, value, exact
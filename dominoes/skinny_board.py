@@ -138,6 +138,34 @@ class SkinnyBoard:
         else:
             self._add_right(d)
 
+    def remove(self, d, left):
+        '''
+        Removes the provided domino from the specified end of the board.
+        The domino must be the last one that was added to that end, as
+        this is meant to undo a call to SkinnyBoard.add.
+
+        :param Domino d: domino to remove
+        :param bool left: end of the board from which to remove the
+                          domino (True for left, False for right)
+        :return: None
+        :raises EmptyBoardException: if the board is empty
+        '''
+        if not self:
+            raise dominoes.EmptyBoardException('Cannot remove {} from the'
+                                               ' board because it is empty!'.format(d))
+
+        if self._length == 1:
+            self._left = None
+            self._right = None
+        elif left:
+            # the value that was covered by the domino
+            # is the one that is not currently exposed
+            self._left = d.second if d.first == self._left else d.first
+        else:
+            self._right = d.first if d.second == self._right else d.second
+
+        self._length -= 1
+
     def __eq__(self, other):
         if not isinstance(other, type(self)):
             return False
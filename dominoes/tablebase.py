@@ -0,0 +1,267 @@
+import dominoes
+import mmap
+import os
+import struct
+
+# a tablebase file starts with a header, followed by fixed size records
+# sorted by key, so that positions can be found with a binary search
+_MAGIC = b'DOMINOTB'
+_HEADER = struct.Struct('>8sBQ')
+_RECORD = struct.Struct('>16sh')
+_KEY_BYTES = 16
+
+# bits used by each hand's bitmask and by each end in a key
+_HAND_BITS = len(dominoes.bit_game.DOMINOES)
+_END_BITS = 3
+
+def _tiles(game):
+    '''
+    :param game: Game or BitGame
+    :return: amount of dominoes remaining in all hands
+    '''
+    if isinstance(game, dominoes.BitGame):
+        return sum(bin(h).count('1') for h in game.hands)
+
+    return sum(len(h) for h in game.hands)
+
+def _encode(game):
+    '''
+    Packs the position of a game into a key of fixed size. Keys compare in
+    the same order as the integers they are built from, so records can be
+    sorted by key.
+
+    :param game: Game or BitGame whose position to pack
+    :return: key of the position of the game; None if the game is not
+             using the double six set or if its board is empty
+    '''
+    if isinstance(game, dominoes.BitGame):
+        if not game.board_length:
+            return None
+
+        hands = game.hands
+        ends = (game.left_end, game.right_end)
+    else:
+        if not game.board:
+            return None
+
+        try:
+            hands = [dominoes.bit_game.mask(h) for h in game.hands]
+        except dominoes.NoSuchDominoException:
+            return None
+
+        # bitmasks cannot represent repeated dominoes
+        if sum(bin(h).count('1') for h in hands) != _tiles(game):
+            return None
+
+        ends = (game.board.left_end(), game.board.right_end())
+
+    key = game.turn
+    for e in ends:
+        key = key << _END_BITS | e
+    for h in hands:
+        key = key << _HAND_BITS | h
+
+    return key.to_bytes(_KEY_BYTES, 'big')
+
+def _solve(game, values):
+    '''
+    Computes the minimax value of a game, storing the
+    values of all positions reached along the way.
+
+    :param BitGame game: game to solve
+    :param dict values: values of the positions solved so far, keyed
+                        by _encode(). Gets updated with the game's
+                        position and its descendants.
+    :return: the value of the game
+    '''
+    # base case - game is over
+    if game.result is not None:
+        return game.result.points
+
+    key = _encode(game)
+    try:
+        return values[key]
+    except KeyError:
+        pass
+
+    # recursive case - every move needs to be searched
+    # for the values of all positions to be exact
+    child_values = [_solve(g, values) for _, g in dominoes.search.make_moves(game)]
+    if game.turn % 2:
+        value = min(child_values)
+    else:
+        value = max(child_values)
+
+    # positions with an empty board cannot be stored
+    if key is not None:
+        values[key] = value
+
+    return value
+
+def _visit(game, max_tiles, values, visited):
+    '''
+    Plays every move sequence of a game until it reaches positions with
+    at most the provided amount of dominoes in hands, and solves them.
+
+    :param BitGame game: game to explore
+    :param int max_tiles: maximum amount of dominoes remaining in the
+                          hands of the positions to solve
+    :param dict values: values of the positions solved so far
+    :param set visited: positions explored so far that have too many
+                        dominoes remaining to be solved
+    :return: None
+    '''
+    if game.result is not None:
+        return
+
+    if _tiles(game) <= max_tiles:
+        _solve(game, values)
+        return
+
+    key = game.position_key()
+    if key in visited:
+        return
+    visited.add(key)
+
+    for _, g in dominoes.search.make_moves(game):
+        _visit(g, max_tiles, values, visited)
+
+def build(path, games, max_tiles):
+    '''
+    Computes the exact values of all positions with at most the provided
+    amount of dominoes remaining in hands that can be reached from the
+    provided games, and writes them to a tablebase file. Positions are
+    solved exhaustively, without pruning, so the cost grows quickly with
+    the amount of dominoes. Positions with more dominoes than that are
+    only explored to reach the ones to solve, so the provided games
+    should not be much further from the end than the positions to solve.
+
+    :param str path: path of the file to write
+    :param Iterable games: Game or BitGame objects whose descendants
+                           to solve. They are not modified. Only games
+                           using the double six set are supported.
+    :param int max_tiles: maximum amount of dominoes remaining
+                          in the hands of the positions to solve
+    :return: the amount of positions written
+    :raises NoSuchDominoException: if a game is not using the double six set
+    '''
+    values = {}
+    visited = set()
+    for game in games:
+        if not isinstance(game, dominoes.BitGame):
+            game = dominoes.BitGame.from_game(game)
+        _visit(game, max_tiles, values, visited)
+
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, max_tiles, len(values)))
+        for key in sorted(values):
+            f.write(_RECORD.pack(key, values[key]))
+
+    return len(values)
+
+class Tablebase:
+    '''
+    Python class for objects that look up the exact values of positions
+    in a tablebase file written by build(). The file is memory-mapped
+    read-only, so lookups only read the parts of the file they need,
+    and processes that open the same file share its memory. Pickling a
+    Tablebase only pickles its path, so it can be sent to worker processes,
+    which then map the file themselves.
+
+    :param str path: path of the tablebase file
+    :var str path: path of the tablebase file
+    :var int max_tiles: maximum amount of dominoes remaining in
+                        the hands of the positions in the file
+    :raises ValueError: if the file is not a tablebase file
+
+    .. code-block:: python
+
+        >>> import dominoes
+        >>> d1 = dominoes.Domino(1, 2)
+        >>> d2 = dominoes.Domino(2, 3)
+        >>> d3 = dominoes.Domino(3, 4)
+        >>> d4 = dominoes.Domino(4, 5)
+        >>> d5 = dominoes.Domino(1, 6)
+        >>> g = dominoes.Game.new(starting_player=0)
+        >>> g.hands = [dominoes.Hand([d1, d5]), dominoes.Hand([d2]),
+        ...            dominoes.Hand([d3]), dominoes.Hand([d4])]
+        >>> g.valid_moves = ((d1, True), (d5, True))
+        >>> dominoes.tablebase.build('endgames.tb', [g], 4)
+        2
+        >>> tb = dominoes.tablebase.Tablebase('endgames.tb')
+        >>> dominoes.search.alphabeta(g, tablebase=tb)
+        ([([1|6], True)], 21)
+    '''
+    def __init__(self, path):
+        self.path = path
+
+        with open(path, 'rb') as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError('{} is not a tablebase file!'.format(path))
+
+            magic, self.max_tiles, self._size = _HEADER.unpack(header)
+            if magic != _MAGIC or \
+               os.fstat(f.fileno()).st_size != _HEADER.size + self._size * _RECORD.size:
+                raise ValueError('{} is not a tablebase file!'.format(path))
+
+            # an empty file cannot be memory-mapped
+            if self._size:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self._mmap = None
+
+    def get(self, game):
+        '''
+        :param game: Game or BitGame whose position to look up
+        :return: the exact value of the game if its position is
+                 in the tablebase; None otherwise
+        '''
+        # avoid computing the key if the position cannot be in the file
+        if not self._size or _tiles(game) > self.max_tiles:
+            return None
+
+        key = _encode(game)
+        if key is None:
+            return None
+
+        # binary search over the sorted records
+        lo = 0
+        hi = self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = _HEADER.size + mid * _RECORD.size
+            mid_key = self._mmap[offset:offset + _KEY_BYTES]
+            if mid_key < key:
+                lo = mid + 1
+            elif mid_key > key:
+                hi = mid
+            else:
+                return _RECORD.unpack_from(self._mmap, offset)[1]
+
+        return None
+
+    def close(self):
+        '''
+        Unmaps the tablebase file. The tablebase should
+        not be used after it has been closed.
+
+        :return: None
+        '''
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def __len__(self):
+        return self._size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __getstate__(self):
+        return self.path
+
+    def __setstate__(self, path):
+        self.__init__(path)
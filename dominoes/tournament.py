@@ -0,0 +1,260 @@
+import collections
+import dominoes
+import math
+import multiprocessing
+import random
+
+Match = collections.namedtuple('Match', ['players', 'index', 'results'])
+Match.__doc__ = \
+'''
+namedtuple to represent a match of a tournament,
+which is either a single game or a series.
+
+:var players: a tuple of the indexes of the players of each team. The
+              first player sits in seats 0 and 2, and the second
+              player sits in seats 1 and 3.
+:var index: index of the match among the matches with the same seating
+:var results: a list of the Result of each game of the match
+
+.. code-block:: python
+
+    >>> import dominoes
+    >>> dominoes.tournament.Match((1, 0), 3, [dominoes.Result(1, True, -25)])
+    Match(players=(1, 0), index=3, results=[Result(player=1, won=True, points=-25)])
+'''
+
+# z-score of the 95% confidence intervals reported by Standings
+_Z = 1.96
+
+# players, target score, and starting domino of the current worker process
+_worker_players = None
+_worker_target_score = None
+_worker_starting_domino = None
+
+def seatings(players):
+    '''
+    :param Sequence players: players to seat
+    :return: a list of the seatings of the players, as tuples of the indexes
+             of the player of each team. Every player plays against every
+             other player, once as each team.
+    '''
+    return [(i, j) for i in range(len(players)) for j in range(len(players)) if i != j]
+
+def _play_game(game, players):
+    '''
+    Plays a game until the end, with each player making the move it prefers.
+
+    :param Game game: game to play. Gets modified.
+    :param Sequence players: the player in each of the 4 seats
+    :return: the Result of the game
+    '''
+    while game.result is None:
+        players[game.turn](game)
+        game.make_move(*game.valid_moves[0])
+
+    return game.result
+
+def _play_match(players, target_score, starting_domino, task):
+    '''
+    :param Sequence players: players of the tournament
+    :param int target_score: score up to which each match is played as a
+                             series; None to play each match as a single game
+    :param Domino starting_domino: domino that determines which player starts
+                                   the first game of each match; None for
+                                   player 0 to start
+    :param tuple task: seating of the match, index of the match,
+                       and seed of its random numbers, if any
+    :return: the Match
+    '''
+    seating, index, seed = task
+    if seed is not None:
+        random.seed('{} {} {} {}'.format(seed, seating[0], seating[1], index))
+
+    seats = [players[seating[p % 2]] for p in range(4)]
+
+    if target_score is None:
+        results = [_play_game(dominoes.Game.new(starting_domino=starting_domino), seats)]
+    else:
+        series = dominoes.Series(target_score, starting_domino)
+        results = []
+        game = series.games[0]
+        while game is not None:
+            results.append(_play_game(game, seats))
+            game = series.next_game()
+
+    return Match(seating, index, results)
+
+def _init_worker(players, target_score, starting_domino):
+    '''
+    Initializes a process that plays matches for play().
+
+    :param Sequence players: players of the tournament
+    :param int target_score: score up to which each match is played
+    :param Domino starting_domino: domino that determines which
+                                   player starts each match
+    :return: None
+    '''
+    global _worker_players
+    global _worker_target_score
+    global _worker_starting_domino
+
+    _worker_players = players
+    _worker_target_score = target_score
+    _worker_starting_domino = starting_domino
+
+    # forked processes start with the same random state,
+    # which would make them play the same games
+    random.seed()
+
+def _worker_play_match(task):
+    '''
+    Calls _play_match in a worker process.
+
+    :param tuple task: seating of the match, index of the match,
+                       and seed of its random numbers, if any
+    :return: the Match
+    '''
+    return _play_match(_worker_players, _worker_target_score, _worker_starting_domino, task)
+
+def play(players, matches, target_score=None, starting_domino=None,
+         workers=None, chunksize=1, seed=None):
+    '''
+    Plays the provided amount of matches for each seating of the players,
+    and yields each match as soon as it has been played. Each match is
+    either a single game or a series, and the players of each team make
+    the moves that they prefer.
+
+    :param Sequence players: players from dominoes.players. If they are
+                             played in other processes, they must be picklable.
+    :param int matches: amount of matches to play for each seating. The
+                        total amount of matches is matches * n * (n - 1),
+                        for n players.
+    :param int target_score: if provided, each match is a series played up to
+                             this score. By default each match is a single game.
+    :param Domino starting_domino: domino that determines which player
+                                   starts the first game of each match.
+                                   By default, player 0 starts, which
+                                   alternates between teams since every
+                                   pair of players plays in both seatings.
+    :param int workers: amount of processes among which to split the matches.
+                        Matches are then yielded in the order in which they
+                        finish. By default all matches are played in the
+                        current process, in order.
+    :param int chunksize: amount of matches sent to a process at a time.
+                          Larger chunks have less overhead, but
+                          matches are yielded less evenly.
+    :param seed: if provided, the random numbers of each match are seeded from
+                 this value, its seating, and its index, so that matches are
+                 the same regardless of the amount of processes. This also
+                 reseeds the random numbers of the current process.
+    :return: a generator of the Match objects of the tournament
+    '''
+    tasks = ((seating, i, seed) for seating in seatings(players) for i in range(matches))
+
+    if workers is None:
+        for task in tasks:
+            yield _play_match(players, target_score, starting_domino, task)
+        return
+
+    with multiprocessing.Pool(workers, _init_worker,
+                              (players, target_score, starting_domino)) as pool:
+        yield from pool.imap_unordered(_worker_play_match, tasks, chunksize)
+
+class Standings:
+    '''
+    Python class for objects that keep statistics of the matches played by
+    each player of a tournament. A team wins a match if it scores more points
+    than the other team. Confidence intervals are 95% intervals computed with
+    the normal approximation, so they are only meaningful for many matches.
+
+    :param Sequence players: players of the tournament
+    :var list names: name of each player
+    :var list matches: amount of matches played by each player
+    :var list wins: amount of matches won by each player
+    :var list ties: amount of matches tied by each player
+    :var list points: sum of the points by which each player's team beat the
+                      other team over all matches; negative for losses
+    :var list squared_points: sum of the squares of the
+                              points of each player's matches
+
+    .. code-block:: python
+
+        >>> import dominoes
+        >>> players = [dominoes.players.random, dominoes.players.bota_gorda]
+        >>> standings = dominoes.tournament.Standings(players)
+        >>> for match in dominoes.tournament.play(players, 500, workers=4):
+        ...     standings.update(match)
+        >>> standings
+        Player 0 (random): 1000 matches, 46.4% +/- 3.1% won, 29 tied, -3.3 +/- 1.9 points
+        Player 1 (bota_gorda): 1000 matches, 50.7% +/- 3.1% won, 29 tied, 3.3 +/- 1.9 points
+    '''
+    def __init__(self, players):
+        self.names = [getattr(p, '__name__', type(p).__name__) for p in players]
+        self.matches = [0] * len(players)
+        self.wins = [0] * len(players)
+        self.ties = [0] * len(players)
+        self.points = [0] * len(players)
+        self.squared_points = [0] * len(players)
+
+    def update(self, match):
+        '''
+        Adds the outcome of a match to the statistics of its players.
+
+        :param Match match: match to add
+        :return: None
+        '''
+        points = sum(r.points for r in match.results)
+        for player, team_points in zip(match.players, (points, -points)):
+            self.matches[player] += 1
+            if team_points > 0:
+                self.wins[player] += 1
+            elif not team_points:
+                self.ties[player] += 1
+            self.points[player] += team_points
+            self.squared_points[player] += team_points * team_points
+
+    def win_rate(self, player):
+        '''
+        :param int player: index of the player
+        :return: a tuple of the fraction of matches won by the player,
+                 and the half-width of its confidence interval
+        :raises ZeroDivisionError: if the player has not played any matches
+        '''
+        n = self.matches[player]
+        rate = self.wins[player] / n
+
+        return rate, _Z * math.sqrt(rate * (1 - rate) / n)
+
+    def mean_points(self, player):
+        '''
+        :param int player: index of the player
+        :return: a tuple of the mean points by which the player's team
+                 beat the other team, and the half-width of its
+                 confidence interval
+        :raises ZeroDivisionError: if the player has not played any matches
+        '''
+        n = self.matches[player]
+        mean = self.points[player] / n
+        variance = max(self.squared_points[player] / n - mean * mean, 0)
+
+        return mean, _Z * math.sqrt(variance / n)
+
+    def __str__(self):
+        string_list = []
+        for p, name in enumerate(self.names):
+            if not self.matches[p]:
+                string_list.append('Player {} ({}): 0 matches'.format(p, name))
+                continue
+
+            string_list.append(
+                'Player {} ({}): {} matches, {:.1%} +/- {:.1%} won,'
+                ' {} tied, {:.1f} +/- {:.1f} points'.format(
+                    p, name, self.matches[p], *self.win_rate(p),
+                    self.ties[p], *self.mean_points(p)
+                )
+            )
+
+        return '\n'.join(string_list)
+
+    def __repr__(self):
+        return str(self)
@@ -10,5 +10,6 @@ setup(
     license='MIT',
     packages=['dominoes'],
     scripts=['bin/dominoes'],
+    extras_require={'batch': ['numpy']},
     test_suite='tests'
 )
@@ -0,0 +1,67 @@
+import dominoes
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def _play(hands, players, starting_domino=None, starting_player=0):
+    '''
+    Plays a game with the provided hands, one move at a time.
+    '''
+    g = dominoes.BitGame(list(hands), None, None, 0, [], starting_player,
+                         (), starting_player, None)
+
+    if starting_domino is None:
+        g.valid_moves = tuple((dominoes.bit_game.DOMINOES[i], True)
+                              for i in dominoes.bit_game.indexes(hands[starting_player]))
+    else:
+        g.turn = next(p for p, h in enumerate(hands)
+                      if h & dominoes.bit_game.mask([starting_domino]))
+        g.make_move(starting_domino, True)
+
+    while g.result is None:
+        players[g.turn](g)
+        g.make_move(*g.valid_moves[0])
+
+    return g.result
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed')
+class TestBatch(unittest.TestCase):
+    def test_play(self):
+        p = dominoes.players
+        for players in ((p.identity,) * 4, (p.reverse,) * 4, (p.bota_gorda,) * 4,
+                        (p.double, p.reverse, p.bota_gorda, p.identity)):
+            for starting_domino in (None, dominoes.Domino(6, 6)):
+                hands = [dominoes.BitGame.new().hands for _ in range(50)]
+
+                results = dominoes.batch.play(players=players, hands=hands,
+                                              starting_domino=starting_domino,
+                                              starting_player=1)
+
+                # the results are the same as when playing the games one at a time
+                for h, r in zip(hands, zip(*results)):
+                    self.assertEqual(dominoes.Result(*r),
+                                     _play(h, players, starting_domino, 1))
+
+        results = dominoes.batch.play(100, seed=0)
+
+        self.assertEqual(len(results.points), 100)
+        for f1, f2 in zip(results, dominoes.batch.play(100, seed=0)):
+            self.assertTrue((f1 == f2).all())
+
+        # some games end with an empty hand, and the points of a
+        # game never exceed the points in the double six set
+        self.assertTrue(results.won.any())
+        self.assertTrue((abs(results.points) <= 168).all())
+        self.assertTrue((results.player >= 0).all() and (results.player < 4).all())
+
+        self.assertRaises(ValueError, dominoes.batch.play, 1, [p.omniscient()] * 4)
+        self.assertRaises(dominoes.NoSuchPlayerException, dominoes.batch.play,
+                          1, starting_player=4)
+        self.assertRaises(dominoes.NoSuchDominoException, dominoes.batch.play,
+                          1, starting_domino=dominoes.Domino(7, 7))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import dominoes
+import dominoes.bench
+import io
+import json
+import os
+import random
+import tempfile
+import unittest
+import unittest.mock
+
+class TestBench(unittest.TestCase):
+    def test_corpus(self):
+        games1 = dominoes.bench.corpus(2)
+        games2 = dominoes.bench.corpus(2)
+
+        self.assertEqual(sorted(games1), list(dominoes.bench.MOVE_NUMBERS))
+        for n, gs in games1.items():
+            self.assertEqual(len(gs), 2)
+            for g in gs:
+                self.assertEqual(len(g.moves), n)
+                self.assertIsNone(g.result)
+
+        # the same seed generates the same positions
+        for n in dominoes.bench.MOVE_NUMBERS:
+            self.assertEqual([g.hands for g in games1[n]], [g.hands for g in games2[n]])
+
+        self.assertNotEqual([g.hands for g in dominoes.bench.corpus(2, seed=1)[0]],
+                            [g.hands for g in games1[0]])
+
+    def test_run(self):
+        games = dominoes.bench.corpus(1)
+        games_copy = {n: [str(g) for g in gs] for n, gs in games.items()}
+        state = random.getstate()
+
+        benchmarks = [b for b in dominoes.bench.BENCHMARKS
+                      if b.name in ('Game.make_move', 'Hand.play', 'search.alphabeta')]
+        results = dominoes.bench.run(games, benchmarks, repeat=1)
+
+        self.assertEqual(sorted(results), ['Game.make_move', 'Hand.play', 'search.alphabeta'])
+        self.assertEqual(sorted(results['Game.make_move'], key=int),
+                         [str(n) for n in dominoes.bench.MOVE_NUMBERS])
+        self.assertEqual(sorted(results['search.alphabeta'], key=int), ['12', '16'])
+        for times in results.values():
+            for t in times.values():
+                self.assertTrue(t > 0)
+
+        # the positions and the random state are not modified
+        self.assertEqual({n: [str(g) for g in gs] for n, gs in games.items()}, games_copy)
+        self.assertEqual(random.getstate(), state)
+
+    def test_compare(self):
+        baseline = {'a': {'0': 2.0, '4': 1.0}, 'b': {'0': 1.0}}
+        results = {'a': {'0': 1.0, '8': 1.0}, 'c': {'0': 1.0}}
+
+        self.assertEqual(dominoes.bench.compare(baseline, results), {'a': {'0': 0.5}})
+
+    def test_main(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+
+        try:
+            args = ['--positions', '1', '--repeat', '1', '--benchmark', 'Game.missing_values']
+            dominoes.bench.main(args + ['--output', path])
+
+            with open(path) as f:
+                report = json.load(f)
+
+            self.assertEqual(report['positions'], 1)
+            self.assertEqual(report['repeat'], 1)
+            self.assertEqual(report['seed'], 0)
+            self.assertEqual(list(report['results']), ['Game.missing_values'])
+
+            with unittest.mock.patch('sys.stdout', new=io.StringIO()) as stdout, \
+                 unittest.mock.patch('sys.stderr', new=io.StringIO()) as stderr:
+                dominoes.bench.main(args + ['--baseline', path])
+
+            self.assertEqual(list(json.loads(stdout.getvalue())['results']),
+                             ['Game.missing_values'])
+            self.assertTrue(stderr.getvalue().startswith('Game.missing_values: move 0: '))
+        finally:
+            os.remove(path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,238 @@
+import copy
+import dominoes
+import random
+import unittest
+
+class TestBitGame(unittest.TestCase):
+    def test_mask(self):
+        d1 = dominoes.Domino(0, 0)
+        d2 = dominoes.Domino(0, 1)
+        d3 = dominoes.Domino(6, 6)
+
+        self.assertEqual(dominoes.bit_game.mask([]), 0)
+        self.assertEqual(dominoes.bit_game.mask([d1, d2]), 3)
+        self.assertEqual(dominoes.bit_game.mask([d2.inverted()]), 2)
+        self.assertEqual(dominoes.bit_game.mask([d3]), 1 << 27)
+
+        self.assertRaises(dominoes.NoSuchDominoException,
+                          dominoes.bit_game.mask, [dominoes.Domino(7, 0)])
+
+    def test_indexes(self):
+        self.assertEqual(dominoes.bit_game.indexes(0), ())
+        self.assertEqual(dominoes.bit_game.indexes(1 << 27 | 1 << 13 | 1),
+                         (0, 13, 27))
+        self.assertEqual(dominoes.bit_game.indexes((1 << 28) - 1), tuple(range(28)))
+
+    def test_points(self):
+        self.assertEqual(dominoes.bit_game.points(0), 0)
+        self.assertEqual(dominoes.bit_game.points((1 << 28) - 1), 168)
+
+        ds = random.sample(dominoes.bit_game.DOMINOES, 7)
+        self.assertEqual(dominoes.bit_game.points(dominoes.bit_game.mask(ds)),
+                         sum(d.first + d.second for d in ds))
+
+    def test_value_masks(self):
+        for v, m in enumerate(dominoes.bit_game.VALUE_MASKS):
+            ds = [dominoes.bit_game.DOMINOES[i] for i in dominoes.bit_game.indexes(m)]
+
+            self.assertEqual(len(ds), 7)
+            for d in ds:
+                self.assertTrue(v in d)
+
+    def test_new(self):
+        g1 = dominoes.BitGame.new()
+
+        self.assertEqual(g1.starting_player, 0)
+        self.assertEqual(g1.turn, 0)
+        self.assertEqual(g1.board_length, 0)
+        self.assertEqual(len(g1.valid_moves), 7)
+        self.assertEqual(sum(g1.hands), (1 << 28) - 1)
+        for h in g1.hands:
+            self.assertEqual(len(dominoes.bit_game.indexes(h)), 7)
+
+        d = dominoes.Domino(6, 6)
+        g2 = dominoes.BitGame.new(starting_domino=d)
+
+        self.assertEqual(g2.moves[0], (d, True))
+        for m in g2.moves[1:]:
+            self.assertIsNone(m)
+        self.assertEqual((g2.left_end, g2.right_end), (6, 6))
+        self.assertEqual(g2.board_length, 1)
+
+        self.assertRaises(dominoes.NoSuchPlayerException, dominoes.BitGame.new, starting_player=4)
+        self.assertRaises(dominoes.NoSuchDominoException, dominoes.BitGame.new,
+                          starting_domino=dominoes.Domino(7, 7))
+
+    def test_from_game_to_game(self):
+        g1 = dominoes.Game.new()
+        for _ in range(5):
+            g1.make_move(*g1.valid_moves[0])
+
+        bg = dominoes.BitGame.from_game(g1)
+        g2 = bg.to_game()
+
+        self.assertEqual(g2.board.left_end(), g1.board.left_end())
+        self.assertEqual(g2.board.right_end(), g1.board.right_end())
+        self.assertEqual(len(g2.board), len(g1.board))
+        for h1, h2 in zip(g1.hands, g2.hands):
+            self.assertEqual(set(h1), set(h2))
+        self.assertEqual(g2.moves, g1.moves)
+        self.assertEqual(g2.turn, g1.turn)
+        self.assertEqual(g2.valid_moves, g1.valid_moves)
+        self.assertEqual(g2.starting_player, g1.starting_player)
+        self.assertEqual(g2.result, g1.result)
+        self.assertEqual(g2.position_key(), g1.position_key())
+
+        g3 = dominoes.Game.new()
+        g3.hands[0].draw(dominoes.Domino(7, 7))
+
+        self.assertRaises(dominoes.NoSuchDominoException, dominoes.BitGame.from_game, g3)
+
+    def test_make_move(self):
+        # play the same moves on a Game and a BitGame, until the end of the game
+        for _ in range(20):
+            g = dominoes.Game.new()
+            bg = dominoes.BitGame.from_game(g)
+
+            while g.result is None:
+                self.assertEqual(set(bg.valid_moves), set(g.valid_moves))
+                self.assertEqual(bg.turn, g.turn)
+
+                move = random.choice(g.valid_moves)
+                self.assertEqual(bg.make_move(*move), g.make_move(*move))
+                self.assertEqual(bg.moves, g.moves)
+
+            self.assertEqual(bg.result, g.result)
+            self.assertEqual(bg.valid_moves, ())
+
+        bg1 = dominoes.BitGame.new()
+        bg1.make_move(*bg1.valid_moves[0])
+        bg1_copy = copy.deepcopy(bg1)
+
+        d = next(d for d in dominoes.bit_game.DOMINOES
+                 if d not in (m for m, _ in bg1.valid_moves) and
+                 bg1.hands[bg1.turn] & dominoes.bit_game.mask([d]))
+
+        self.assertRaises(dominoes.EndsMismatchException, bg1.make_move, d, True)
+        self.assertRaises(dominoes.EndsMismatchException, bg1.make_move, d, False)
+        self.assertRaises(dominoes.NoSuchDominoException, bg1.make_move, bg1.moves[0][0], True)
+        self.assertRaises(dominoes.NoSuchDominoException, bg1.make_move,
+                          dominoes.Domino(7, 7), True)
+        self.assertEqual(bg1, bg1_copy)
+
+        while bg1.result is None:
+            bg1.make_move(*bg1.valid_moves[0])
+
+        self.assertRaises(dominoes.GameOverException, bg1.make_move, d, True)
+
+    def test_stuck(self):
+        d1 = dominoes.Domino(0, 0)
+        d2 = dominoes.Domino(0, 1)
+        d3 = dominoes.Domino(1, 1)
+        d4 = dominoes.Domino(5, 6)
+        d5 = dominoes.Domino(6, 6)
+        d6 = dominoes.Domino(4, 4)
+
+        g = dominoes.Game.new(starting_player=0)
+        g.hands = [dominoes.Hand([d1, d6]), dominoes.Hand([d2, d5]),
+                   dominoes.Hand([d3, d4]), dominoes.Hand([dominoes.Domino(2, 2)])]
+        g.valid_moves = ((d1, True),)
+        bg = dominoes.BitGame.from_game(g)
+
+        for move in ((d1, True), (d2, True)):
+            self.assertEqual(bg.make_move(*move), g.make_move(*move))
+            self.assertEqual(bg.moves, g.moves)
+            self.assertEqual(bg.turn, g.turn)
+
+        # player 2 plays the last domino that matches the ends
+        self.assertEqual(bg.make_move(d3, True), g.make_move(d3, True))
+        self.assertEqual(bg.result, g.result)
+        self.assertFalse(bg.result.won)
+        self.assertEqual(bg.moves, g.moves)
+
+    def test_remaining_points(self):
+        g = dominoes.Game.new()
+        for _ in range(5):
+            g.make_move(*g.valid_moves[0])
+
+        self.assertEqual(dominoes.BitGame.from_game(g).remaining_points(),
+                         g.remaining_points())
+
+    def test_undo_move(self):
+        bg = dominoes.BitGame.new()
+
+        undos = []
+        copies = []
+        while bg.result is None:
+            copies.append(copy.deepcopy(bg))
+            undos.append(bg.make_undoable_move(*bg.valid_moves[-1]))
+
+        while undos:
+            bg.undo_move(undos.pop())
+            self.assertEqual(bg, copies.pop())
+
+    def test_position_key(self):
+        bg1 = dominoes.BitGame.new()
+        bg2 = copy.deepcopy(bg1)
+
+        self.assertEqual(bg1.position_key(), bg2.position_key())
+
+        bg2.make_move(*bg2.valid_moves[0])
+
+        self.assertNotEqual(bg1.position_key(), bg2.position_key())
+
+    def test_alphabeta(self):
+        for _ in range(3):
+            g = dominoes.Game.new()
+            for _ in range(10):
+                g.make_move(*g.valid_moves[0])
+                if g.result is not None:
+                    break
+            g.skinny_board()
+            bg = dominoes.BitGame.from_game(g)
+
+            _, value1 = dominoes.search.alphabeta(g)
+            moves2, value2 = dominoes.search.alphabeta(bg)
+
+            self.assertEqual(value1, value2)
+
+            # the principal variation leads to the computed value
+            for move in moves2:
+                bg.make_move(*move)
+            if g.result is None:
+                self.assertEqual(bg.result.points, value2)
+
+    def test_players(self):
+        players = [dominoes.players.identity, dominoes.players.counter(),
+                   dominoes.players.random, dominoes.players.reverse,
+                   dominoes.players.bota_gorda, dominoes.players.double]
+
+        for player in players:
+            g = dominoes.BitGame.new()
+            while g.result is None:
+                valid_moves = g.valid_moves
+                player(g)
+
+                self.assertEqual(sorted(g.valid_moves, key=str), sorted(valid_moves, key=str))
+
+                g.make_move(*g.valid_moves[0])
+
+    def test_eq(self):
+        bg1 = dominoes.BitGame.new()
+        bg2 = copy.deepcopy(bg1)
+
+        self.assertEqual(bg1, bg2)
+        self.assertNotEqual(bg1, bg1.to_game())
+
+        bg2.make_move(*bg2.valid_moves[0])
+
+        self.assertNotEqual(bg1, bg2)
+
+    def test_str(self):
+        bg = dominoes.BitGame.new()
+
+        self.assertEqual(str(bg), str(bg.to_game()))
+        self.assertEqual(repr(bg), str(bg))
+
+if __name__ == '__main__':
+    unittest.main()
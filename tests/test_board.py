@@ -1,4 +1,5 @@
 import collections
+import copy
 import dominoes
 import unittest
 
@@ -132,5 +133,79 @@ class TestBoard(unittest.TestCase):
         self.assertEqual(str(b), '[2|1][1|3][3|2]')
         self.assertEqual(repr(b), '[2|1][1|3][3|2]')
 
+    def test_remove(self):
+        b = dominoes.Board()
+
+        d1 = dominoes.Domino(1, 2)
+        d2 = dominoes.Domino(1, 3)
+        d3 = dominoes.Domino(2, 3)
+        d4 = dominoes.Domino(3, 3)
+
+        self.assertRaises(dominoes.EmptyBoardException, b.remove, d1, True)
+
+        b.add(d1, True)
+        b.add(d2, True)
+        b.add(d3, False)
+        b.add(d4, False)
+
+        b.remove(d4, False)
+
+        self.assertEqual(len(b), 3)
+        self.assertEqual(b.left_end(), 3)
+        self.assertEqual(b.right_end(), 3)
+
+        b.remove(d2, True)
+
+        self.assertEqual(len(b), 2)
+        self.assertEqual(b.left_end(), 1)
+        self.assertEqual(b.right_end(), 3)
+
+        b.remove(d3, False)
+
+        self.assertEqual(len(b), 1)
+        self.assertEqual(b.left_end(), 1)
+        self.assertEqual(b.right_end(), 2)
+
+        b.remove(d1, False)
+
+        self.assertEqual(len(b), 0)
+        self.assertEqual(b, dominoes.Board())
+
+        b.add(d1, True)
+        b.add(d3, False)
+        b.add(d4, False)
+
+        # removing from the left when all dominoes are to the right of the first one
+        b.remove(d1, True)
+
+        self.assertEqual(len(b), 2)
+        self.assertEqual(str(b), '[2|3][3|3]')
+        self.assertEqual(b.left_end(), 2)
+        self.assertEqual(b.right_end(), 3)
+
+    def test_copy(self):
+        b1 = dominoes.Board()
+
+        d1 = dominoes.Domino(1, 2)
+        d2 = dominoes.Domino(1, 3)
+        d3 = dominoes.Domino(2, 3)
+
+        b1.add(d1, True)
+        b1.add(d2, True)
+
+        for b2 in (copy.copy(b1), copy.deepcopy(b1)):
+            self.assertEqual(b1, b2)
+
+            b2.add(d3, False)
+
+            self.assertEqual(str(b1), '[3|1][1|2]')
+            self.assertEqual(str(b2), '[3|1][1|2][2|3]')
+
+            b2.remove(d3, False)
+            b2.remove(d2, True)
+
+            self.assertEqual(str(b1), '[3|1][1|2]')
+            self.assertEqual(str(b2), '[1|2]')
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,5 +1,7 @@
 import collections
+import copy
 import dominoes
+import pickle
 import unittest
 
 class TestDomino(unittest.TestCase):
@@ -28,6 +30,38 @@ class TestDomino(unittest.TestCase):
         self.assertEqual(d.first, d_inv.second)
         self.assertEqual(d.second, d_inv.first)
 
+    def test_interning(self):
+        d1 = dominoes.Domino(1, 2)
+        d2 = dominoes.Domino(2, 1)
+        d3 = dominoes.Domino(1, 1)
+
+        # the same values always give the same object
+        self.assertIs(dominoes.Domino(1, 2), d1)
+        self.assertIs(d1.inverted(), d2)
+        self.assertIs(d2.inverted(), d1)
+        self.assertIs(d3.inverted(), d3)
+        self.assertIsNot(d1, d2)
+
+        self.assertIs(copy.copy(d1), d1)
+        self.assertIs(copy.deepcopy(d1), d1)
+        self.assertIs(pickle.loads(pickle.dumps(d2)), d2)
+
+        # as are the dominoes created by the namedtuple methods
+        self.assertIs(dominoes.Domino._make([1, 2]), d1)
+        self.assertIs(dominoes.Domino._make(iter((2, 1))), d2)
+        self.assertIs(d1._replace(first=2, second=1), d2)
+        self.assertIs(d3._replace(second=2), d1)
+        self.assertIs(d1._replace(), d1)
+        self.assertIn(d1._replace(first=2, second=1), dominoes.Hand([d1]))
+        self.assertRaises(TypeError, dominoes.Domino._make, [1, 2, 3])
+        self.assertRaises(ValueError, d1._replace, third=3)
+
+        # dominoes outside of the double six set are interned as well
+        d4 = dominoes.Domino(7, 9)
+
+        self.assertIs(dominoes.Domino(7, 9), d4)
+        self.assertIs(d4.inverted(), dominoes.Domino(9, 7))
+
     def test_str(self):
         d = dominoes.Domino(1, 2)
 
@@ -74,6 +108,11 @@ class TestDomino(unittest.TestCase):
         self.assertTrue(d2 in d_set)
         self.assertFalse(d3 in d_set)
 
+        self.assertEqual(hash(d1), hash(d2))
+
+        # the dominoes of the double six set are hashed in the same way in every process
+        self.assertEqual([hash(d) for d in dominoes.bit_game.DOMINOES], list(range(28)))
+
     def test_contains(self):
         d = dominoes.Domino(1, 2)
 
@@ -1,6 +1,7 @@
 import collections
 import copy
 import dominoes
+import random
 import unittest
 
 class TestGame(unittest.TestCase):
@@ -61,6 +62,17 @@ class TestGame(unittest.TestCase):
 
         self.assertEqual(dominoes.game._remaining_points(h2), [0, 1, 13])
 
+        # hands with duplicates or with dominoes outside of the double six set
+        d4 = dominoes.Domino(7, 8)
+        h3 = [dominoes.Hand([d1, d1]), dominoes.Hand([d4, d3])]
+
+        self.assertEqual(dominoes.game._remaining_points(h3), [2, 24])
+
+        h3[0].play(d1)
+        h3[1].play(d4)
+
+        self.assertEqual(dominoes.game._remaining_points(h3), [1, 9])
+
     def test_validate_hands(self):
         d1 = dominoes.Domino(0, 0)
         d2 = dominoes.Domino(1, 2)
@@ -78,6 +90,102 @@ class TestGame(unittest.TestCase):
         self.assertTrue(dominoes.game._validate_hands(hs, [{3}, {5}, {7}, {1}]))
         self.assertFalse(dominoes.game._validate_hands(hs, [{0}] + [set()] * 3))
 
+    def test_all_possible_partitionings(self):
+        d1 = dominoes.Domino(0, 1)
+        d2 = dominoes.Domino(1, 2)
+        d3 = dominoes.Domino(2, 3)
+        d4 = dominoes.Domino(3, 4)
+        ds = {d1, d2, d3, d4}
+
+        def partitionings(ps):
+            return sorted(tuple(frozenset(p2) for p2 in p) for p in ps)
+
+        # without missing values, all partitionings are possible
+        ps1 = partitionings(dominoes.game._all_possible_partitionings(ds, [2, 1, 1],
+                                                                      [set()] * 3))
+
+        self.assertEqual(len(ps1), 12)
+        self.assertEqual(len(set(ps1)), 12)
+
+        # [0|1] cannot be in the first partition, and [3|4] cannot be in
+        # the second one, which leaves the same partitionings as filtering
+        missing = [{0}, {4}, set()]
+        ps2 = partitionings(dominoes.game._all_possible_partitionings(ds, [2, 1, 1], missing))
+        hs = [[dominoes.Hand(p2) for p2 in p] for p in ps1]
+
+        self.assertEqual(len(ps2), 5)
+        self.assertEqual(ps2, partitionings(h for h in hs
+                                            if dominoes.game._validate_hands(h, missing)))
+
+        # no partitioning is possible if a domino does not fit anywhere
+        for missing in ([{1}, {1}, {1}], [{2}, {2}, set()]):
+            self.assertEqual(list(dominoes.game._all_possible_partitionings(ds, [2, 1, 1],
+                                                                            missing)), [])
+
+        self.assertEqual(list(dominoes.game._all_possible_partitionings(set(), [0, 0],
+                                                                        [{1}, set()])),
+                         [((), ())])
+
+    def test_splits(self):
+        self.assertEqual(list(dominoes.game._splits(0, (), (1, 2))), [(0, 0)])
+        self.assertEqual(list(dominoes.game._splits(1, (), (1, 2))), [])
+        self.assertEqual(list(dominoes.game._splits(2, (0, 2), (1, 2, 1))),
+                         [(1, 0, 1)])
+        self.assertEqual(sorted(dominoes.game._splits(2, (0, 1), (2, 2, 2))),
+                         [(0, 2, 0), (1, 1, 0), (2, 0, 0)])
+        self.assertEqual(list(dominoes.game._splits(3, (1,), (2, 2, 2))), [])
+
+    def test_multinomial(self):
+        self.assertEqual(dominoes.game._multinomial(()), 1)
+        self.assertEqual(dominoes.game._multinomial((0, 3)), 1)
+        self.assertEqual(dominoes.game._multinomial((1, 2)), 3)
+        self.assertEqual(dominoes.game._multinomial((2, 1, 2)), 30)
+
+    def test_random_possible_partitionings(self):
+        d1 = dominoes.Domino(0, 1)
+        d2 = dominoes.Domino(1, 2)
+        d3 = dominoes.Domino(2, 3)
+        d4 = dominoes.Domino(3, 4)
+        ds = [d1, d2, d3, d4]
+
+        # [0|1] cannot be in the first partition, and [3|4] cannot be
+        # in the second one, which leaves 5 possible partitionings
+        missing = [{0}, {4}, set()]
+        ps1 = dominoes.game._random_possible_partitionings(ds, [2, 1, 1], missing, 500)
+
+        self.assertEqual(len(ps1), 500)
+        for p in ps1:
+            self.assertEqual([len(p2) for p2 in p], [2, 1, 1])
+
+        # there is a small chance that this assertion will fail, if any of
+        # the 5 possible partitionings does not get drawn in the 500 attempts.
+        counts = collections.Counter(tuple(frozenset(p2) for p2 in p) for p in ps1)
+        self.assertEqual(set(counts), {
+            (frozenset([d2, d3]), frozenset([d1]), frozenset([d4])),
+            (frozenset([d2, d4]), frozenset([d1]), frozenset([d3])),
+            (frozenset([d3, d4]), frozenset([d1]), frozenset([d2])),
+            (frozenset([d2, d4]), frozenset([d3]), frozenset([d1])),
+            (frozenset([d3, d4]), frozenset([d2]), frozenset([d1]))
+        })
+
+        # all possible partitionings are equally likely. this has
+        # a tiny, but nonzero, chance of failing.
+        for c in counts.values():
+            self.assertTrue(50 < c < 150)
+
+        # repeated dominoes are placed as many times as they appear
+        ps2 = dominoes.game._random_possible_partitionings([d1, d1, d2], [1, 2], [{2}, set()], 10)
+        for p in ps2:
+            self.assertEqual(p[0], [d1])
+            self.assertEqual(sorted(p[1]), [d1, d2])
+
+        self.assertEqual(dominoes.game._random_possible_partitionings([], [0, 0], [{1}, {2}], 2),
+                         [[[], []], [[], []]])
+
+        self.assertRaises(dominoes.NoPossibleHandsException,
+                          dominoes.game._random_possible_partitionings,
+                          ds, [2, 1, 1], [{1}, {1}, {1}], 1)
+
     def test_next_player(self):
         self.assertEqual(dominoes.game.next_player(0), 1)
         self.assertEqual(dominoes.game.next_player(1), 2)
@@ -216,6 +324,20 @@ class TestGame(unittest.TestCase):
         g9.moves = ()
         self.assertNotEqual(g1, g9)
 
+    def test_remaining_points_method(self):
+        d1 = dominoes.Domino(0, 1)
+        d2 = dominoes.Domino(1, 3)
+        d3 = dominoes.Domino(3, 6)
+
+        g = dominoes.Game.new()
+
+        self.assertEqual(sum(g.remaining_points()), 168)
+
+        g.hands = [dominoes.Hand([]), dominoes.Hand([d1]),
+                   dominoes.Hand([d2, d3]), dominoes.Hand([])]
+
+        self.assertEqual(g.remaining_points(), [0, 1, 13, 0])
+
     def test_skinny_board(self):
         d = dominoes.Domino(1, 2)
         g = dominoes.Game.new(starting_domino=d)
@@ -292,6 +414,93 @@ class TestGame(unittest.TestCase):
         self.assertEqual(g5.starting_player, g6.starting_player)
         self.assertEqual(g5.result, g6.result)
 
+    def test_clone(self):
+        for skinny in (False, True):
+            g1 = dominoes.Game.new()
+            if skinny:
+                g1.skinny_board()
+            g1.make_move(*g1.valid_moves[0])
+            g1_copy = copy.deepcopy(g1)
+
+            g2 = g1.clone()
+
+            self.assertEqual(g1, g2)
+            for p in range(len(g1.hands)):
+                self.assertIs(g1.hands[p], g2.hands[p])
+            self.assertIs(g1.moves, g2.moves)
+
+            # moves made on the clone do not modify the original
+            p1 = g2.turn
+            undo = g2.make_undoable_move(*g2.valid_moves[0])
+
+            self.assertEqual(g1, g1_copy)
+            self.assertIsNot(g1.hands[p1], g2.hands[p1])
+            self.assertIsNot(g1.moves, g2.moves)
+            for p in range(len(g1.hands)):
+                if p != p1:
+                    self.assertIs(g1.hands[p], g2.hands[p])
+
+            g2.undo_move(undo)
+
+            self.assertEqual(g1, g2)
+
+            # moves made on the original do not modify the clone
+            g3 = g1.clone()
+            g3_copy = copy.deepcopy(g3)
+            while g1.result is None:
+                g1.make_move(*g1.valid_moves[-1])
+
+            self.assertEqual(g3, g3_copy)
+            self.assertEqual(g2, g3)
+
+    def test_position_key(self):
+        d1 = dominoes.Domino(1, 2)
+        d2 = dominoes.Domino(2, 3)
+        d3 = dominoes.Domino(3, 1)
+        d4 = dominoes.Domino(4, 4)
+
+        g1 = dominoes.Game.new(starting_player=0)
+        g1.hands = [
+            dominoes.Hand([d1, d4]),
+            dominoes.Hand([d2, d4]),
+            dominoes.Hand([d3, d4]),
+            dominoes.Hand([d4])
+        ]
+        g1.valid_moves = ((d1, True),)
+
+        g2 = copy.deepcopy(g1)
+
+        self.assertEqual(g1.position_key(), g2.position_key())
+
+        # the same position, reached with a different move order
+        g1.make_move(d1, True)
+        g1.make_move(d2, False)
+        g1.make_move(d3, True)
+
+        g2.hands = [
+            dominoes.Hand([d4, d1]),
+            dominoes.Hand([d3, d4]),
+            dominoes.Hand([d2, d4]),
+            dominoes.Hand([d4])
+        ]
+        g2.make_move(d1.inverted(), True)
+        g2.make_move(d3, False)
+        g2.make_move(d2, True)
+
+        self.assertEqual(g1.position_key(), g2.position_key())
+        self.assertNotEqual(g1.board, g2.board)
+        self.assertEqual(hash(g1.position_key()), hash(g2.position_key()))
+
+        g3 = copy.deepcopy(g1)
+        g3.turn = dominoes.game.next_player(g3.turn)
+
+        self.assertNotEqual(g1.position_key(), g3.position_key())
+
+        g4 = copy.deepcopy(g1)
+        g4.hands[3].draw(d2)
+
+        self.assertNotEqual(g1.position_key(), g4.position_key())
+
     def test_update_valid_moves(self):
         d1 = dominoes.Domino(1, 2)
         d2 = dominoes.Domino(2, 3)
@@ -637,6 +846,32 @@ class TestGame(unittest.TestCase):
         self.assertTrue('Player 1 won and scored 19 points!' in str5)
         self.assertEqual(str5, repr5)
 
+    def test_undo_move(self):
+        for skinny in (False, True):
+            g1 = dominoes.Game.new()
+            if skinny:
+                g1.skinny_board()
+
+            undos = []
+            copies = []
+            while g1.result is None:
+                # play the last valid move, so that moves on either end get exercised
+                copies.append(copy.deepcopy(g1))
+                undos.append(g1.make_undoable_move(*g1.valid_moves[-1]))
+
+            self.assertIsNotNone(g1.result)
+
+            while undos:
+                g1.undo_move(undos.pop())
+                self.assertEqual(g1, copies.pop())
+
+        g2 = dominoes.Game.new()
+        g2_copy = copy.deepcopy(g2)
+        d = dominoes.Domino(7, 7)
+
+        self.assertRaises(dominoes.NoSuchDominoException, g2.make_undoable_move, d, True)
+        self.assertEqual(g2, g2_copy)
+
     def test_missing_values(self):
         g = dominoes.Game.new()
 
@@ -658,6 +893,30 @@ class TestGame(unittest.TestCase):
 
         self.assertEqual(g.missing_values(), [set()] + [{1, 2}] * 3)
 
+        # modifying the returned sets does not affect the game
+        g.missing_values()[1].add(3)
+
+        self.assertEqual(g.missing_values(), [set()] + [{1, 2}] * 3)
+
+        # the missing values are kept up to date as moves are made, copied,
+        # and undone, and are the same as when replaying the game
+        for _ in range(10):
+            g = dominoes.Game.new()
+            undos = []
+            missing = []
+            while g.result is None:
+                self.assertEqual(g.missing_values(), dominoes.game._missing_values(
+                    g.moves, g.starting_player
+                ))
+                self.assertEqual(copy.deepcopy(g).missing_values(), g.missing_values())
+
+                missing.append(g.missing_values())
+                undos.append(g.make_undoable_move(*random.choice(g.valid_moves)))
+
+            while undos:
+                g.undo_move(undos.pop())
+                self.assertEqual(g.missing_values(), missing.pop())
+
     def test_random_possible_hands(self):
         d1 = dominoes.Domino(0, 0)
         d2 = dominoes.Domino(1, 2)
@@ -687,6 +946,55 @@ class TestGame(unittest.TestCase):
             }
         )
 
+        # hands that are inconsistent with the passes
+        g.hands[1] = dominoes.Hand([d1, d1])
+
+        self.assertRaises(dominoes.NoPossibleHandsException, g.random_possible_hands)
+
+    def test_sample_possible_hands(self):
+        d1 = dominoes.Domino(0, 0)
+        d2 = dominoes.Domino(1, 2)
+        d3 = dominoes.Domino(3, 4)
+        d4 = dominoes.Domino(5, 6)
+
+        g = dominoes.Game.new()
+
+        g.hands = [
+            dominoes.Hand([d1, d1]),
+            dominoes.Hand([d2, d3]),
+            dominoes.Hand([d1, d1]),
+            dominoes.Hand([d4])
+        ]
+
+        g.make_move(d1, True)
+        g.make_move(d1, True)
+
+        g_copy = copy.deepcopy(g)
+
+        self.assertEqual(g.sample_possible_hands(0), [])
+
+        hss = g.sample_possible_hands(100)
+
+        # the game is not modified
+        self.assertEqual(g, g_copy)
+
+        # there is a small chance that this assertion will fail, if any of
+        # the 3 possible hands does not get generated in the 100 attempts.
+        self.assertEqual(len(hss), 100)
+        self.assertEqual(
+            {tuple(frozenset(h) for h in hs) for hs in hss},
+            {
+                (frozenset([d1]), frozenset([d3, d4]), frozenset([d1]), frozenset([d2])),
+                (frozenset([d1]), frozenset([d2, d4]), frozenset([d1]), frozenset([d3])),
+                (frozenset([d1]), frozenset([d2, d3]), frozenset([d1]), frozenset([d4]))
+            }
+        )
+
+        # the current player's hand is kept, and the hands are not shared
+        for hs in hss:
+            self.assertEqual(hs[g.turn], g.hands[g.turn])
+        self.assertIsNot(hss[0][1], hss[1][1])
+
     def test_all_possible_hands(self):
         d1 = dominoes.Domino(0, 0)
         d2 = dominoes.Domino(1, 2)
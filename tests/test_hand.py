@@ -22,6 +22,57 @@ class TestHand(unittest.TestCase):
         self.assertTrue(d1 in h)
         self.assertFalse(d2 in h)
 
+        # order of values does not matter
+        self.assertTrue(d1.inverted() in h)
+
+        # only dominoes can be in a hand
+        self.assertFalse((1, 2) in h)
+        self.assertFalse(1 in h)
+
+    def test_copy(self):
+        d1 = dominoes.Domino(1, 2)
+        d2 = dominoes.Domino(1, 3)
+
+        h1 = dominoes.Hand([d1, d2])
+        h2 = dominoes.Hand(h1)
+
+        self.assertEqual(h1, h2)
+
+        # the copy is independent of the original
+        h2.play(d1)
+
+        self.assertTrue(d1 in h1)
+        self.assertFalse(d1 in h2)
+        self.assertEqual(len(h1), 2)
+
+    def test_duplicates(self):
+        d1 = dominoes.Domino(1, 2)
+        d2 = dominoes.Domino(1, 3)
+
+        h1 = dominoes.Hand([d1, d2, d1])
+        h2 = dominoes.Hand([d2, d1])
+
+        self.assertNotEqual(h1._position_key(), h2._position_key())
+
+        self.assertEqual(h1.play(d1), 0)
+        self.assertTrue(d1 in h1)
+        self.assertEqual(h1._position_key(), h2._position_key())
+
+        self.assertEqual(h1.play(d1.inverted()), 1)
+        self.assertFalse(d1 in h1)
+        self.assertRaises(dominoes.NoSuchDominoException, h1.play, d1)
+
+        h1.draw(d2)
+        h1.draw(d1, 0)
+
+        self.assertEqual(list(h1), [d1, d2, d2])
+        self.assertTrue(d1 in h1)
+
+        self.assertEqual(h1.play(d2), 1)
+        self.assertEqual(h1.play(d2), 1)
+        self.assertFalse(d2 in h1)
+        self.assertEqual(h1._position_key(), dominoes.Hand([d1])._position_key())
+
     def test_getitem(self):
         d1 = dominoes.Domino(1, 2)
         d2 = dominoes.Domino(1, 3)
@@ -59,6 +110,14 @@ class TestHand(unittest.TestCase):
         self.assertNotEqual(h5, h6)
         self.assertNotEqual(h6, h8)
 
+        # unlike equality, the position key ignores the order of the dominoes
+        self.assertEqual(h6._position_key(), h8._position_key())
+
+        h6.play(d2)
+
+        self.assertEqual(h6, h3)
+        self.assertEqual(h6._position_key(), h3._position_key())
+
         class PseudoHand:
             def __init__(self, _dominoes):
                 self._dominoes = _dominoes
@@ -220,5 +279,36 @@ class TestHand(unittest.TestCase):
         self.assertTrue(dominoes.hand.contains_value(h, 2))
         self.assertTrue(dominoes.hand.contains_value(h, 3))
 
+        # the values are up to date as dominoes are played and drawn
+        h.play(d1)
+
+        self.assertFalse(dominoes.hand.contains_value(h, 1))
+        self.assertFalse(dominoes.hand.contains_value(h, 2))
+        self.assertTrue(dominoes.hand.contains_value(h, 3))
+
+        h.draw(d1.inverted())
+
+        self.assertTrue(dominoes.hand.contains_value(h, 1))
+        self.assertFalse(dominoes.hand.contains_value(h, 7))
+
+    def test_value_mask(self):
+        d1 = dominoes.Domino(1, 2)
+        d2 = dominoes.Domino(3, 3)
+        d3 = dominoes.Domino(2, 7)
+
+        h = dominoes.Hand([d1, d2, d3])
+
+        self.assertEqual(h._value_mask(0), 0)
+        self.assertEqual(h._value_mask(1), 1 << d1._id)
+        self.assertEqual(h._value_mask(2), 1 << d1._id | 1 << d3._id)
+        self.assertEqual(h._value_mask(3), 1 << d2._id)
+        self.assertEqual(h._value_mask(7), 1 << d3._id)
+        self.assertEqual(h._value_mask(8), 0)
+
+        h.play(d3)
+
+        self.assertEqual(h._value_mask(2), 1 << d1._id)
+        self.assertEqual(h._value_mask(7), 0)
+
 if __name__ == '__main__':
     unittest.main()
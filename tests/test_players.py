@@ -1,5 +1,6 @@
 import copy
 import dominoes
+import random
 import time
 import unittest
 
@@ -226,6 +227,98 @@ class TestPlayers(unittest.TestCase):
 
         self.assertEqual(g3.valid_moves, ((d2, False), (d3, False)))
 
+        h5 = dominoes.Hand([d1, d2])
+        h6 = dominoes.Hand([d3, d2])
+        h7 = dominoes.Hand([d3, d4, d5])
+        h8 = dominoes.Hand([d2])
+
+        g4 = dominoes.Game.new(starting_player=0)
+        g4.hands = [h5, h6, h7, h8]
+        g4.make_move(d1, True)
+
+        tt = dominoes.search.TranspositionTable()
+        op4 = dominoes.players.omniscient(transposition_table=tt)
+
+        op4(g4)
+
+        self.assertEqual(g4.valid_moves, ((d2, False), (d3, False)))
+        self.assertNotEqual(len(tt), 0)
+
+        # test budgeted searches
+        self._test_player_interface(dominoes.players.omniscient(max_nodes=100))
+        self._test_player_interface(dominoes.players.omniscient(max_time=0.1))
+
+        op5 = dominoes.players.omniscient(max_time=0.1)
+        g5 = dominoes.Game.new()
+
+        start = time.time()
+        op5(g5)
+        elapsed = time.time() - start
+
+        self.assertTrue(elapsed < 1)
+
+        h9 = dominoes.Hand([d1, d2])
+        h10 = dominoes.Hand([d3, d2])
+        h11 = dominoes.Hand([d3, d4, d5])
+        h12 = dominoes.Hand([d2])
+
+        g6 = dominoes.Game.new(starting_player=0)
+        g6.hands = [h9, h10, h11, h12]
+        g6.make_move(d1, True)
+
+        op6 = dominoes.players.omniscient(max_nodes=1000)
+
+        op6(g6)
+
+        self.assertEqual(g6.valid_moves, ((d2, False), (d3, False)))
+
+        # test collecting search statistics
+        op8 = dominoes.players.omniscient(collect_stats=True)
+
+        while True:
+            g8 = _new_game_with_fixed_moves(10)
+
+            if len(g8.valid_moves) > 1:
+                break
+
+        self.assertEqual(op8.stats, [])
+
+        op8(g8)
+
+        self.assertEqual(len(op8.stats), 1)
+        self.assertTrue(op8.stats[0].nodes > 1)
+
+        op9 = dominoes.players.omniscient(max_nodes=100, collect_stats=True)
+        op9(g8)
+
+        self.assertEqual(len(op9.stats), 1)
+
+        # test sharing a move history across calls
+        self._test_player_interface(
+            dominoes.players.omniscient(history=dominoes.search.MoveHistory()), 10
+        )
+
+        # test parallel searches
+        self._test_player_interface(dominoes.players.omniscient(workers=2), 14)
+        self._test_player_interface(
+            dominoes.players.omniscient(history=dominoes.search.MoveHistory(), workers=2), 14
+        )
+
+        h13 = dominoes.Hand([d1, d2])
+        h14 = dominoes.Hand([d3, d2])
+        h15 = dominoes.Hand([d3, d4, d5])
+        h16 = dominoes.Hand([d2])
+
+        g7 = dominoes.Game.new(starting_player=0)
+        g7.hands = [h13, h14, h15, h16]
+        g7.make_move(d1, True)
+
+        op7 = dominoes.players.omniscient(workers=2)
+
+        op7(g7)
+
+        self.assertEqual(g7.valid_moves, ((d2, False), (d3, False)))
+
     def test_probabilistic_alphabeta(self):
         # test player interface
         self._test_player_interface(dominoes.players.probabilistic_alphabeta(), 15)
@@ -297,5 +390,181 @@ class TestPlayers(unittest.TestCase):
 
         self.assertEqual(g4.valid_moves, ((d4, False), (d3, False)))
 
+        h5 = dominoes.Hand([d1, d2])
+        h6 = dominoes.Hand([d3, d4])
+        h7 = dominoes.Hand([d5])
+        h8 = dominoes.Hand([d6])
+
+        g5 = dominoes.Game.new(starting_player=0)
+        g5.hands = [h5, h6, h7, h8]
+        g5.make_move(d1, True)
+
+        tt = dominoes.search.TranspositionTable()
+        pap5 = dominoes.players.probabilistic_alphabeta(transposition_table=tt)
+
+        pap5(g5)
+
+        self.assertEqual(g5.valid_moves, ((d4, False), (d3, False)))
+        self.assertNotEqual(len(tt), 0)
+
+        # test sharing a table among the searches of a call
+        random.seed(0)
+        while True:
+            g10 = _new_game_with_fixed_moves(12)
+
+            if len(g10.valid_moves) > 1:
+                break
+        g11 = copy.deepcopy(g10)
+
+        pap10 = dominoes.players.probabilistic_alphabeta(sample_size=8, collect_stats=True)
+        pap11 = dominoes.players.probabilistic_alphabeta(sample_size=8, table_size=1000,
+                                                        collect_stats=True)
+
+        random.seed(0)
+        pap10(g10)
+        random.seed(0)
+        pap11(g11)
+
+        self.assertEqual(set(g10.valid_moves), set(g11.valid_moves))
+        self.assertEqual(pap10.stats[0].transposition_hits, 0)
+        self.assertNotEqual(pap11.stats[0].transposition_hits, 0)
+        self.assertTrue(pap11.stats[0].nodes < pap10.stats[0].nodes)
+
+        # test that splitting the searches across processes gives the same result
+        self._test_player_interface(
+            dominoes.players.probabilistic_alphabeta(sample_size=2, workers=2), 15
+        )
+
+        g6 = _new_game_with_fixed_moves(12)
+        g7 = copy.deepcopy(g6)
+        pap6 = dominoes.players.probabilistic_alphabeta(sample_size=4)
+        pap7 = dominoes.players.probabilistic_alphabeta(sample_size=4, workers=2)
+
+        random.seed(0)
+        pap6(g6)
+        random.seed(0)
+        pap7(g7)
+
+        self.assertEqual(g6.valid_moves, g7.valid_moves)
+
+        # test collecting search statistics, also across processes
+        while True:
+            g8 = _new_game_with_fixed_moves(12)
+
+            if len(g8.valid_moves) > 1:
+                break
+        g9 = copy.deepcopy(g8)
+        pap8 = dominoes.players.probabilistic_alphabeta(sample_size=4, collect_stats=True)
+        pap9 = dominoes.players.probabilistic_alphabeta(sample_size=4, workers=2,
+                                                        collect_stats=True)
+
+        random.seed(0)
+        pap8(g8)
+        random.seed(0)
+        pap9(g9)
+
+        self.assertEqual(len(pap8.stats), 1)
+        self.assertEqual(len(pap9.stats), 1)
+        self.assertEqual(pap8.stats[0].nodes, pap9.stats[0].nodes)
+
+    def test_ismcts(self):
+        # test player interface
+        self._test_player_interface(dominoes.players.ismcts(iterations=10), 6)
+
+        # test name
+        self.assertEqual(dominoes.players.ismcts(name='test').__name__, 'test')
+        self.assertEqual(dominoes.players.ismcts().__name__, 'ismcts')
+
+        # test that start move can prevent running of player
+        cp1 = dominoes.players.counter(dominoes.players.random)
+        ip1 = dominoes.players.ismcts(start_move=1, rollout=cp1)
+
+        g1 = dominoes.Game.new()
+        ip1(g1)
+
+        self.assertEqual(cp1.count, 0)
+
+        # test that the rollout player is used, and that
+        # the amount of iterations limits the work done
+        cp2 = dominoes.players.counter(dominoes.players.random)
+        ip2 = dominoes.players.ismcts(iterations=5, rollout=cp2)
+
+        g2 = dominoes.Game.new()
+        ip2(g2)
+
+        # each iteration adds one move to the tree, and there are at
+        # most 27 moves left to play in the rest of the game
+        self.assertTrue(0 < cp2.count <= 5 * 27)
+
+        # test that the time budget limits the work done
+        g3 = dominoes.Game.new()
+        ip3 = dominoes.players.ismcts(iterations=float('inf'), max_time=0.1)
+
+        start = time.time()
+        ip3(g3)
+        elapsed = time.time() - start
+
+        self.assertTrue(elapsed < 1)
+
+        # test for correct results on a simple example, in which one of
+        # the moves wins and the other one loses, for all possible hands
+        d1 = dominoes.Domino(5, 6)
+        d2 = dominoes.Domino(2, 5)
+        d3 = dominoes.Domino(6, 6)
+        d4 = dominoes.Domino(1, 5)
+        d5 = dominoes.Domino(5, 5)
+        d6 = dominoes.Domino(4, 5)
+
+        h1 = dominoes.Hand([d1, d2])
+        h2 = dominoes.Hand([d3, d4])
+        h3 = dominoes.Hand([d5])
+        h4 = dominoes.Hand([d6])
+
+        g4 = dominoes.Game.new(starting_player=0)
+        g4.hands = [h1, h2, h3, h4]
+        g4.make_move(d1, True)
+
+        ip4 = dominoes.players.ismcts(iterations=100)
+
+        self.assertEqual(g4.valid_moves, ((d3, False), (d4, True)))
+
+        ip4(g4)
+
+        self.assertEqual(g4.valid_moves, ((d4, True), (d3, False)))
+
+        # test that rewards are from the perspective of the player that makes
+        # each move, even when the passes of the assumed hands lead players
+        # of different teams to make the same move from the same node
+        d7 = dominoes.Domino(1, 1)
+        d8 = dominoes.Domino(1, 2)
+        d9 = dominoes.Domino(5, 5)
+        d10 = dominoes.Domino(2, 3)
+        d11 = dominoes.Domino(6, 6)
+        d12 = dominoes.Domino(4, 4)
+
+        g5 = dominoes.Game.new(starting_player=3)
+        g5.hands = [dominoes.Hand([d8, d9]), dominoes.Hand([d11]),
+                    dominoes.Hand([d10]), dominoes.Hand([d7, d12])]
+        g5.make_move(d7, True)
+
+        self.assertEqual(g5.valid_moves, ((d8, True),))
+
+        ip5 = dominoes.players.ismcts()
+        root = dominoes.players._ISMCTSNode()
+
+        # player 1 plays d10 and wins in the first hands, while player 1
+        # passes, and player 2 plays d10 and wins in the second hands
+        hands1 = [[d8, d9], [d10], [d11], [d12]]
+        hands2 = [[d8, d9], [d11], [d10], [d12]]
+        for hands in (hands1, hands1, hands2):
+            ip5._iterate(copy.deepcopy(g5), [dominoes.Hand(h) for h in hands], root, 30)
+
+        node = root.children[0, (d8, True)]
+
+        self.assertEqual(set(node.children), {(1, (d10, True)), (2, (d10, True))})
+        for child in node.children.values():
+            self.assertEqual(child.visits, 1)
+            self.assertEqual(child.reward, 1)
+
 if __name__ == '__main__':
     unittest.main()
@@ -3,6 +3,20 @@ import dominoes
 import random
 import unittest
 
+def _new_game_with_fixed_moves(fixed_moves):
+    while True:
+        g = dominoes.Game.new()
+
+        for _ in range(fixed_moves):
+            g.make_move(*g.valid_moves[0])
+
+            if g.result is not None:
+                break
+
+        if g.result is None:
+            g.skinny_board()
+            return g
+
 class TestSearch(unittest.TestCase):
     def test_make_moves(self):
         game1 = dominoes.Game.new()
@@ -25,6 +39,24 @@ class TestSearch(unittest.TestCase):
             self.assertEqual(g.starting_player, 0)
             self.assertIsNone(g.result)
 
+        # the original game gets restored, whether or not all moves are made
+        game1_copy = copy.deepcopy(game1)
+        for _ in dominoes.search.make_moves(game1):
+            pass
+
+        self.assertEqual(game1, game1_copy)
+
+        game1.skinny_board()
+        game1_copy = copy.deepcopy(game1)
+        children = dominoes.search.make_moves(game1)
+        m, g = next(children)
+
+        self.assertEqual(g.moves[0], m)
+
+        children.close()
+
+        self.assertEqual(game1, game1_copy)
+
         game2 = dominoes.Game.new()
         game2.result = True
 
@@ -58,6 +90,446 @@ class TestSearch(unittest.TestCase):
             self.assertEqual(g.starting_player, 0)
             self.assertIsNone(g.result)
 
+    def test_transposition_table(self):
+        tt = dominoes.search.TranspositionTable(max_size=2)
+
+        self.assertEqual(len(tt), 0)
+        self.assertIsNone(tt.get('a'))
+        self.assertEqual(tt.misses, 1)
+
+        tt.store('a', dominoes.search.EXACT, 10, ())
+        tt.store('b', dominoes.search.LOWER_BOUND, 5, ())
+
+        self.assertEqual(len(tt), 2)
+        self.assertEqual(tt.get('a'), (dominoes.search.EXACT, 10, ()))
+        self.assertEqual(tt.hits, 1)
+
+        # 'b' is now the least recently used entry
+        tt.store('c', dominoes.search.UPPER_BOUND, 0, ())
+
+        self.assertEqual(len(tt), 2)
+        self.assertTrue('a' in tt)
+        self.assertFalse('b' in tt)
+        self.assertTrue('c' in tt)
+
+        tt.store('a', dominoes.search.LOWER_BOUND, 12, ())
+
+        self.assertEqual(len(tt), 2)
+        self.assertEqual(tt.get('a'), (dominoes.search.LOWER_BOUND, 12, ()))
+
+        tt.clear()
+
+        self.assertEqual(len(tt), 0)
+
+    def test_move_history(self):
+        d1 = dominoes.Domino(1, 2)
+        d2 = dominoes.Domino(1, 3)
+        d3 = dominoes.Domino(1, 4)
+        d4 = dominoes.Domino(1, 5)
+
+        g = dominoes.Game.new(starting_player=0)
+        g.hands = [dominoes.Hand([d1, d2, d3, d4]), dominoes.Hand([]),
+                   dominoes.Hand([]), dominoes.Hand([])]
+        g.valid_moves = ((d1, True), (d2, True), (d3, True), (d4, True))
+
+        mh = dominoes.search.MoveHistory(killers=1)
+
+        # nothing recorded - the order is left unchanged
+        mh.order(g)
+
+        self.assertEqual(g.valid_moves, ((d1, True), (d2, True), (d3, True), (d4, True)))
+
+        # cutoffs elsewhere in the game only count towards the history
+        mh.record(5, (d3, True))
+        mh.record(5, (d3, True))
+        mh.record(5, (d4, True))
+        mh.order(g)
+
+        self.assertEqual(g.valid_moves, ((d3, True), (d4, True), (d1, True), (d2, True)))
+
+        # killer moves at this point of the game go first
+        mh.record(0, (d2, True))
+        mh.order(g)
+
+        self.assertEqual(g.valid_moves, ((d2, True), (d3, True), (d4, True), (d1, True)))
+
+        # only the most recent killer move is remembered
+        mh.record(0, (d1, True))
+        mh.order(g)
+
+        self.assertEqual(g.valid_moves[0], (d1, True))
+
+        mh.clear()
+        mh.order(g)
+
+        self.assertEqual(g.valid_moves[0], (d1, True))
+
+        g.valid_moves = ((d4, True), (d3, True), (d2, True), (d1, True))
+        mh.order(g)
+
+        self.assertEqual(g.valid_moves, ((d4, True), (d3, True), (d2, True), (d1, True)))
+
+    def test_alphabeta_move_history(self):
+        mh = dominoes.search.MoveHistory()
+
+        for _ in range(3):
+            g1 = _new_game_with_fixed_moves(10)
+            g2 = copy.deepcopy(g1)
+            g3 = copy.deepcopy(g1)
+
+            _, value1 = dominoes.search.alphabeta(g1)
+            moves2, value2 = dominoes.search.alphabeta(g2, history=mh)
+            _, value3 = dominoes.search.principal_variation_search(g3, history=mh)
+
+            self.assertEqual(value1, value2)
+            self.assertEqual(value1, value3)
+
+            # searching takes back all the moves it makes, except for their order
+            g2.valid_moves = g1.valid_moves
+            self.assertEqual(g1, g2)
+
+            for move in moves2:
+                g2.make_move(*move)
+
+            self.assertEqual(g2.result.points, value2)
+
+    def test_search_stats(self):
+        stats1 = dominoes.search.SearchStats()
+
+        self.assertEqual(stats1.nodes, 0)
+        self.assertEqual(stats1.branching_factor, 0)
+        self.assertEqual(stats1.cutoffs, {})
+
+        stats1.nodes = 10
+        stats1.expanded = 4
+        stats1.children = 9
+        stats1.cutoffs[1] = 2
+        stats1.max_depth = 3
+        stats1.elapsed = 1.5
+
+        self.assertEqual(stats1.branching_factor, 2.25)
+
+        stats2 = dominoes.search.SearchStats()
+        stats2.nodes = 5
+        stats2.expanded = 2
+        stats2.children = 3
+        stats2.cutoffs[1] = 1
+        stats2.cutoffs[2] = 1
+        stats2.transposition_hits = 4
+        stats2.tablebase_hits = 1
+        stats2.bound_cutoffs = 6
+        stats2.max_depth = 7
+        stats2.elapsed = 0.5
+
+        stats1.update(stats2)
+
+        self.assertEqual(stats1.nodes, 15)
+        self.assertEqual(stats1.expanded, 6)
+        self.assertEqual(stats1.children, 12)
+        self.assertEqual(stats1.cutoffs, {1: 3, 2: 1})
+        self.assertEqual(stats1.transposition_hits, 4)
+        self.assertEqual(stats1.tablebase_hits, 1)
+        self.assertEqual(stats1.bound_cutoffs, 6)
+        self.assertEqual(stats1.max_depth, 7)
+        self.assertEqual(stats1.elapsed, 2)
+
+        string = 'Nodes: 15\n' \
+                 'Branching factor: 2.00\n' \
+                 'Cutoffs by depth: {1: 3, 2: 1}\n' \
+                 'Transposition hits: 4\n' \
+                 'Tablebase hits: 1\n' \
+                 'Bound cutoffs: 6\n' \
+                 'Max depth: 7\n' \
+                 'Elapsed: 2.000s'
+
+        self.assertEqual(str(stats1), string)
+        self.assertEqual(repr(stats1), string)
+
+    def test_alphabeta_stats(self):
+        g1 = dominoes.Game.new()
+        g1.result = dominoes.Result(0, True, 10)
+        stats1 = dominoes.search.SearchStats()
+
+        dominoes.search.alphabeta(g1, stats=stats1)
+
+        self.assertEqual(stats1.nodes, 1)
+        self.assertEqual(stats1.expanded, 0)
+
+        for _ in range(3):
+            g2 = _new_game_with_fixed_moves(12)
+            g3 = copy.deepcopy(g2)
+
+            cp = dominoes.players.counter()
+            stats2 = dominoes.search.SearchStats()
+            moves, _ = dominoes.search.alphabeta(g2, player=cp, stats=stats2)
+
+            # the player gets called once for every expanded position
+            self.assertEqual(stats2.expanded, cp.count)
+            self.assertTrue(stats2.nodes > stats2.expanded)
+            self.assertEqual(stats2.children, stats2.nodes - 1)
+            self.assertTrue(stats2.max_depth >= len(moves))
+            self.assertEqual(stats2.transposition_hits, 0)
+            self.assertTrue(stats2.elapsed > 0)
+
+            # statistics add up across searches
+            tt = dominoes.search.TranspositionTable()
+            stats3 = dominoes.search.SearchStats()
+            dominoes.search.alphabeta(g3, transposition_table=tt, stats=stats3)
+            nodes = stats3.nodes
+            dominoes.search.alphabeta(g3, transposition_table=tt, stats=stats3)
+
+            self.assertEqual(stats3.nodes, nodes + 1)
+            self.assertEqual(stats3.transposition_hits, tt.hits)
+
+            stats4 = dominoes.search.SearchStats()
+            dominoes.search.alphabeta(copy.deepcopy(g3), stats=stats4, workers=2)
+
+            self.assertTrue(stats4.nodes > 1)
+            self.assertTrue(stats4.expanded >= 1)
+
+            for search in (dominoes.search.principal_variation_search,
+                           dominoes.search.iterative_deepening):
+                stats5 = dominoes.search.SearchStats()
+                search(copy.deepcopy(g3), stats=stats5)
+
+                self.assertTrue(stats5.nodes > 1)
+
+    def test_alphabeta_transposition_table(self):
+        for _ in range(3):
+            g1 = dominoes.Game.new()
+            for _ in range(10):
+                g1.make_move(*g1.valid_moves[0])
+                if g1.result is not None:
+                    break
+            g1.skinny_board()
+            g2 = copy.deepcopy(g1)
+            g3 = copy.deepcopy(g1)
+
+            cp1 = dominoes.players.counter()
+            cp2 = dominoes.players.counter()
+            tt = dominoes.search.TranspositionTable()
+
+            moves1, value1 = dominoes.search.alphabeta(g1, player=cp1)
+            moves2, value2 = dominoes.search.alphabeta(g2, player=cp2, transposition_table=tt)
+
+            self.assertEqual(value1, value2)
+            self.assertTrue(cp2.count <= cp1.count)
+
+            # searching takes back all the moves it makes
+            self.assertEqual(g1, g3)
+            self.assertEqual(g2, g3)
+
+            # the whole search is answered by the table the second time around
+            cp3 = dominoes.players.counter()
+
+            self.assertEqual(dominoes.search.alphabeta(g3, player=cp3, transposition_table=tt),
+                             (moves2, value2))
+            self.assertEqual(cp3.count, 0)
+
+    def test_alphabeta_depth(self):
+        g1 = dominoes.Game.new()
+        g1.skinny_board()
+        points = g1.remaining_points()
+
+        self.assertEqual(dominoes.search.alphabeta(g1, depth=0),
+                         ([], points[1] + points[3] - points[0] - points[2]))
+
+        moves, _ = dominoes.search.alphabeta(g1, depth=2)
+
+        self.assertEqual(len(moves), 2)
+
+        for _ in range(3):
+            g2 = _new_game_with_fixed_moves(14)
+            g3 = copy.deepcopy(g2)
+
+            self.assertEqual(dominoes.search.alphabeta(g2, depth=28),
+                             dominoes.search.alphabeta(g3))
+
+    def test_score_bound(self):
+        d1 = dominoes.Domino(1, 2)
+        d2 = dominoes.Domino(2, 3)
+        d3 = dominoes.Domino(3, 4)
+        d4 = dominoes.Domino(4, 5)
+        d5 = dominoes.Domino(1, 6)
+
+        g = dominoes.Game.new(starting_player=0)
+        g.hands = [dominoes.Hand([d1, d5]), dominoes.Hand([d2]),
+                   dominoes.Hand([d3]), dominoes.Hand([d4])]
+        g.valid_moves = ((d1, True), (d5, True))
+
+        # the first move takes at least the 3 points of [1|2] out of the hands
+        self.assertEqual(dominoes.search._score_bound(g, 34), 31)
+
+        for _ in range(3):
+            g = _new_game_with_fixed_moves(12)
+            bound = dominoes.search._score_bound(g, sum(g.remaining_points()))
+            _, value = dominoes.search.alphabeta(copy.deepcopy(g))
+
+            self.assertTrue(abs(value) <= bound)
+
+    def test_alphabeta_score_bound(self):
+        for _ in range(3):
+            g1 = _new_game_with_fixed_moves(12)
+            g2 = copy.deepcopy(g1)
+            bound = dominoes.search._score_bound(g1, sum(g1.remaining_points()))
+
+            # positions that cannot reach the window are not searched,
+            # but the root is, so that there is always a best move
+            for alpha_beta in ((bound, float('inf')), (-float('inf'), -bound)):
+                stats = dominoes.search.SearchStats()
+                moves, value = dominoes.search.alphabeta(g1, alpha_beta, stats=stats)
+
+                self.assertEqual(g1, g2)
+                self.assertEqual(len(moves), 1)
+                self.assertIn(moves[0], g1.valid_moves)
+                self.assertTrue(abs(value) <= bound)
+                self.assertFalse(alpha_beta[0] < value < alpha_beta[1])
+                self.assertTrue(stats.nodes <= 1 + len(g1.valid_moves))
+
+            # the value is the same as that of the principal variation
+            stats = dominoes.search.SearchStats()
+            moves, value = dominoes.search.alphabeta(g1, stats=stats)
+
+            self.assertEqual(g1, g2)
+
+            for move in moves:
+                g2.make_move(*move)
+
+            self.assertEqual(g2.result.points, value)
+
+    def test_iterative_deepening(self):
+        g1 = dominoes.Game.new()
+        g1.result = dominoes.Result(0, True, 10)
+
+        self.assertEqual(dominoes.search.iterative_deepening(g1), ([], 10, True))
+
+        # without a budget, the search goes until the end of the game
+        for _ in range(3):
+            g2 = _new_game_with_fixed_moves(14)
+            g3 = copy.deepcopy(g2)
+
+            moves, value, exact = dominoes.search.iterative_deepening(g2)
+
+            self.assertTrue(exact)
+            self.assertEqual(value, dominoes.search.alphabeta(g3)[1])
+
+            for move in moves:
+                g2.make_move(*move)
+
+            self.assertEqual(g2.result.points, value)
+
+        # with a tiny budget, only the first search completes
+        g4 = dominoes.Game.new()
+        g4.skinny_board()
+        g4_copy = copy.deepcopy(g4)
+
+        for budget in ({'max_nodes': 1}, {'max_time': 0}):
+            moves, value, exact = dominoes.search.iterative_deepening(g4, **budget)
+
+            self.assertEqual(len(moves), 1)
+            self.assertTrue(moves[0] in g4.valid_moves)
+            self.assertFalse(exact)
+
+            # the game is restored when the search runs out of budget
+            g4_copy.valid_moves = g4.valid_moves
+            self.assertEqual(g4, g4_copy)
+
+        # a larger budget allows searching deeper
+        moves, _, exact = dominoes.search.iterative_deepening(g4, max_nodes=1000)
+
+        self.assertTrue(len(moves) > 1)
+        self.assertFalse(exact)
+
+        tt = dominoes.search.TranspositionTable()
+        g5 = _new_game_with_fixed_moves(14)
+        g6 = copy.deepcopy(g5)
+
+        self.assertEqual(dominoes.search.iterative_deepening(g5, transposition_table=tt)[1],
+                         dominoes.search.alphabeta(g6)[1])
+
+    def test_principal_variation_search(self):
+        g1 = dominoes.Game.new()
+        g1.result = dominoes.Result(0, True, 10)
+
+        self.assertEqual(dominoes.search.principal_variation_search(g1), ([], 10))
+        self.assertEqual(dominoes.search.principal_variation_search(g1, expected_value=30),
+                         ([], 10))
+
+        for _ in range(3):
+            g2 = _new_game_with_fixed_moves(12)
+            _, value = dominoes.search.alphabeta(copy.deepcopy(g2))
+
+            # the value does not depend on the aspiration window
+            # nor on whether a transposition table is used
+            for expected_value in (None, value, value - 5, value + 5):
+                for tt in (None, dominoes.search.TranspositionTable()):
+                    g3 = copy.deepcopy(g2)
+
+                    moves, pvs_value = dominoes.search.principal_variation_search(
+                        g3, expected_value, transposition_table=tt
+                    )
+
+                    self.assertEqual(pvs_value, value)
+
+                    # the game is restored after the search
+                    g3.valid_moves = g2.valid_moves
+                    self.assertEqual(g3, g2)
+
+                    for move in moves:
+                        g3.make_move(*move)
+
+                    self.assertEqual(g3.result.points, value)
+
+        # depth limited searches give the same value as alphabeta
+        g4 = dominoes.Game.new()
+        g4.skinny_board()
+
+        self.assertEqual(dominoes.search.principal_variation_search(copy.deepcopy(g4), depth=3)[1],
+                         dominoes.search.alphabeta(copy.deepcopy(g4), depth=3)[1])
+
+    def test_alphabeta_workers(self):
+        g1 = dominoes.Game.new()
+        g1.result = dominoes.Result(0, True, 10)
+
+        self.assertEqual(dominoes.search.alphabeta(g1, workers=2), ([], 10))
+
+        # the first positions might have either team to move
+        for fixed_moves in (14, 15, 16):
+            g2 = _new_game_with_fixed_moves(fixed_moves)
+            g2_copy = copy.deepcopy(g2)
+            g3 = copy.deepcopy(g2)
+
+            moves, value = dominoes.search.alphabeta(g2, workers=2)
+
+            self.assertEqual(value, dominoes.search.alphabeta(g3)[1])
+            self.assertEqual(g2, g2_copy)
+
+            for move in moves:
+                g2.make_move(*move)
+
+            self.assertEqual(g2.result.points, value)
+
+        g4 = _new_game_with_fixed_moves(14)
+        g5 = copy.deepcopy(g4)
+        tt = dominoes.search.TranspositionTable()
+
+        self.assertEqual(dominoes.search.alphabeta(g4, transposition_table=tt, depth=3,
+                                                   workers=2)[1],
+                         dominoes.search.alphabeta(g5, depth=3)[1])
+        self.assertEqual(len(tt), 0)
+
+        # a root cutoff stops the search early
+        g6 = _new_game_with_fixed_moves(14)
+        g7 = copy.deepcopy(g6)
+        value = dominoes.search.alphabeta(g7)[1]
+
+        if g6.turn % 2:
+            _, cutoff_value = dominoes.search.alphabeta(g6, (value, value + 1), workers=2)
+            self.assertTrue(cutoff_value <= value)
+        else:
+            _, cutoff_value = dominoes.search.alphabeta(g6, (value - 1, value), workers=2)
+            self.assertTrue(cutoff_value >= value)
+
     def test_alphabeta(self):
         g1 = dominoes.Game.new()
         g1.result = dominoes.Result(0, True, 10)
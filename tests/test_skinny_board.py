@@ -135,5 +135,43 @@ class TestSkinnyBoard(unittest.TestCase):
         self.assertEqual(str(b), '[2|?][?|?][?|2]')
         self.assertEqual(repr(b), '[2|?][?|?][?|2]')
 
+    def test_remove(self):
+        b = dominoes.SkinnyBoard()
+
+        d1 = dominoes.Domino(1, 2)
+        d2 = dominoes.Domino(1, 3)
+        d3 = dominoes.Domino(2, 3)
+        d4 = dominoes.Domino(3, 3)
+
+        self.assertRaises(dominoes.EmptyBoardException, b.remove, d1, True)
+
+        b.add(d1, True)
+        b.add(d2, True)
+        b.add(d3, False)
+        b.add(d4, False)
+
+        b.remove(d4, False)
+
+        self.assertEqual(len(b), 3)
+        self.assertEqual(b.left_end(), 3)
+        self.assertEqual(b.right_end(), 3)
+
+        b.remove(d2, True)
+
+        self.assertEqual(len(b), 2)
+        self.assertEqual(b.left_end(), 1)
+        self.assertEqual(b.right_end(), 3)
+
+        b.remove(d3, False)
+
+        self.assertEqual(len(b), 1)
+        self.assertEqual(b.left_end(), 1)
+        self.assertEqual(b.right_end(), 2)
+
+        b.remove(d1, False)
+
+        self.assertEqual(len(b), 0)
+        self.assertEqual(b, dominoes.SkinnyBoard())
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,172 @@
+import copy
+import dominoes
+import os
+import pickle
+import tempfile
+import unittest
+
+def _new_game_with_tiles_left(tiles):
+    while True:
+        g = dominoes.Game.new()
+
+        while g.result is None and sum(len(h) for h in g.hands) > tiles:
+            g.make_move(*g.valid_moves[0])
+
+        if g.result is None:
+            return g
+
+class TestTablebase(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_build(self):
+        games = [_new_game_with_tiles_left(8) for _ in range(3)]
+        games_copy = copy.deepcopy(games)
+
+        size = dominoes.tablebase.build(self.path, games, 6)
+
+        # the games are not modified
+        self.assertEqual(games, games_copy)
+
+        with dominoes.tablebase.Tablebase(self.path) as tb:
+            self.assertEqual(len(tb), size)
+            self.assertEqual(tb.max_tiles, 6)
+
+            # positions with too many dominoes left are not in the tablebase
+            for g in games:
+                self.assertIsNone(tb.get(g))
+                self.assertIsNone(tb.get(dominoes.BitGame.from_game(g)))
+
+            # every position with few enough dominoes left is in the
+            # tablebase, with the value computed by alphabeta search
+            for g in games:
+                for _, g2 in dominoes.search.make_moves(g):
+                    for _, g3 in dominoes.search.make_moves(g2):
+                        if g3.result is not None:
+                            continue
+
+                        value = tb.get(g3)
+                        g4 = copy.deepcopy(g3)
+                        g4.skinny_board()
+
+                        self.assertEqual(value, dominoes.search.alphabeta(g4)[1])
+                        self.assertEqual(tb.get(dominoes.BitGame.from_game(g3)), value)
+
+        dominoes.tablebase.build(self.path, [], 6)
+
+        with dominoes.tablebase.Tablebase(self.path) as tb:
+            self.assertEqual(len(tb), 0)
+            self.assertIsNone(tb.get(_new_game_with_tiles_left(4)))
+
+        g5 = dominoes.Game.new()
+        g5.hands[0].draw(dominoes.Domino(7, 7))
+
+        self.assertRaises(dominoes.NoSuchDominoException,
+                          dominoes.tablebase.build, self.path, [g5], 6)
+
+    def test_get(self):
+        g1 = _new_game_with_tiles_left(6)
+        dominoes.tablebase.build(self.path, [g1], 6)
+
+        with dominoes.tablebase.Tablebase(self.path) as tb:
+            value = tb.get(g1)
+
+            self.assertIsNotNone(value)
+
+            # games that do not use the double six set are not in the tablebase
+            d1 = dominoes.Domino(1, 2)
+            d2 = dominoes.Domino(7, 3)
+
+            g2 = dominoes.Game.new(starting_player=0)
+            g2.hands = [dominoes.Hand([d1]), dominoes.Hand([d2]),
+                        dominoes.Hand([d2]), dominoes.Hand([d2])]
+            g2.valid_moves = ((d1, True),)
+            g2.make_move(d1, True)
+
+            self.assertIsNone(tb.get(g2))
+
+            # a pickled tablebase maps the file again
+            tb2 = pickle.loads(pickle.dumps(tb))
+
+            self.assertEqual(tb2.path, self.path)
+            self.assertEqual(tb2.get(g1), value)
+
+            tb2.close()
+
+    def test_invalid_file(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a tablebase')
+
+        self.assertRaises(ValueError, dominoes.tablebase.Tablebase, self.path)
+
+        dominoes.tablebase.build(self.path, [_new_game_with_tiles_left(4)], 4)
+
+        with open(self.path, 'ab') as f:
+            f.write(b'\0')
+
+        self.assertRaises(ValueError, dominoes.tablebase.Tablebase, self.path)
+
+    def test_alphabeta(self):
+        for _ in range(3):
+            g1 = _new_game_with_tiles_left(10)
+            g1.skinny_board()
+            dominoes.tablebase.build(self.path, [g1], 7)
+
+            with dominoes.tablebase.Tablebase(self.path) as tb:
+                g2 = copy.deepcopy(g1)
+
+                cp1 = dominoes.players.counter()
+                cp2 = dominoes.players.counter()
+
+                _, value1 = dominoes.search.alphabeta(g1, player=cp1)
+                moves2, value2 = dominoes.search.alphabeta(g2, player=cp2, tablebase=tb)
+
+                self.assertEqual(value1, value2)
+                self.assertTrue(cp2.count <= cp1.count)
+
+                # the root is always searched, and the move
+                # sequence stops at a position in the tablebase
+                self.assertTrue(moves2)
+                for move in moves2:
+                    g2.make_move(*move)
+
+                if g2.result is None:
+                    self.assertEqual(tb.get(g2), value2)
+                else:
+                    self.assertEqual(g2.result.points, value2)
+
+                self.assertEqual(dominoes.search.alphabeta(copy.deepcopy(g1), tablebase=tb,
+                                                           workers=2)[1], value1)
+                self.assertEqual(dominoes.search.principal_variation_search(
+                    copy.deepcopy(g1), tablebase=tb
+                )[1], value1)
+                self.assertEqual(dominoes.search.iterative_deepening(
+                    copy.deepcopy(g1), tablebase=tb
+                )[1:], (value1, True))
+
+    def test_players(self):
+        g1 = _new_game_with_tiles_left(10)
+        dominoes.tablebase.build(self.path, [g1], 7)
+
+        with dominoes.tablebase.Tablebase(self.path) as tb:
+            g2 = copy.deepcopy(g1)
+            g3 = copy.deepcopy(g1)
+
+            dominoes.players.omniscient()(g2)
+            dominoes.players.omniscient(tablebase=tb)(g3)
+
+            self.assertEqual(g2.valid_moves, g3.valid_moves)
+
+            g4 = copy.deepcopy(g1)
+            g5 = copy.deepcopy(g1)
+
+            dominoes.players.probabilistic_alphabeta(tablebase=tb)(g4)
+
+            self.assertEqual(set(g4.valid_moves), set(g5.valid_moves))
+
+if __name__ == '__main__':
+    unittest.main()
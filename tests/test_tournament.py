@@ -0,0 +1,84 @@
+import dominoes
+import unittest
+
+class TestTournament(unittest.TestCase):
+    def test_seatings(self):
+        self.assertEqual(dominoes.tournament.seatings([]), [])
+        self.assertEqual(dominoes.tournament.seatings([dominoes.players.random]), [])
+        self.assertEqual(dominoes.tournament.seatings([dominoes.players.random] * 3),
+                         [(0, 1), (0, 2), (1, 0), (1, 2), (2, 0), (2, 1)])
+
+    def test_play(self):
+        cp1 = dominoes.players.counter(name='cp1')
+        cp2 = dominoes.players.counter(dominoes.players.reverse, name='cp2')
+
+        matches = list(dominoes.tournament.play([cp1, cp2], 3))
+
+        self.assertEqual([(m.players, m.index) for m in matches],
+                         [((0, 1), 0), ((0, 1), 1), ((0, 1), 2),
+                          ((1, 0), 0), ((1, 0), 1), ((1, 0), 2)])
+        for m in matches:
+            self.assertEqual(len(m.results), 1)
+            self.assertIsInstance(m.results[0], dominoes.Result)
+
+        # every move is chosen by one of the players
+        self.assertTrue(cp1.count)
+        self.assertTrue(cp2.count)
+
+        # each match is a series
+        for m in dominoes.tournament.play([cp1, cp2], 2, target_score=50,
+                                          starting_domino=dominoes.Domino(6, 6)):
+            scores = [sum(r.points for r in m.results if r.points > 0),
+                      -sum(r.points for r in m.results if r.points < 0)]
+
+            self.assertTrue(max(scores) >= 50)
+            for i in range(1, len(m.results)):
+                self.assertTrue(max(sum(r.points for r in m.results[:i] if r.points > 0),
+                                    -sum(r.points for r in m.results[:i] if r.points < 0)) < 50)
+
+        # seeded matches are the same when played in other processes
+        players = [dominoes.players.random, dominoes.players.bota_gorda,
+                   dominoes.players.double]
+
+        matches1 = list(dominoes.tournament.play(players, 2, seed=0))
+        matches2 = list(dominoes.tournament.play(players, 2, seed=0, workers=2, chunksize=3))
+
+        self.assertEqual(len(matches1), 12)
+        self.assertEqual(sorted(matches1), sorted(matches2))
+
+    def test_standings(self):
+        players = [dominoes.players.random, dominoes.players.counter(name='cp')]
+        s = dominoes.tournament.Standings(players)
+
+        self.assertEqual(s.names, ['random', 'cp'])
+        self.assertEqual(str(s), 'Player 0 (random): 0 matches\n'
+                                 'Player 1 (cp): 0 matches')
+        self.assertRaises(ZeroDivisionError, s.win_rate, 0)
+
+        s.update(dominoes.tournament.Match((0, 1), 0, [dominoes.Result(0, True, 20)]))
+        s.update(dominoes.tournament.Match((1, 0), 0, [dominoes.Result(1, False, 0)]))
+        s.update(dominoes.tournament.Match((1, 0), 1, [dominoes.Result(0, True, 30),
+                                                        dominoes.Result(3, True, -10)]))
+
+        self.assertEqual(s.matches, [3, 3])
+        self.assertEqual(s.wins, [1, 1])
+        self.assertEqual(s.ties, [1, 1])
+        self.assertEqual(s.points, [0, 0])
+        self.assertEqual(s.squared_points, [800, 800])
+
+        rate, error = s.win_rate(0)
+        self.assertAlmostEqual(rate, 1 / 3)
+        self.assertAlmostEqual(error, 1.96 * (2 / 27) ** 0.5)
+
+        mean, error = s.mean_points(1)
+        self.assertEqual(mean, 0)
+        self.assertAlmostEqual(error, 1.96 * (800 / 9) ** 0.5)
+
+        self.assertEqual(str(s), 'Player 0 (random): 3 matches, 33.3% +/- 53.3% won,'
+                                 ' 1 tied, 0.0 +/- 18.5 points\n'
+                                 'Player 1 (cp): 3 matches, 33.3% +/- 53.3% won,'
+                                 ' 1 tied, 0.0 +/- 18.5 points')
+        self.assertEqual(repr(s), str(s))
+
+if __name__ == '__main__':
+    unittest.main()